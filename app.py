@@ -6,23 +6,21 @@
 Flask를 사용한 웹 인터페이스
 """
 
-from flask import Flask, render_template, request, redirect, url_for, flash, send_file, jsonify
+from flask import Flask, render_template, request, redirect, url_for, flash, send_file, jsonify, Response
 import os
-import pandas as pd
-import numpy as np
-from collections import defaultdict, Counter
-import random
-import tempfile
-import shutil
-from datetime import datetime
-from werkzeug.utils import secure_filename
+from itsdangerous import URLSafeTimedSerializer, BadSignature
 import json
+import time
 
 # 기존 조 배정 로직 import
-from camp_group_assignment import (
-    load_data, canonical_school, extract_major, extract_region,
-    can_assign_to_group, calculate_group_stats, assign_groups, generate_summary_report
-)
+from camp_group_assignment import solve_groups, generate_summary_report, ENGINES, analyze_feasibility
+from roster_loader import ROSTER_EXTENSIONS
+from roster_cache import get_roster_cache, file_digest
+from result_cache import get_result_cache, result_key
+from job_queue import JobQueue
+from job_store import JobStore, write_csv_atomic
+from result_store import ResultReader, write_result
+from metrics import Registry, CONTENT_TYPE, SIZE_BUCKETS, timed
 
 app = Flask(__name__)
 app.secret_key = 'your-secret-key-here'  # 실제 운영시에는 환경변수로 설정
@@ -30,39 +28,112 @@ app.secret_key = 'your-secret-key-here'  # 실제 운영시에는 환경변수
 # 업로드 폴더 설정
 UPLOAD_FOLDER = 'uploads'
 RESULT_FOLDER = 'results'
-ALLOWED_EXTENSIONS = {'xlsx', 'xls'}
+ALLOWED_EXTENSIONS = ROSTER_EXTENSIONS
 
-# 폴더 생성
-os.makedirs(UPLOAD_FOLDER, exist_ok=True)
-os.makedirs(RESULT_FOLDER, exist_ok=True)
+# 세션별 업로드/결과 폴더 (겹치지 않는 세션 ID, 원자적 쓰기, 세션 잠금)
+store = JobStore(UPLOAD_FOLDER, RESULT_FOLDER)
+# 결과 화면이 읽은 결과 헤더와 페이지 (파일 수정 시각으로 확인하는 LRU)
+result_reader = ResultReader(store)
+
+# 운영 지표 (/metrics, Prometheus 텍스트 형식)
+registry = Registry()
+SOLVE_SECONDS = registry.histogram('groupmaker_solve_seconds', '조 배정(assign_groups) 실행 시간', ('engine',))
+INGEST_SECONDS = registry.histogram('groupmaker_ingest_seconds', '명단 읽기(캐시 포함) 시간', ('source',))
+SUMMARY_SECONDS = registry.histogram('groupmaker_summary_seconds', '요약 보고서(generate_summary_report) 생성 시간')
+WRITE_SECONDS = registry.histogram('groupmaker_write_seconds', '결과 파일 저장 시간', ('file',))
+UPLOAD_BYTES = registry.histogram('groupmaker_upload_bytes', '업로드된 명단 파일 크기', ('kind',), SIZE_BUCKETS)
+JOBS_TOTAL = registry.counter('groupmaker_jobs_total', '끝난 조 배정 작업 수', ('status',))
+FAILURES_TOTAL = registry.counter('groupmaker_failures_total', '단계별 실패 수', ('stage',))
+JOBS_IN_STATE = registry.gauge('groupmaker_jobs', '작업표의 상태별 작업 수 (queued: 대기열 길이, running: 실행 중)', ('status',))
+CACHE_LOOKUPS = registry.counter('groupmaker_roster_cache_lookups_total', '명단 캐시 조회 수', ('result',))
+CACHE_HIT_RATIO = registry.gauge('groupmaker_roster_cache_hit_ratio', '명단 캐시 적중률')
+RESULT_CACHE_LOOKUPS = registry.counter('groupmaker_result_cache_lookups_total', '결과 캐시 조회 수', ('result',))
+
+def record_job(job, result):
+    """작업이 끝날 때 작업 프로세스가 잰 단계별 시간을 지표에 반영 (작업 큐가 호출)"""
+    JOBS_TOTAL.inc(status=job['status'])
+    if job['status'] == 'failed':
+        FAILURES_TOTAL.inc(stage='job')
+    if result and 'cached' in result:
+        RESULT_CACHE_LOOKUPS.inc(result='hit' if result['cached'] else 'miss')
+    timings = (result or {}).get('timings', {})
+    if 'assign' in timings:
+        SOLVE_SECONDS.observe(timings['assign'], engine=result['engine'])
+    if 'summary' in timings:
+        SUMMARY_SECONDS.observe(timings['summary'])
+    for name in ('csv', 'result'):
+        if f'write_{name}' in timings:
+            WRITE_SECONDS.observe(timings[f'write_{name}'], file=name)
+
+def job_started(job):
+    """작업 프로세스가 진행 상황에 남긴 시작 시각 (아직 시작하지 않았으면 None, 작업 큐가 호출)"""
+    return store.started_at(job['session_id'])
+
+# 조 배정 작업 큐 (작업 프로세스 수는 환경변수 JOB_WORKERS, 기본 2)
+jobs = JobQueue(on_finish=record_job, started=job_started)
+
+# 진행 상황 SSE 스트림이 작업 상태를 확인하는 간격 (초)
+EVENT_INTERVAL = 0.5
+
+# 파일 검증 토큰: /api/validate_files에서 파싱한 명단(명단 캐시의 SHA-256 키)을 /upload에서 재사용
+ROSTER_TOKEN_MAX_AGE = 30 * 60  # 초
+roster_tokens = URLSafeTimedSerializer(app.secret_key, salt='roster-token')
+
+def issue_roster_token(leaders_digest, members_digest):
+    """검증된 두 명단을 가리키는 서명된 토큰 발급"""
+    return roster_tokens.dumps({'leaders': leaders_digest, 'members': members_digest})
+
+def resolve_roster_token(token):
+    """토큰이 가리키는 (조장/헬퍼, 조원, 조원 인코딩) 명단, 만료되었거나 캐시에 없으면 None"""
+    try:
+        digests = roster_tokens.loads(token, max_age=ROSTER_TOKEN_MAX_AGE)
+    except BadSignature:
+        return None
+    cache = get_roster_cache()
+    leaders = cache.get('leaders', digests['leaders'])
+    members = cache.get('members', digests['members'])
+    if leaders is None or members is None:
+        return None
+    return leaders, members, cache.member_table(digests['members'], members)
 
 def allowed_file(filename):
     """파일 확장자 검증"""
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
+def file_extension(filename):
+    """업로드 파일의 확장자 (명단 형식 판단용)"""
+    return filename.rsplit('.', 1)[1].lower()
+
 @app.route('/')
 def index():
     """메인 페이지"""
-    return render_template('index.html')
+    return render_template('index.html', engines=ENGINES)
 
 @app.route('/upload', methods=['POST'])
 def upload_files():
-    """파일 업로드 처리"""
-    if 'leaders_file' not in request.files or 'members_file' not in request.files:
-        flash('두 개의 파일을 모두 업로드해주세요.')
-        return redirect(request.url)
-    
-    leaders_file = request.files['leaders_file']
-    members_file = request.files['members_file']
-    
-    # 파일명 검증
-    if leaders_file.filename == '' or members_file.filename == '':
-        flash('파일을 선택해주세요.')
-        return redirect(request.url)
+    """파일 업로드 처리
+
+    /api/validate_files가 발급한 roster_token이 있으면 파일을 다시 받거나 파싱하지 않고
+    검증 때 파싱한 명단을 사용합니다.
+    """
+    roster_token = request.form.get('roster_token', '')
     
-    if not (allowed_file(leaders_file.filename) and allowed_file(members_file.filename)):
-        flash('Excel 파일(.xlsx, .xls)만 업로드 가능합니다.')
-        return redirect(request.url)
+    if not roster_token:
+        if 'leaders_file' not in request.files or 'members_file' not in request.files:
+            flash('두 개의 파일을 모두 업로드해주세요.')
+            return redirect(request.url)
+        
+        leaders_file = request.files['leaders_file']
+        members_file = request.files['members_file']
+        
+        # 파일명 검증
+        if leaders_file.filename == '' or members_file.filename == '':
+            flash('파일을 선택해주세요.')
+            return redirect(request.url)
+        
+        if not (allowed_file(leaders_file.filename) and allowed_file(members_file.filename)):
+            flash('Excel(.xlsx, .xls), CSV, Parquet, Arrow 파일만 업로드 가능합니다.')
+            return redirect(request.url)
     
     # 인원 범위 설정 가져오기
     try:
@@ -81,121 +152,261 @@ def upload_files():
         if min_members > max_members:
             flash('최소 인원은 최대 인원보다 작거나 같아야 합니다.')
             return redirect(request.url)
+        
+        # 배정 엔진 설정
+        engine = request.form.get('engine', 'greedy')
+        time_limit = float(request.form.get('time_limit', 10))
+        
+        if engine not in ENGINES:
+            flash('알 수 없는 배정 엔진입니다.')
+            return redirect(request.url)
+        
+        if time_limit < 1 or time_limit > 300:
+            flash('탐색 시간 제한은 1-300초 사이여야 합니다.')
+            return redirect(request.url)
+        
+        allow_infeasible = request.form.get('allow_infeasible') == 'on'
+        use_cache = request.form.get('recompute') != 'on'
+        
+        # seed (비우면 무작위, 같은 seed로 다시 배정하면 같은 결과를 결과 캐시에서 재사용)
+        seed_text = request.form.get('seed', '').strip()
+        seed = int(seed_text) if seed_text else None
+        if seed is not None and seed < 0:
+            flash('seed는 0 이상의 정수여야 합니다.')
+            return redirect(request.url)
             
     except ValueError:
         flash('인원 범위 설정이 올바르지 않습니다.')
         return redirect(request.url)
     
     try:
-        # 고유한 세션 ID 생성
-        session_id = datetime.now().strftime('%Y%m%d_%H%M%S')
-        session_folder = os.path.join(UPLOAD_FOLDER, session_id)
-        os.makedirs(session_folder, exist_ok=True)
-        
-        # 파일 저장
-        leaders_path = os.path.join(session_folder, 'leaders.xlsx')
-        members_path = os.path.join(session_folder, 'members.xlsx')
+        if roster_token:
+            # 검증 단계에서 파싱한 명단 재사용
+            with INGEST_SECONDS.time(source='token'):
+                rosters = resolve_roster_token(roster_token)
+            if rosters is None:
+                flash('파일 검증 정보가 만료되었습니다. 파일을 다시 선택해주세요.')
+                return redirect(url_for('index'))
+            leaders, members, table = rosters
+        else:
+            leaders_data = leaders_file.read()
+            members_data = members_file.read()
+            UPLOAD_BYTES.observe(len(leaders_data), kind='leaders')
+            UPLOAD_BYTES.observe(len(members_data), kind='members')
+            
+            # 데이터 로드 (같은 내용의 파일은 파싱 결과와 조원 인코딩을 캐시에서 바로 꺼냄)
+            cache = get_roster_cache()
+            members_digest = file_digest(members_data)
+            with INGEST_SECONDS.time(source='upload'):
+                leaders = cache.load('leaders', leaders_data, leaders_file.filename)
+                members = cache.load('members', members_data, members_file.filename, digest=members_digest)
+                table = cache.member_table(members_digest, members)
         
-        leaders_file.save(leaders_path)
-        members_file.save(members_path)
+        # 사전 검사 (수 ms): 하드 조건 위반이 확실하면 작업을 만들지 않고 바로 안내
+        feasibility = analyze_feasibility(leaders, members, min_members, max_members, table)
+        if not feasibility['feasible'] and not allow_infeasible:
+            FAILURES_TOTAL.inc(stage='presolve')
+            for issue in feasibility['issues']:
+                flash(issue['message'])
+            flash("하드 조건을 모두 만족하는 배정이 불가능합니다. 명단을 수정하거나 '조건 위반 감수'를 선택하세요.")
+            return redirect(url_for('index'))
         
-        # 조 배정 실행 (인원 범위 전달)
-        result = process_group_assignment(leaders_path, members_path, session_id, min_members, max_members)
+        # 검증과 사전 검사를 통과한 요청만 세션 ID를 만들고 결과 폴더를 선점
+        session_id = store.new_session()
+        if not roster_token:
+            # 업로드한 원본 파일은 세션 업로드 폴더에 보관
+            session_folder = store.upload_dir(session_id)
+            for kind, upload, data in (('leaders', leaders_file, leaders_data),
+                                       ('members', members_file, members_data)):
+                with open(os.path.join(session_folder, f'{kind}.{file_extension(upload.filename)}'), 'wb') as f:
+                    f.write(data)
         
-        if result['success']:
-            return redirect(url_for('results', session_id=session_id))
-        else:
-            flash(f'조 배정 중 오류가 발생했습니다: {result["error"]}')
-            return redirect(url_for('index'))
+        # 조 배정은 작업 프로세스에서 실행하고, 진행 페이지에서 상태를 확인
+        job_id = jobs.submit(session_id, process_group_assignment, leaders, members, session_id,
+                             min_members, max_members, engine, time_limit, True, feasibility, use_cache, seed, table)
+        return redirect(url_for('job_page', job_id=job_id))
             
     except Exception as e:
+        FAILURES_TOTAL.inc(stage='upload')
         flash(f'파일 처리 중 오류가 발생했습니다: {str(e)}')
         return redirect(url_for('index'))
 
-def process_group_assignment(leaders_path, members_path, session_id, min_members, max_members):
-    """조 배정 처리"""
+def process_group_assignment(leaders, members, session_id, min_members, max_members,
+                             engine='greedy', time_limit=10.0, allow_infeasible=False, feasibility=None,
+                             use_cache=True, seed=None, table=None):
+    """조 배정 처리 (leaders, members는 파싱된 명단 DataFrame, table은 명단 캐시의 조원 인코딩, 작업 프로세스에서 실행)
+
+    seed를 주었고 같은 명단·설정·seed의 결과가 결과 캐시에 있으면 solve_groups를 건너뛰고 저장된 배정, 요약,
+    통계를 씁니다 (use_cache=False면 새로 배정하고 캐시를 갱신). seed 없이 실행한 배정은 실제로 쓴 seed로
+    캐시에 넣습니다. 조기 종료한 결과는 캐시에 넣지 않습니다.
+    단계별 시간과 캐시 적중 여부는 반환값의 'timings', 'cached'에 담아 웹 프로세스가 지표에 반영합니다 (record_job).
+    """
+    timings = {}
     try:
-        # 데이터 로드
-        leaders, members = load_data(leaders_path, members_path)
+        # 작업 큐가 이 표시를 보고 'running'으로 바꿈 (이후 진행 상황에도 같은 시작 시각을 넣음)
+        started_at = store.mark_started(session_id, len(members))
         
-        # 조 배정 실행
-        df_assigned = assign_groups(leaders, members, min_members, max_members)
-        
-        # 결과 저장
-        result_folder = os.path.join(RESULT_FOLDER, session_id)
-        os.makedirs(result_folder, exist_ok=True)
+        # 사전 검사 (탐색 전에 불가능한 명단을 걸러냄, 이미 검사했으면 그 결과 사용)
+        if feasibility is None:
+            feasibility = analyze_feasibility(leaders, members, min_members, max_members, table)
+        if not feasibility['feasible'] and not allow_infeasible:
+            return {'success': False, 'error': '사전 검사 실패', 'feasibility': feasibility,
+                    'engine': engine, 'timings': timings}
         
-        output_path = os.path.join(result_folder, 'final_group_assignment.csv')
-        df_assigned.to_csv(output_path, index=False, encoding='utf-8-sig')
+        # 진행 상황은 결과 폴더에 기록하고 (웹 프로세스가 SSE로 전달), 조기 종료 요청이 있으면 True 반환
+        def report_progress(event):
+            store.write_progress(session_id, {**event, 'started_at': started_at})
+            return store.stop_requested(session_id)
         
-        # 그룹 정보 재구성
-        groups = {}
-        for _, row in df_assigned.iterrows():
-            grp_num = row['조 번호']
-            if grp_num not in groups:
-                groups[grp_num] = {
-                    '조 번호': grp_num,
-                    'leader': None,
-                    'helper': None,
-                    'members': []
-                }
-            
-            if row['역할'] == '조장':
-                groups[grp_num]['leader'] = row.to_dict()
-            elif row['역할'] == '헬퍼':
-                groups[grp_num]['helper'] = row.to_dict()
-            else:
-                groups[grp_num]['members'].append(row.to_dict())
+        # 같은 명단·설정·seed의 이전 결과 확인 (seed가 없으면 재현할 수 없으므로 찾지 않음)
+        cache = get_result_cache()
+        cache_key = result_key(leaders, members, min_members, max_members, engine=engine, time_limit=time_limit,
+                               seed=seed)
+        cached = cache.get(cache_key) if use_cache and cache_key is not None else None
         
-        # 요약 보고서 생성
-        summary_df = generate_summary_report(groups, output_path)
-        
-        # JSON 형태로 결과 저장 (웹 표시용)
-        result_data = {
-            'session_id': session_id,
-            'total_groups': len(groups),
-            'total_members': len(members),
-            'groups': {},
-            'summary': summary_df.to_dict('records'),
-            'settings': {
-                'min_members': min_members,
-                'max_members': max_members
-            }
-        }
+        # 조 배정 실행
+        if cached is None:
+            with timed(timings, 'assign'):
+                result = solve_groups(leaders, members, min_members, max_members,
+                                      engine=engine, time_limit=time_limit, seed=seed, progress=report_progress,
+                                      table=table)
+            df_assigned, groups, summary_df = result.dataframe, result.groups, None
+            seed = result.seed
+        else:
+            df_assigned, groups, summary_df = cached['assignment'], cached['groups'], cached['summary']
+            store.write_progress(session_id, {'phase': 'done', 'phase_name': '완료 (이전 결과 재사용)',
+                                              'placed': len(members), 'total': len(members),
+                                              'current': df_assigned.attrs.get('objective', 0.0),
+                                              'best': df_assigned.attrs.get('objective', 0.0),
+                                              'elapsed': 0.0, 'fraction': 1.0, 'started_at': started_at})
         
-        for group in groups.values():
-            result_data['groups'][group['조 번호']] = {
-                '조 번호': group['조 번호'],
-                'leader': group['leader'],
-                'helper': group['helper'],
-                'members': group['members'],
-                'stats': calculate_group_stats(group)
-            }
+        # 결과 저장 (세션 잠금 안에서 임시 파일 + 이름 바꾸기로 기록)
+        with store.lock(session_id) as result_folder:
+            output_path = os.path.join(result_folder, 'final_group_assignment.csv')
+            with timed(timings, 'write_csv'):
+                write_csv_atomic(df_assigned, output_path)
+            summary_df = save_results(df_assigned, groups, members, session_id, output_path, min_members,
+                                      max_members, engine, time_limit, feasibility, timings, summary_df, seed)
         
-        with open(os.path.join(result_folder, 'result.json'), 'w', encoding='utf-8') as f:
-            json.dump(result_data, f, ensure_ascii=False, indent=2)
+        if cached is None and not store.stop_requested(session_id):
+            cache.put(result_key(leaders, members, min_members, max_members, engine=engine, time_limit=time_limit,
+                                 seed=seed), df_assigned, summary_df, groups)
         
-        return {'success': True, 'session_id': session_id}
+        return {'success': True, 'session_id': session_id, 'engine': engine, 'timings': timings,
+                'cached': cached is not None}
         
     except Exception as e:
         import traceback
         error_details = traceback.format_exc()
         print(f"Error details: {error_details}")
-        return {'success': False, 'error': str(e)}
+        return {'success': False, 'error': str(e), 'engine': engine, 'timings': timings}
 
-@app.route('/results/<session_id>')
-def results(session_id):
-    """결과 페이지"""
-    result_folder = os.path.join(RESULT_FOLDER, session_id)
-    result_json_path = os.path.join(result_folder, 'result.json')
+def save_results(df_assigned, groups, members, session_id, output_path, min_members, max_members,
+                 engine, time_limit, feasibility, timings, summary_df=None, seed=None):
+    """요약 CSV와 웹 표시용 결과(result_store 형식) 저장 (process_group_assignment가 세션 잠금 안에서 호출)
+
+    df_assigned는 결과 표, groups는 조별 'stats'를 포함한 조 dict (AssignmentResult.groups 또는 결과 캐시 항목)이며,
+    결과 캐시에서 꺼낸 summary_df를 주면 요약 보고서를 다시 만들지 않습니다. 요약 DataFrame을 반환합니다.
+    """
+    if summary_df is None:
+        # 요약 보고서 생성 (요약 CSV 저장 포함)
+        with timed(timings, 'summary'):
+            summary_df = generate_summary_report(groups, output_path)
+    else:
+        with timed(timings, 'write_csv'):
+            write_csv_atomic(summary_df, output_path.replace('.csv', '_summary.csv'))
     
-    if not os.path.exists(result_json_path):
-        flash('결과를 찾을 수 없습니다.')
-        return redirect(url_for('index'))
+    header = {
+        'session_id': session_id,
+        'total_groups': len(groups),
+        'total_members': len(members),
+        'feasibility': feasibility,
+        'settings': {
+            'min_members': min_members,
+            'max_members': max_members,
+            'engine': engine,
+            'time_limit': time_limit,
+            'seed': seed
+        }
+    }
+    stats = {group['조 번호']: group['stats'] for group in groups.values()}
+    with timed(timings, 'write_result'):
+        write_result(os.path.dirname(output_path), header, df_assigned, summary_df, stats)
+    return summary_df
+
+def job_snapshot(job_id):
+    """작업 상태 + 마지막 진행 상황 (없는 작업이면 None)"""
+    job = jobs.get(job_id)
+    if job is None:
+        return None
+    job['progress'] = store.read_progress(job['session_id'])
+    if job['status'] == 'done':
+        job['result_url'] = url_for('results', session_id=job['session_id'])
+    return job
+
+@app.route('/jobs/<job_id>')
+def job_status(job_id):
+    """조 배정 작업 상태 (queued/running/done/failed)와 진행 상황 JSON"""
+    job = job_snapshot(job_id)
+    if job is None:
+        return jsonify({'error': '작업을 찾을 수 없습니다.'}), 404
+    return jsonify(job)
+
+@app.route('/jobs/<job_id>/events')
+def job_events(job_id):
+    """작업 상태와 진행 상황 Server-Sent Events 스트림 (바뀔 때마다 전송, 작업이 끝나면 종료)"""
+    job = jobs.get(job_id)
+    if job is None:
+        return jsonify({'error': '작업을 찾을 수 없습니다.'}), 404
+    # 스트림은 요청 컨텍스트 밖에서 실행되므로 결과 URL을 미리 만들어 둠
+    result_url = url_for('results', session_id=job['session_id'])
     
+    def stream():
+        last = None
+        while True:
+            job = jobs.get(job_id)
+            if job is None:
+                break
+            job['progress'] = store.read_progress(job['session_id'])
+            if job['status'] == 'done':
+                job['result_url'] = result_url
+            payload = json.dumps(job, ensure_ascii=False)
+            if payload != last:
+                yield f"data: {payload}\n\n"
+                last = payload
+            if job['status'] in ('done', 'failed'):
+                break
+            time.sleep(EVENT_INTERVAL)
+    
+    return Response(stream(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.route('/jobs/<job_id>/stop', methods=['POST'])
+def job_stop(job_id):
+    """조기 종료 요청 (시간 제한이 있는 엔진은 지금까지 찾은 가장 좋은 배정으로 끝냄)"""
+    job = jobs.get(job_id)
+    if job is None:
+        return jsonify({'error': '작업을 찾을 수 없습니다.'}), 404
+    store.request_stop(job['session_id'])
+    return jsonify({'stopping': True})
+
+@app.route('/jobs/<job_id>/wait')
+def job_page(job_id):
+    """작업 진행 페이지 (상태를 주기적으로 확인하다가 끝나면 결과 페이지로 이동)"""
+    if jobs.get(job_id) is None:
+        flash('작업을 찾을 수 없습니다.')
+        return redirect(url_for('index'))
+    return render_template('job.html', job_id=job_id)
+
+@app.route('/results/<session_id>')
+def results(session_id):
+    """결과 페이지 (?page=N, 한 페이지에 result_store.GROUPS_PER_PAGE개 조)"""
     try:
-        with open(result_json_path, 'r', encoding='utf-8') as f:
-            result_data = json.load(f)
+        # 결과 파일은 원자적으로 교체되므로 잠금 없이 읽어도 완성된 파일만 보임
+        result_data = result_reader.page(session_id, request.args.get('page', 1, type=int))
+        if result_data is None:
+            flash('결과를 찾을 수 없습니다.')
+            return redirect(url_for('index'))
         
         return render_template('results.html', result=result_data)
         
@@ -203,10 +414,21 @@ def results(session_id):
         flash(f'결과 로딩 중 오류가 발생했습니다: {str(e)}')
         return redirect(url_for('index'))
 
+@app.route('/api/results/<session_id>')
+def result_api(session_id):
+    """결과 한 페이지 JSON (?page=N, 결과 페이지와 같은 내용)"""
+    result_data = result_reader.page(session_id, request.args.get('page', 1, type=int))
+    if result_data is None:
+        return jsonify({'error': '결과를 찾을 수 없습니다.'}), 404
+    return jsonify(result_data)
+
 @app.route('/download/<session_id>/<file_type>')
 def download_file(session_id, file_type):
     """파일 다운로드"""
-    result_folder = os.path.join(RESULT_FOLDER, session_id)
+    if not store.is_valid_id(session_id):
+        flash('결과를 찾을 수 없습니다.')
+        return redirect(url_for('index'))
+    result_folder = store.result_dir(session_id)
     
     if file_type == 'results':
         file_path = os.path.join(result_folder, 'final_group_assignment.csv')
@@ -238,33 +460,53 @@ def validate_files():
         return jsonify({'valid': False, 'message': '파일을 선택해주세요.'})
     
     if not (allowed_file(leaders_file.filename) and allowed_file(members_file.filename)):
-        return jsonify({'valid': False, 'message': 'Excel 파일(.xlsx, .xls)만 업로드 가능합니다.'})
+        return jsonify({'valid': False, 'message': 'Excel(.xlsx, .xls), CSV, Parquet, Arrow 파일만 업로드 가능합니다.'})
     
     try:
-        # 임시 파일로 저장하여 데이터 검증
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.xlsx') as tmp_leaders:
-            leaders_file.save(tmp_leaders.name)
-        
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.xlsx') as tmp_members:
-            members_file.save(tmp_members.name)
+        min_members = int(request.form.get('min_members', 6))
+        max_members = int(request.form.get('max_members', 8))
         
-        # 데이터 로드 테스트
-        leaders, members = load_data(tmp_leaders.name, tmp_members.name)
+        # 데이터 로드 테스트 (파싱 결과는 명단 캐시에 남아 /upload에서 토큰으로 재사용)
+        cache = get_roster_cache()
+        leaders_data = leaders_file.read()
+        members_data = members_file.read()
+        UPLOAD_BYTES.observe(len(leaders_data), kind='leaders')
+        UPLOAD_BYTES.observe(len(members_data), kind='members')
+        leaders_digest = file_digest(leaders_data)
+        members_digest = file_digest(members_data)
+        with INGEST_SECONDS.time(source='validate'):
+            leaders = cache.load('leaders', leaders_data, leaders_file.filename, digest=leaders_digest)
+            members = cache.load('members', members_data, members_file.filename, digest=members_digest)
+            table = cache.member_table(members_digest, members)
         
-        # 임시 파일 삭제
-        os.unlink(tmp_leaders.name)
-        os.unlink(tmp_members.name)
+        # 사전 검사 (하드 조건 위반 예상 여부)
+        feasibility = analyze_feasibility(leaders, members, min_members, max_members, table)
         
         return jsonify({
             'valid': True,
             'message': '파일이 유효합니다.',
             'leaders_count': len(leaders),
-            'members_count': len(members)
+            'members_count': len(members),
+            'feasibility': feasibility,
+            'roster_token': issue_roster_token(leaders_digest, members_digest)
         })
         
     except Exception as e:
+        FAILURES_TOTAL.inc(stage='validate')
         return jsonify({'valid': False, 'message': f'파일 검증 중 오류: {str(e)}'})
 
+@app.route('/metrics')
+def metrics():
+    """Prometheus 스크레이프용 운영 지표 (텍스트 형식 0.0.4)"""
+    for status, count in jobs.counts().items():
+        JOBS_IN_STATE.set(count, status=status)
+    cache = get_roster_cache()
+    CACHE_LOOKUPS.sync(cache.hits, result='hit')
+    CACHE_LOOKUPS.sync(cache.misses, result='miss')
+    lookups = cache.hits + cache.misses
+    CACHE_HIT_RATIO.set(cache.hits / lookups if lookups else 0.0)
+    return Response(registry.render(), content_type=CONTENT_TYPE)
+
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 8080))
     app.run(debug=False, host='0.0.0.0', port=port) 
\ No newline at end of file
@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+조 배정 성능 측정
+합성 명단(create_real_sample_data.generate_rosters)으로 명단 읽기(load_data), 조 배정(solve_groups)
+단계별 시간, 요약 보고서(generate_summary_report) 시간을 재고 JSON으로 저장합니다.
+--baseline으로 이전 결과를 주면 허용 범위보다 느려진 항목을 출력하고 종료 코드 1을 반환하므로,
+수련회 시즌 전에 성능 저하를 확인할 수 있습니다.
+
+--anytime을 주면 고정된 명단 묶음(시나리오 × 인원 수)에 엔진별로 조 배정을 실행해 시간에 따른
+목적함수 곡선과 조건 위반 수(하드 조건은 배정 결과에서 다시 판정)를 CSV로 저장하고, matplotlib이 있으면 그래프도 그립니다.
+운영 환경의 --time-limit을 고를 때 사용합니다.
+
+--check-improvement를 주면 annealing/tabu 엔진이 출발점인 greedy 결과보다 나아지는 명단이
+하나도 없을 때 종료 코드 1을 반환합니다.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import math
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from camp_group_assignment import load_data, solve_groups, AssignmentResult, ENGINES, cp_model
+from create_real_sample_data import generate_rosters, save_rosters, SCENARIOS
+from job_store import write_csv_atomic
+
+try:
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+except ImportError:  # 그래프는 선택 사항
+    plt = None
+
+SIZES = (100, 1000, 10000, 50000)
+ANYTIME_SIZES = (100, 1000)
+HARD_CONDITIONS = ('의대24_25_분리', '같은학교_금지', '나이_조건')
+SOFT_CONDITIONS = ('성비_균형', '학과_분포', '지역_다양성')
+# 완성된 배정의 실제 목적함수를 보고하는 단계 (greedy는 배정 중간값, exact는 CP-SAT 대리 목적함수)
+COMPARABLE_PHASES = ('balance', 'improve', 'annealing', 'tabu', 'done')
+TIMED = ('load_seconds', 'assign_seconds', 'summary_seconds')
+NOISE_FLOOR = 0.05  # 이보다 작은 차이(초)는 성능 저하로 보지 않음
+
+def run_case(members: int, scenario: str = 'balanced', engine: str = 'greedy', time_limit: float = 10.0,
+             seed: int = 0, fmt: str = 'xlsx', min_members: int = 6, max_members: int = 8) -> Dict:
+    """명단 1개를 생성해 읽기 → 배정 → 요약 보고서 시간을 측정"""
+    with tempfile.TemporaryDirectory() as workdir:
+        start = time.perf_counter()
+        leaders, roster = generate_rosters(members, scenario=scenario, seed=seed)
+        leaders_path, members_path = save_rosters(leaders, roster, workdir, fmt, 'bench')
+        generate_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        leaders, roster = load_data(leaders_path, members_path)
+        load_seconds = time.perf_counter() - start
+
+        # 배정 중 진행 로그는 숨김
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            result = solve_groups(leaders, roster, min_members, max_members,
+                                  engine=engine, time_limit=time_limit, seed=seed)
+            result.dataframe
+            assign_seconds = time.perf_counter() - start
+
+            start = time.perf_counter()
+            result.summary(os.path.join(workdir, 'bench.csv'))
+            summary_seconds = time.perf_counter() - start
+
+    profile = result.profile
+    return {
+        'members': members,
+        'groups': len(result.groups),
+        'scenario': scenario,
+        'engine': engine,
+        'time_limit': time_limit,
+        'seed': seed,
+        'format': fmt,
+        'generate_seconds': generate_seconds,
+        'load_seconds': load_seconds,
+        'assign_seconds': assign_seconds,
+        'summary_seconds': summary_seconds,
+        'objective': result.objective,
+        'phases': {phase['phase']: phase['seconds'] for phase in profile['phases']},
+        'counters': profile['counters'],
+        'max_rss_mb': max_rss_mb(),
+    }
+
+def max_rss_mb() -> float:
+    """이 프로세스의 최대 상주 메모리(MB) (ru_maxrss 단위가 macOS는 바이트, Linux 등은 KB)"""
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss / (1024 * 1024) if sys.platform == 'darwin' else max_rss / 1024
+
+def count_violations(result: AssignmentResult, members: pd.DataFrame, min_members: int, max_members: int) -> Dict:
+    """조건별 위반 조 수, 미배정 조원 수, 인원 범위를 벗어난 조 수
+
+    하드 조건은 배정 결과와 원본 명단으로 다시 판정하고(AssignmentResult.hard_violations),
+    최적화 조건은 조별 stats의 충족 여부를 셉니다.
+    """
+    failed = result.hard_violations(members)
+    failed.update({condition: 0 for condition in SOFT_CONDITIONS})
+    for group in result.groups.values():
+        for condition in SOFT_CONDITIONS:
+            if not group['stats']['conditions_met'][condition]:
+                failed[condition] += 1
+    sizes = [len(group['members']) for group in result.groups.values()]
+    return {
+        'unassigned': len(members) - sum(sizes),
+        'size_violations': sum(1 for size in sizes if not min_members <= size <= max_members),
+        'hard_violations': sum(failed[condition] for condition in HARD_CONDITIONS),
+        'soft_violations': sum(failed[condition] for condition in SOFT_CONDITIONS),
+        **failed,
+    }
+
+def run_anytime(leaders: pd.DataFrame, members: pd.DataFrame, engine: str, time_limit: float, seed: int = 0,
+                min_members: int = 6, max_members: int = 8) -> Tuple[List[Dict], Dict]:
+    """엔진 하나로 조 배정을 실행해 (진행 이벤트 목록, 최종 결과 요약) 반환"""
+    events = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        result = solve_groups(leaders, members, min_members, max_members, engine=engine,
+                              time_limit=time_limit, seed=seed, progress=events.append)
+        seconds = time.perf_counter() - start
+
+    # 완성된 배정의 목적함수만 누적 최대값으로 이어 그림
+    best = np.nan
+    trajectory = []
+    for event in events:
+        if event['phase'] in COMPARABLE_PHASES:
+            best = event['current'] if np.isnan(best) else max(best, event['current'])
+        trajectory.append({'elapsed': event['elapsed'], 'phase': event['phase'], 'placed': event['placed'],
+                           'current': event['current'], 'best': best})
+
+    summary = {
+        'seconds': seconds,
+        'objective': result.objective,
+        **count_violations(result, members, min_members, max_members),
+    }
+    return trajectory, summary
+
+def plot_curves(curves: pd.DataFrame, path: str):
+    """명단별로 엔진의 최고 목적함수-경과 시간 곡선을 그려 저장"""
+    rosters = list(curves.groupby(['scenario', 'members'], sort=False))
+    columns = min(2, len(rosters))
+    rows = math.ceil(len(rosters) / columns)
+    fig, axes = plt.subplots(rows, columns, figsize=(6 * columns, 4 * rows), squeeze=False)
+    for ax, ((scenario, members), roster_curves) in zip(axes.flat, rosters):
+        for engine, engine_curve in roster_curves.groupby('engine', sort=False):
+            engine_curve = engine_curve.dropna(subset=['best'])
+            ax.step(engine_curve['elapsed'], engine_curve['best'], where='post', label=engine)
+        ax.set_title(f"{scenario} / {members} members")
+        ax.set_xlabel('elapsed (s)')
+        ax.set_ylabel('best objective')
+        ax.legend()
+    for ax in list(axes.flat)[len(rosters):]:
+        ax.set_visible(False)
+    fig.tight_layout()
+    fig.savefig(path, dpi=120)
+    plt.close(fig)
+
+def anytime_benchmark(sizes: List[int], scenarios: List[str], engines: List[str], time_limit: float,
+                      seed: int, out_dir: str):
+    """고정된 명단 묶음에 엔진별 조 배정을 실행해 curves.csv, summary.csv (와 curves.png)를 out_dir에 저장"""
+    curves, summaries = [], []
+    for scenario in scenarios:
+        for size in sizes:
+            # 실제 업로드와 같은 경로로 읽도록 파일로 저장했다가 load_data로 읽음
+            with tempfile.TemporaryDirectory() as workdir:
+                leaders, roster = generate_rosters(size, scenario=scenario, seed=seed)
+                leaders, roster = load_data(*save_rosters(leaders, roster, workdir, 'csv', 'bench'))
+            for engine in engines:
+                print(f"[{scenario}] 조원 {size}명, {engine} 엔진 실행 중...", flush=True)
+                trajectory, summary = run_anytime(leaders, roster, engine, time_limit, seed)
+                labels = {'scenario': scenario, 'members': size, 'engine': engine}
+                curves.extend({**labels, **point} for point in trajectory)
+                summaries.append({**labels, **summary})
+                print(f"  {summary['seconds']:.2f}초, 목적함수 {summary['objective']:.4f}, "
+                      f"하드 조건 위반 {summary['hard_violations']}건 (미배정 {summary['unassigned']}명, "
+                      f"인원 범위 위반 {summary['size_violations']}조), 최적화 조건 위반 {summary['soft_violations']}건")
+
+    os.makedirs(out_dir, exist_ok=True)
+    curves = pd.DataFrame(curves)
+    write_csv_atomic(curves, os.path.join(out_dir, 'curves.csv'))
+    write_csv_atomic(pd.DataFrame(summaries), os.path.join(out_dir, 'summary.csv'))
+    if plt is None:
+        print("matplotlib이 설치되어 있지 않아 그래프는 건너뜁니다 (pip install matplotlib)")
+    else:
+        plot_curves(curves, os.path.join(out_dir, 'curves.png'))
+    print(f"시간-품질 곡선이 {out_dir}에 저장되었습니다.")
+
+def check_improvement(sizes: List[int], scenarios: List[str], engines: List[str], time_limit: float,
+                      seed: int) -> List[str]:
+    """메타휴리스틱 엔진이 출발점(같은 seed의 greedy 결과)보다 나아지는지 확인
+
+    엔진마다 생성한 명단 중 하나 이상에서 목적함수가 greedy보다 커져야 하며,
+    어느 명단에서도 나아지지 않은 엔진 목록(실패 메시지)을 반환합니다.
+    """
+    improved = {engine: 0 for engine in engines}
+    for scenario in scenarios:
+        for size in sizes:
+            with tempfile.TemporaryDirectory() as workdir:
+                leaders, roster = generate_rosters(size, scenario=scenario, seed=seed)
+                leaders, roster = load_data(*save_rosters(leaders, roster, workdir, 'csv', 'bench'))
+            _, start = run_anytime(leaders, roster, 'greedy', time_limit, seed)
+            for engine in engines:
+                _, summary = run_anytime(leaders, roster, engine, time_limit, seed)
+                gain = summary['objective'] - start['objective']
+                if gain > 1e-9:
+                    improved[engine] += 1
+                print(f"[{scenario}] 조원 {size}명, {engine}: 목적함수 {start['objective']:.4f} -> "
+                      f"{summary['objective']:.4f} ({gain:+.4f})")
+    return [f"{engine}: 명단 {len(scenarios) * len(sizes)}개 모두 출발점보다 나아지지 않음"
+            for engine, count in improved.items() if count == 0]
+
+def case_key(case: Dict) -> str:
+    return f"{case['scenario']}/{case['engine']}/{case['members']}"
+
+def compare(current: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """baseline보다 tolerance(비율) 넘게 느려진 항목 목록 (단계별 시간 포함)"""
+    baseline_cases = {case_key(case): case for case in baseline['cases']}
+    regressions = []
+    for case in current['cases']:
+        before = baseline_cases.get(case_key(case))
+        if before is None:
+            continue
+        pairs = [(name, case[name], before[name]) for name in TIMED]
+        pairs += [(f"phase:{phase}", seconds, before['phases'][phase])
+                  for phase, seconds in case['phases'].items() if phase in before['phases']]
+        for name, now, then in pairs:
+            if now > then * (1 + tolerance) and now - then > NOISE_FLOOR:
+                regressions.append(f"{case_key(case)} {name}: {then:.3f}초 -> {now:.3f}초 (+{(now / then - 1):.0%})")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="조 배정 성능 측정")
+    parser.add_argument('--sizes', type=int, nargs='+', default=None,
+                        help=f"조원 수 목록 (기본값: {' '.join(map(str, SIZES))}, "
+                             f"--anytime이면 {' '.join(map(str, ANYTIME_SIZES))})")
+    parser.add_argument('--scenarios', nargs='+', choices=list(SCENARIOS), default=None,
+                        help="명단 시나리오 (기본값: balanced, --anytime이면 전체)")
+    parser.add_argument('--engine', choices=list(ENGINES), default='greedy', help="배정 엔진 (기본값: greedy)")
+    parser.add_argument('--anytime', action='store_true', help="엔진별 시간-품질 곡선 측정")
+    parser.add_argument('--check-improvement', action='store_true',
+                        help="annealing/tabu 엔진이 출발점(greedy 결과)보다 나아지는지 확인 (아니면 종료 코드 1)")
+    parser.add_argument('--engines', nargs='+', choices=list(ENGINES), default=None,
+                        help="--anytime에서 비교할 엔진 (기본값: 설치된 전체 엔진), "
+                             "--check-improvement에서 확인할 엔진 (기본값: annealing tabu)")
+    parser.add_argument('--time-limit', type=float, default=10.0, help="greedy 외 엔진의 탐색 시간 제한 (초)")
+    parser.add_argument('--seed', type=int, default=0, help="명단 생성과 배정에 쓰는 seed (기본값: 0)")
+    parser.add_argument('--format', choices=('xlsx', 'csv', 'parquet'), default='xlsx',
+                        help="명단 파일 형식 (기본값: xlsx)")
+    parser.add_argument('--out', default=None,
+                        help="결과 JSON 경로 (기본값: benchmarks/benchmark_<시각>.json), "
+                             "--anytime이면 결과 폴더 (기본값: benchmarks/anytime_<시각>)")
+    parser.add_argument('--baseline', default=None, help="비교할 이전 결과 JSON")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="허용하는 느려짐 비율 (기본값: 0.25)")
+    args = parser.parse_args()
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+
+    if args.anytime:
+        engines = args.engines or [engine for engine in ENGINES if engine != 'exact' or cp_model is not None]
+        anytime_benchmark(args.sizes or list(ANYTIME_SIZES), args.scenarios or list(SCENARIOS), engines,
+                          args.time_limit, args.seed, args.out or os.path.join('benchmarks', f"anytime_{timestamp}"))
+        return
+
+    if args.check_improvement:
+        failures = check_improvement(args.sizes or list(ANYTIME_SIZES), args.scenarios or list(SCENARIOS),
+                                     args.engines or ['annealing', 'tabu'], args.time_limit, args.seed)
+        if failures:
+            print("⚠️ 출발점보다 나아지지 않은 엔진:")
+            for line in failures:
+                print(f"  - {line}")
+            raise SystemExit(1)
+        print("모든 엔진이 하나 이상의 명단에서 출발점보다 나아졌습니다.")
+        return
+
+    out = args.out or os.path.join('benchmarks', f"benchmark_{timestamp}.json")
+    result = {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'cases': [],
+    }
+    for scenario in args.scenarios or ['balanced']:
+        for size in args.sizes or list(SIZES):
+            print(f"[{scenario}] 조원 {size}명 측정 중...", flush=True)
+            case = run_case(size, scenario, args.engine, args.time_limit, args.seed, args.format)
+            result['cases'].append(case)
+            phases = ', '.join(f"{phase} {seconds:.3f}" for phase, seconds in case['phases'].items())
+            print(f"  읽기 {case['load_seconds']:.3f}초, 배정 {case['assign_seconds']:.3f}초 ({phases}), "
+                  f"요약 {case['summary_seconds']:.3f}초, 목적함수 {case['objective']:.4f}")
+
+    os.makedirs(os.path.dirname(out) or '.', exist_ok=True)
+    with open(out, 'w', encoding='utf-8') as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+    print(f"측정 결과가 {out}에 저장되었습니다.")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(result, baseline, args.tolerance)
+        if regressions:
+            print(f"⚠️ 기준({args.baseline})보다 {args.tolerance:.0%} 넘게 느려진 항목:")
+            for line in regressions:
+                print(f"  - {line}")
+            raise SystemExit(1)
+        print(f"기준({args.baseline}) 대비 성능 저하 없음")
+
+if __name__ == '__main__':
+    main()
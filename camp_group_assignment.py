@@ -18,164 +18,1461 @@ import numpy as np
 from collections import defaultdict, Counter
 import random
 import argparse
-from typing import List, Dict, Tuple
+import math
+import time
+import logging
+import os
+import io
+import contextlib
+import re
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Tuple, Optional, Callable
 
-def load_data(leaders_file: str, members_file: str) -> Tuple[pd.DataFrame, pd.DataFrame]:
-    """데이터 로드 및 전처리"""
-    # 조장/헬퍼 데이터
-    df_leaders = pd.read_excel(leaders_file, sheet_name="Sheet1", dtype=str)
-    df_leaders['나이'] = pd.to_numeric(df_leaders['나이'], errors='coerce').fillna(0).astype(int)
-    
-    # 조원 데이터
-    df_members = pd.read_excel(members_file, sheet_name="등록 데이터", dtype=str)
-    # 나이 컬럼에서 "세" 제거하고 숫자로 변환
-    df_members['나이'] = df_members['나이'].str.replace("세", "").astype(int)
-    
-    return df_leaders, df_members
+from roster_loader import load_rosters, READERS
+from job_store import write_csv_atomic
+from result_export import MEMBER_COLUMNS, assignment_frame, group_records
+
+try:
+    from ortools.sat.python import cp_model
+except ImportError:  # 선택 의존성: exact 엔진에서만 사용
+    cp_model = None
+
+# 조원 이동 같은 세부 로그 (기본 비활성, CLI에서는 --verbose로 출력)
+logger = logging.getLogger('camp_group_assignment')
+
+def load_data(leaders_file: str, members_file: str, reader: str = 'auto') -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """데이터 로드 및 전처리
+
+    Excel(.xlsx/.xls), CSV, Parquet, Arrow(.arrow/.feather) 명단을 배정에 필요한 열만 읽습니다.
+    reader는 Excel 읽기 방식('auto', 'calamine', 'openpyxl')입니다 (roster_loader.READERS 참고).
+    """
+    return load_rosters(leaders_file, members_file, reader)
 
 def canonical_school(school_name: str) -> str:
     """학교명 정규화"""
     if pd.isna(school_name):
         return ""
-    return str(school_name).replace("대학교", "").replace("대학", "").replace("본", "").replace("캠퍼스", "").strip()
+    return _canonical_school(str(school_name))
+
+@lru_cache(maxsize=None)
+def _canonical_school(school_name: str) -> str:
+    return school_name.replace("대학교", "").replace("대학", "").replace("본", "").replace("캠퍼스", "").strip()
+
+# 학과 분류: 약칭은 사전 조회, 전체 학과명은 키워드를 한 번에 찾아 우선순위로 판정
+_MAJOR_ABBREVIATIONS = {"의": "의대", "치": "치대", "한": "한의대", "간": "간호대"}
+# 전방 탐색으로 겹치는 키워드(예: '한의' 안의 '의')까지 모두 찾음
+_MAJOR_PATTERN = re.compile("(?=(의공학과|약학과|한의|의|치|간호))")
 
 def extract_major(학과: str) -> str:
     """학과에서 전공 분류 추출"""
     if pd.isna(학과):
         return ""
-    학과 = str(학과).strip()
-    
+    return _classify_major(str(학과).strip())
+
+@lru_cache(maxsize=None)
+def _classify_major(학과: str) -> str:
     # 의·치·한·간 약칭 처리
-    if 학과 in ["의", "치", "한", "간"]:
-        if 학과 == "의":
-            return "의대"
-        elif 학과 == "치":
-            return "치대"
-        elif 학과 == "한":
-            return "한의대"
-        elif 학과 == "간":
-            return "간호대"
-    
-    # 전체 학과명 처리
-    if "의공학과" in 학과 or "약학과" in 학과:
-        return "기타"  # 의공학과, 약학과는 기타로 분류
-    
-    if "의" in 학과 and "한의" not in 학과:
+    if 학과 in _MAJOR_ABBREVIATIONS:
+        return _MAJOR_ABBREVIATIONS[학과]
+    
+    found = set(_MAJOR_PATTERN.findall(학과))
+    
+    # 의공학과, 약학과는 기타로 분류
+    if "의공학과" in found or "약학과" in found:
+        return "기타"
+    if "의" in found and "한의" not in found:
         return "의대"
-    elif "치" in 학과:
+    elif "치" in found:
         return "치대"
-    elif "한의" in 학과:
+    elif "한의" in found:
         return "한의대"
-    elif "간호" in 학과:
+    elif "간호" in found:
         return "간호대"
     else:
         return "기타"
 
+# 지역 분류: 앞에 있는 지역일수록 우선 (서울‧경기 > 대구‧경북 > ... > 대전‧충남)
+_REGION_KEYWORDS = (
+    ("서울‧경기", ("서울", "연세", "고려", "성균관", "경기")),
+    ("대구‧경북", ("대구", "경북")),
+    ("부산‧경남", ("부산", "경남")),
+    ("전북", ("전북",)),
+    ("충북·천안", ("충북", "천안")),
+    ("강원", ("강원",)),
+    ("광주‧전남", ("광주", "전남")),
+    ("대전‧충남", ("대전", "충남")),
+)
+_REGION_RANK = {keyword: rank for rank, (_, keywords) in enumerate(_REGION_KEYWORDS) for keyword in keywords}
+_REGION_PATTERN = re.compile("(?=(" + "|".join(sorted(_REGION_RANK, key=len, reverse=True)) + "))")
+
 def extract_region(학교: str) -> str:
     """학교에서 지역 추출"""
     if pd.isna(학교):
         return ""
-    학교 = str(학교).strip()
-    
-    # 서울‧경기
-    if "서울" in 학교 or "연세" in 학교 or "고려" in 학교 or "성균관" in 학교 or "경기" in 학교:
-        return "서울‧경기"
-    
-    # 대구‧경북
-    elif "대구" in 학교 or "경북" in 학교:
-        return "대구‧경북"
-    
-    # 부산‧경남
-    elif "부산" in 학교 or "경남" in 학교:
-        return "부산‧경남"
-    
-    # 전북
-    elif "전북" in 학교:
-        return "전북"
-    
-    # 충북·천안
-    elif "충북" in 학교 or "천안" in 학교:
-        return "충북·천안"
-    
-    # 강원
-    elif "강원" in 학교:
-        return "강원"
-    
-    # 광주‧전남
-    elif "광주" in 학교 or "전남" in 학교:
-        return "광주‧전남"
-    
-    # 대전‧충남
-    elif "대전" in 학교 or "충남" in 학교:
-        return "대전‧충남"
-    
-    else:
+    return _classify_region(str(학교).strip())
+
+@lru_cache(maxsize=None)
+def _classify_region(학교: str) -> str:
+    ranks = [_REGION_RANK[keyword] for keyword in _REGION_PATTERN.findall(학교)]
+    if not ranks:
         return "기타"
+    return _REGION_KEYWORDS[min(ranks)][0]
 
-def can_assign_to_group(group: Dict, member: Dict, used_schools: set, used_regions: set, total_gender_ratio: float = 0.5, max_gender_diff: int = 1) -> bool:
-    """조원을 해당 조에 배정할 수 있는지 확인"""
-    
-    # === 1단계: 필수 조건 체크 (절대 위반 불가) ===
-    
-    # 1. 의대 24/25학번 분리 체크
-    leader_major = extract_major(group['leader'].get('학과', ''))
-    member_major = extract_major(member.get('학과', ''))
-    
-    if leader_major == "의대" and member_major == "의대":
-        # 학번 컬럼이 있는지 확인하고 안전하게 처리
-        leader_학번 = group['leader'].get('학번', '')
-        member_학번 = member.get('학번', '')
+MAJOR_CODES = ('', '의대', '치대', '한의대', '간호대', '기타')
+REGION_CODES = ('',) + tuple(region for region, _ in _REGION_KEYWORDS) + ('기타',)
+_MAJOR_INDEX = {major: code for code, major in enumerate(MAJOR_CODES)}
+_REGION_INDEX = {region: code for code, region in enumerate(REGION_CODES)}
+
+class Classifier:
+    """명단 1회 처리 동안의 캠퍼스/학과 분류 캐시
+
+    (캠퍼스, 학과) 문자열 쌍마다 한 번만 분류해 (학교 id, 학과 코드, 지역 코드)를 돌려줍니다.
+    학교 id는 이번 실행에서 처음 나온 순서대로 0부터 부여하고, 코드는 MAJOR_CODES/REGION_CODES의
+    위치입니다. 지역이 '기타'로 떨어진 캠퍼스는 unknown_campuses에 인원수와 함께 모읍니다.
+    """
+
+    def __init__(self):
+        self.schools: List[str] = []
+        self.school_ids: Dict[str, int] = {}
+        self.unknown_campuses: Counter = Counter()
+        self._cache: Dict[Tuple, Tuple[int, int, int]] = {}
+
+    def classify(self, campus, department) -> Tuple[int, int, int]:
+        # 빈 칸(NaN)은 서로 같지 않으므로 None으로 바꿔 캐시 키로 사용
+        key = (None if pd.isna(campus) else campus, None if pd.isna(department) else department)
+        codes = self._cache.get(key)
+        if codes is None:
+            school = canonical_school(campus)
+            school_id = self.school_ids.get(school)
+            if school_id is None:
+                school_id = self.school_ids[school] = len(self.schools)
+                self.schools.append(school)
+            codes = (school_id, _MAJOR_INDEX[extract_major(department)], _REGION_INDEX[extract_region(campus)])
+            self._cache[key] = codes
+        if codes[2] == len(REGION_CODES) - 1:
+            self.unknown_campuses[campus] += 1
+        return codes
+
+MEDICAL_MAJORS = ('의대', '치대', '한의대', '간호대')
+
+def cohort_year(학번) -> str:
+    """학번에서 입학년도(마지막 2자리) 추출, 정보가 없으면 빈 문자열"""
+    if not 학번 or 학번 == '-':
+        return ""
+    return str(학번)[-2:]
+
+GENDER_CODES = ('', '남', '여')
+_GENDER_INDEX = {gender: code for code, gender in enumerate(GENDER_CODES)}
+
+class MemberTable:
+    """조원 명단의 열 단위 인코딩 (struct-of-arrays)
+
+    배정에 필요한 값만 작은 정수 코드 배열로 담습니다. 성별/학과/지역은 GENDER_CODES,
+    MAJOR_CODES, REGION_CODES의 위치, 학교와 학번은 schools/years의 위치입니다.
+    row는 원본 DataFrame의 행 위치로, 이름·연락처 같은 개인정보는 결과를 만들 때만
+    원본에서 꺼냅니다. to_frame/from_frame으로 저장했다가 다시 분류하지 않고 복원할 수 있습니다 (roster_cache).
+    """
+    __slots__ = ('row', 'gender', 'age', 'major', 'region', 'school', 'year', 'schools', 'years', 'unknown_campuses')
+    COLUMNS = ('row', 'gender', 'age', 'major', 'region', 'school', 'year')
+
+    def __init__(self, members: pd.DataFrame, classifier: Optional['Classifier'] = None):
+        classifier = classifier or Classifier()
+        count = len(members)
         
-        if leader_학번 and member_학번 and leader_학번 != '-' and member_학번 != '-':
-            leader_year = str(leader_학번)[-2:]  # 마지막 2자리
-            member_year = str(member_학번)[-2:]
-            if leader_year in ["24", "25"] and member_year in ["24", "25"] and leader_year != member_year:
-                return False
-    
-    # 2. 같은 학교 체크
-    member_school = canonical_school(member.get('캠퍼스', ''))
-    if member_school in used_schools:
-        return False
-    
-    # 3. 나이 조건 체크 (헬퍼보다 어려야 함)
-    helper_age = group['helper'].get('나이', 0)
-    member_age = member.get('나이', 0)
-    
-    if group['leader'].get('나이', 0) == 37:  # 37세 조장 예외
-        if member_age > 39:
-            return False
-    else:
-        if member_age >= helper_age:
+        def column(name, default=''):
+            return members[name].to_numpy() if name in members.columns else np.full(count, default, dtype=object)
+        
+        genders = column('성별')
+        departments = column('학과')
+        cohorts = [cohort_year(value) for value in column('학번')]
+        year_ids: Dict[str, int] = {}
+        for value in cohorts:
+            year_ids.setdefault(value, len(year_ids))
+        self.years = list(year_ids)
+        
+        codes = np.zeros((count, 3), dtype=np.int64)
+        if '캠퍼스' in members.columns:
+            for position, (campus, department) in enumerate(zip(members['캠퍼스'].to_numpy(), departments)):
+                codes[position] = classifier.classify(campus, department)
+        else:
+            # 캠퍼스 열이 없으면 학교는 빈 값, 지역은 '학교/학년'에서 추출
+            school_id, _, _ = classifier.classify('', '')
+            for position, (school, department) in enumerate(zip(column('학교/학년'), departments)):
+                codes[position] = (school_id, _MAJOR_INDEX[extract_major(department)],
+                                   _REGION_INDEX[extract_region(school)])
+        self.schools = classifier.schools
+        self.unknown_campuses = classifier.unknown_campuses
+        
+        self.row = np.arange(count, dtype=np.int32)
+        self.gender = np.array([_GENDER_INDEX.get(value, 0) for value in genders], dtype=np.int8)
+        self.age = (members['나이'].to_numpy(dtype=np.int64) if '나이' in members.columns
+                    else np.zeros(count, dtype=np.int64)).astype(np.int16)
+        self.major = codes[:, 1].astype(np.int8)
+        self.region = codes[:, 2].astype(np.int8)
+        self.school = codes[:, 0].astype(np.int16 if len(self.schools) < 2 ** 15 else np.int32)
+        self.year = np.array([year_ids[value] for value in cohorts], dtype=np.int16)
+
+    def __len__(self) -> int:
+        return len(self.row)
+
+    def to_frame(self) -> pd.DataFrame:
+        """코드 열 DataFrame (학교/학번 라벨과 미분류 캠퍼스 수는 attrs에 담아 Parquet에 함께 저장됨)"""
+        frame = pd.DataFrame({column: getattr(self, column) for column in self.COLUMNS})
+        frame.attrs = {'schools': list(self.schools), 'years': list(self.years),
+                       'unknown_campuses': dict(self.unknown_campuses)}
+        return frame
+
+    @classmethod
+    def from_frame(cls, frame: pd.DataFrame) -> 'MemberTable':
+        """to_frame 결과로 다시 분류하지 않고 MemberTable 복원"""
+        table = cls.__new__(cls)
+        for column in cls.COLUMNS:
+            setattr(table, column, frame[column].to_numpy())
+        table.schools = list(frame.attrs['schools'])
+        table.years = list(frame.attrs['years'])
+        table.unknown_campuses = Counter(frame.attrs['unknown_campuses'])
+        return table
+
+    def profiles(self) -> List['MemberProfile']:
+        """조원마다 엔진에서 쓰는 MemberProfile 생성 (index는 표의 위치)"""
+        return [MemberProfile(self, index) for index in range(len(self))]
+
+class MemberProfile:
+    """조원 1명의 배정용 파생 정보 (MemberTable의 한 행을 문자열 라벨로 풀어 둔 것)"""
+    __slots__ = ('row', 'index', 'gender', 'age', 'major', 'region', 'school', 'school_id', 'year')
+
+    def __init__(self, table: MemberTable, index: int):
+        self.row = int(table.row[index])  # 원본 DataFrame 행 위치
+        self.index = index                # FeasibilityMatrix 행 번호
+        self.gender = GENDER_CODES[table.gender[index]]
+        self.age = int(table.age[index])
+        self.major = MAJOR_CODES[table.major[index]]
+        self.region = REGION_CODES[table.region[index]]
+        self.school = table.schools[table.school[index]]
+        self.school_id = int(table.school[index])
+        self.year = table.years[table.year[index]]
+
+class GroupState:
+    """조 1개의 배정 상태
+
+    조원 추가/제거/교환 시 성별 수, 학과/지역 카운터, 학교 집합, 나이 합계/제곱합을
+    증분 갱신하므로 점수 계산은 조 인원과 무관하게 O(1)입니다.
+    성별과 나이는 조원만, 학과와 지역은 조장/헬퍼를 포함해 집계합니다.
+    """
+    __slots__ = ('number', 'index', 'school_bits', 'arrays', 'leader', 'helper', 'members',
+                 'leader_major', 'leader_year', 'leader_age', 'helper_age',
+                 'male', 'female', 'age_sum', 'age_sq_sum', 'age_buckets',
+                 'major_counts', 'major_pairs', 'region_counts', 'region_pairs',
+                 'school_counts')
+
+    def __init__(self, number: str, leader: Dict, helper: Dict):
+        self.number = number
+        self.index = -1          # FeasibilityMatrix 열 번호
+        self.school_bits = None  # FeasibilityMatrix.school_bits의 이 조 행
+        self.arrays = None       # 벡터화 점수 계산용 GroupArrays
+        self.leader = leader
+        self.helper = helper
+        self.members: List[MemberProfile] = []
+
+        self.leader_major = extract_major(leader.get('학과', ''))
+        self.leader_year = cohort_year(leader.get('학번', ''))
+        self.leader_age = leader.get('나이', 0)
+        self.helper_age = helper.get('나이', 0)
+
+        self.male = 0
+        self.female = 0
+        self.age_sum = 0
+        self.age_sq_sum = 0
+        self.age_buckets: Dict[int, int] = {}
+        self.major_counts: Dict[str, int] = {}
+        self.major_pairs = 0   # 2명 이상인 의·치·한·간 학과 수
+        self.region_counts: Dict[str, int] = {}
+        self.region_pairs = 0  # 2명 이상인 지역 수
+        self.school_counts: Dict[str, int] = {}
+
+        for person in (leader, helper):
+            self._count_major(extract_major(person.get('학과', '')), 1)
+            self._count_region(extract_region(person.get('캠퍼스', person.get('학교/학년', ''))), 1)
+
+    @property
+    def size(self) -> int:
+        return len(self.members)
+
+    def has_school(self, school: str) -> bool:
+        return school in self.school_counts
+
+    def attach(self, index: int, school_bits: np.ndarray):
+        """FeasibilityMatrix의 조 번호와 학교 비트셋 행을 연결"""
+        self.index = index
+        self.school_bits = school_bits
+        school_bits[:] = 0
+        for member in self.members:
+            self._toggle_school_bit(member.school_id)
+
+    def _toggle_school_bit(self, school_id: int):
+        if self.school_bits is not None and school_id >= 0:
+            word, bit = divmod(school_id, 64)
+            self.school_bits[word] ^= np.uint64(1) << np.uint64(bit)
+
+    def _count_major(self, major: str, delta: int):
+        before = self.major_counts.get(major, 0)
+        after = before + delta
+        if after:
+            self.major_counts[major] = after
+        else:
+            del self.major_counts[major]
+        if major in MEDICAL_MAJORS:
+            self.major_pairs += (after >= 2) - (before >= 2)
+
+    def _count_region(self, region: str, delta: int):
+        before = self.region_counts.get(region, 0)
+        after = before + delta
+        if after:
+            self.region_counts[region] = after
+        else:
+            del self.region_counts[region]
+        self.region_pairs += (after >= 2) - (before >= 2)
+
+    def _count(self, member: MemberProfile, delta: int):
+        if member.gender == '남':
+            self.male += delta
+        elif member.gender == '여':
+            self.female += delta
+
+        age = member.age
+        self.age_sum += delta * age
+        self.age_sq_sum += delta * age * age
+        bucket = (age // 5) * 5
+        count = self.age_buckets.get(bucket, 0) + delta
+        if count:
+            self.age_buckets[bucket] = count
+        else:
+            del self.age_buckets[bucket]
+
+        before = self.school_counts.get(member.school, 0)
+        count = before + delta
+        if count:
+            self.school_counts[member.school] = count
+        else:
+            del self.school_counts[member.school]
+        if (before == 0) != (count == 0):
+            self._toggle_school_bit(member.school_id)
+
+        self._count_major(member.major, delta)
+        self._count_region(member.region, delta)
+
+        if self.arrays is not None:
+            self.arrays.store(self, member)
+
+    def add(self, member: MemberProfile):
+        self.members.append(member)
+        self._count(member, 1)
+
+    def remove(self, member: MemberProfile):
+        self.members.remove(member)
+        self._count(member, -1)
+
+    def swap(self, old: MemberProfile, new: MemberProfile):
+        """조원 old를 new로 교체 (명단 순서 유지)"""
+        self.members[self.members.index(old)] = new
+        self._count(old, -1)
+        self._count(new, 1)
+
+    def stats(self) -> Dict:
+        """calculate_group_stats와 같은 형식의 조별 통계 (배정 중 갱신한 카운터 사용, 명단을 다시 분류하지 않음)"""
+        staff_male = sum(1 for person in (self.leader, self.helper) if person.get('성별') == '남')
+        staff_female = sum(1 for person in (self.leader, self.helper) if person.get('성별') == '여')
+        return _group_stats(self.male + staff_male, self.female + staff_female, self.male, self.female,
+                            len(self.members) + 2, dict(self.major_counts), dict(self.region_counts))
+
+    def score_after(self, out: MemberProfile = None, into: MemberProfile = None) -> float:
+        """조원 out을 빼고 into를 넣었을 때의 종합 점수 (상태는 바꾸지 않음, 둘 중 하나는 None 가능)"""
+        count = len(self.members)
+        male = self.male
+        female = self.female
+        age_sum = self.age_sum
+        age_sq_sum = self.age_sq_sum
+        bucket_count = len(self.age_buckets)
+        major_pairs = self.major_pairs
+        region_pairs = self.region_pairs
+        out_bucket = into_bucket = out_major = into_major = out_region = into_region = None
+
+        if out is not None:
+            count -= 1
+            male -= out.gender == '남'
+            female -= out.gender == '여'
+            age_sum -= out.age
+            age_sq_sum -= out.age * out.age
+            out_bucket = (out.age // 5) * 5
+            out_major = out.major
+            out_region = out.region
+        if into is not None:
+            count += 1
+            male += into.gender == '남'
+            female += into.gender == '여'
+            age_sum += into.age
+            age_sq_sum += into.age * into.age
+            into_bucket = (into.age // 5) * 5
+            into_major = into.major
+            into_region = into.region
+
+        # 빠지는 사람과 들어오는 사람이 같은 연령대/학과/지역이면 해당 카운터는 그대로
+        if out_bucket != into_bucket:
+            if out_bucket is not None and self.age_buckets[out_bucket] == 1:
+                bucket_count -= 1
+            if into_bucket is not None and into_bucket not in self.age_buckets:
+                bucket_count += 1
+        if out_major != into_major:
+            if out_major in MEDICAL_MAJORS and self.major_counts[out_major] == 2:
+                major_pairs -= 1
+            if into_major in MEDICAL_MAJORS and self.major_counts.get(into_major, 0) == 1:
+                major_pairs += 1
+        if out_region != into_region:
+            if out_region is not None and self.region_counts[out_region] == 2:
+                region_pairs -= 1
+            if into_region is not None and self.region_counts.get(into_region, 0) == 1:
+                region_pairs += 1
+
+        return _group_score(count, male, female, age_sum, age_sq_sum, bucket_count, major_pairs, region_pairs)
+
+    def score(self) -> float:
+        """조의 현재 종합 점수"""
+        return self.score_after()
+
+class FeasibilityMatrix:
+    """하드 제약 사전 계산 결과 (presolve)
+
+    static[i, g]는 조원 i를 조 g에 배정해도 의대 24/25학번 분리와 나이 조건을
+    지키는지를 나타내며 배정 중에는 변하지 않습니다. 같은 학교 조건은 조원 이동에
+    따라 바뀌므로 조별 학교 id 비트셋(school_bits)으로 관리하고 GroupState가 갱신합니다.
+    """
+    __slots__ = ('static', 'school_bits', 'checks')
+
+    def __init__(self, members: List[MemberProfile], groups: List[GroupState]):
+        # 학교 id는 MemberTable(Classifier)이 부여한 값을 그대로 사용
+        for index, member in enumerate(members):
+            member.index = index
+        school_count = max((member.school_id for member in members), default=-1) + 1
+
+        # 조원 특성 (N,)
+        member_age = np.array([member.age for member in members], dtype=np.int64)
+        member_med = np.array([member.major == "의대" for member in members], dtype=bool)
+        member_year = np.array([member.year for member in members], dtype=object)
+
+        # 조 특성 (G,)
+        leader_med = np.array([group.leader_major == "의대" for group in groups], dtype=bool)
+        leader_year = np.array([group.leader_year for group in groups], dtype=object)
+        leader_37 = np.array([group.leader_age == 37 for group in groups], dtype=bool)
+        helper_age = np.array([group.helper_age for group in groups], dtype=np.int64)
+
+        # 1. 의대 24/25학번 분리 (조장 기준)
+        member_cohort = np.isin(member_year, ["24", "25"])
+        leader_cohort = np.isin(leader_year, ["24", "25"])
+        cohort_conflict = ((member_med & member_cohort)[:, None] &
+                           (leader_med & leader_cohort)[None, :] &
+                           (member_year[:, None] != leader_year[None, :]))
+
+        # 3. 나이 조건 (헬퍼보다 어려야 함, 37세 조장 예외: 39세까지 허용)
+        age_ok = np.where(leader_37[None, :],
+                          member_age[:, None] <= 39,
+                          member_age[:, None] < helper_age[None, :])
+
+        self.static = age_ok & ~cohort_conflict
+
+        self.checks = 0  # candidates/can_assign/can_swap 호출 수 (계측용)
+
+        words = max(1, (school_count + 63) // 64)
+        self.school_bits = np.zeros((len(groups), words), dtype=np.uint64)
+        for index, group in enumerate(groups):
+            group.attach(index, self.school_bits[index])
+
+    def candidates(self, member: MemberProfile) -> np.ndarray:
+        """조원이 하드 제약상 들어갈 수 있는 조 마스크 (G,)"""
+        self.checks += 1
+        word, bit = divmod(member.school_id, 64)
+        taken = (self.school_bits[:, word] >> np.uint64(bit)) & np.uint64(1)
+        return self.static[member.index] & (taken == 0)
+
+    def can_assign(self, group: GroupState, member: MemberProfile) -> bool:
+        """조원을 조에 배정할 수 있는지 사전 계산 결과로 판정 (학번 분리, 나이, 같은 학교, 성비)"""
+        self.checks += 1
+        return (bool(self.static[member.index, group.index]) and
+                not group.has_school(member.school) and
+                _gender_allows(group, member))
+
+    def can_swap(self, group1: GroupState, member1: MemberProfile, group2: GroupState, member2: MemberProfile) -> bool:
+        """group1의 member1과 group2의 member2를 맞교환해도 되는지 (상대를 뺀 뒤의 조 기준)"""
+        self.checks += 1
+        return (bool(self.static[member1.index, group2.index]) and
+                bool(self.static[member2.index, group1.index]) and
+                (member1.school == member2.school or
+                 (not group1.has_school(member2.school) and not group2.has_school(member1.school))) and
+                _gender_allows_counts(group2.male - (member2.gender == '남'),
+                                      group2.female - (member2.gender == '여'), member1) and
+                _gender_allows_counts(group1.male - (member1.gender == '남'),
+                                      group1.female - (member1.gender == '여'), member2))
+
+class GroupArrays:
+    """모든 조의 점수 카운터를 담은 열 배열
+
+    GroupState가 조원 추가/제거 때마다 자기 행을 갱신하므로, 조원 1명을 모든 조에
+    넣어 보는 점수 계산(score_candidates)이나 교환 델타 계산(SwapSearch)을 NumPy 연산
+    몇 번으로 처리할 수 있습니다. 조 번호(index)는 FeasibilityMatrix가 부여한 값을 사용합니다.
+    """
+    __slots__ = ('size', 'male', 'female', 'age_sum', 'age_sq_sum', 'bucket_count',
+                 'major_pairs', 'region_pairs', 'score', 'bucket_ids', 'bucket_members',
+                 'major_ids', 'major_counts', 'region_ids', 'region_counts')
+
+    def __init__(self, members: List[MemberProfile], groups: List[GroupState]):
+        group_count = len(groups)
+        self.size = np.zeros(group_count, dtype=np.int64)
+        self.male = np.zeros(group_count, dtype=np.int64)
+        self.female = np.zeros(group_count, dtype=np.int64)
+        self.age_sum = np.zeros(group_count, dtype=np.int64)
+        self.age_sq_sum = np.zeros(group_count, dtype=np.int64)
+        self.bucket_count = np.zeros(group_count, dtype=np.int64)
+        self.major_pairs = np.zeros(group_count, dtype=np.int64)
+        self.region_pairs = np.zeros(group_count, dtype=np.int64)
+        self.score = np.zeros(group_count, dtype=np.float64)  # GroupState.score (조원이 바뀔 때마다 갱신)
+
+        # 연령대(5세 단위)/학과/지역 -> 열 번호, 예: bucket_members[g, b]는 조 g의 해당 연령대 조원 수
+        self.bucket_ids: Dict[int, int] = {}
+        self.major_ids: Dict[str, int] = {}
+        self.region_ids: Dict[str, int] = {}
+        for member in members:
+            self.bucket_ids.setdefault((member.age // 5) * 5, len(self.bucket_ids))
+            self.major_ids.setdefault(member.major, len(self.major_ids))
+            self.region_ids.setdefault(member.region, len(self.region_ids))
+        for group in groups:
+            for major in group.major_counts:
+                self.major_ids.setdefault(major, len(self.major_ids))
+            for region in group.region_counts:
+                self.region_ids.setdefault(region, len(self.region_ids))
+        self.bucket_members = np.zeros((group_count, max(1, len(self.bucket_ids))), dtype=np.int64)
+        self.major_counts = np.zeros((group_count, len(self.major_ids)), dtype=np.int64)
+        self.region_counts = np.zeros((group_count, len(self.region_ids)), dtype=np.int64)
+
+        for group in groups:
+            group.arrays = self
+            self.store(group)
+            for bucket, count in group.age_buckets.items():
+                self.bucket_members[group.index, self.bucket_ids[bucket]] = count
+            for major, count in group.major_counts.items():
+                self.major_counts[group.index, self.major_ids[major]] = count
+            for region, count in group.region_counts.items():
+                self.region_counts[group.index, self.region_ids[region]] = count
+
+    def store(self, group: GroupState, member: MemberProfile = None):
+        """조 1개의 카운터를 배열에 반영 (member가 주어지면 그 조원의 연령대/학과/지역 칸도 갱신)"""
+        index = group.index
+        self.size[index] = len(group.members)
+        self.male[index] = group.male
+        self.female[index] = group.female
+        self.age_sum[index] = group.age_sum
+        self.age_sq_sum[index] = group.age_sq_sum
+        self.bucket_count[index] = len(group.age_buckets)
+        self.major_pairs[index] = group.major_pairs
+        self.region_pairs[index] = group.region_pairs
+        self.score[index] = group.score()
+        if member is not None:
+            bucket = (member.age // 5) * 5
+            self.bucket_members[index, self.bucket_ids[bucket]] = group.age_buckets.get(bucket, 0)
+            self.major_counts[index, self.major_ids[member.major]] = group.major_counts.get(member.major, 0)
+            self.region_counts[index, self.region_ids[member.region]] = group.region_counts.get(member.region, 0)
+
+    def group_scores(self, groups=slice(None)) -> np.ndarray:
+        """조 groups(기본: 모든 조)의 현재 종합 점수"""
+        return self.score[groups]
+
+def _gender_balance_array(male: np.ndarray, female: np.ndarray) -> np.ndarray:
+    """_gender_balance의 배열 버전"""
+    total = male + female
+    with np.errstate(invalid='ignore', divide='ignore'):
+        male_ratio = male / total
+        female_ratio = female / total
+    balance_score = np.minimum(male_ratio, female_ratio) * 2
+    balance_score = np.where((male_ratio > 0.8) | (female_ratio > 0.8), balance_score * 0.3, balance_score)
+    return np.where(total == 0, 1.0, balance_score)
+
+def _age_spread_array(count: np.ndarray, age_sum: np.ndarray, age_sq_sum: np.ndarray, bucket_count: np.ndarray) -> np.ndarray:
+    """_age_spread의 배열 버전"""
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean_age = age_sum / count
+        variance = np.maximum(age_sq_sum / count - mean_age * mean_age, 0.0)
+        diversity_score = bucket_count / count
+    return np.where(count <= 1, 1.0, (variance * 0.7 + diversity_score * 0.3) / 100)
+
+def _gender_allows_array(male: np.ndarray, female: np.ndarray, is_male) -> np.ndarray:
+    """_gender_allows의 배열 버전 (male/female은 추가 전 조원 수)"""
+    new_male = male + is_male
+    new_female = female + np.logical_not(is_male)
+    total = new_male + new_female
+    return (new_male / total <= 0.8) & (new_female / total <= 0.8)
+
+def _group_scores(count: np.ndarray, male: np.ndarray, female: np.ndarray, age_sum: np.ndarray,
+                  age_sq_sum: np.ndarray, bucket_count: np.ndarray, major_pairs: np.ndarray,
+                  region_pairs: np.ndarray) -> np.ndarray:
+    """_group_score의 배열 버전"""
+    return _weighted_score(_gender_balance_array(male, female),
+                           _age_spread_array(count, age_sum, age_sq_sum, bucket_count),
+                           np.minimum(major_pairs / 5, 1.0),
+                           np.minimum(region_pairs / 5, 1.0))
+
+def score_candidates(member: MemberProfile, arrays: GroupArrays, groups=slice(None)) -> Tuple[np.ndarray, np.ndarray]:
+    """조원 1명을 각 조에 추가했을 때의 배정 후보 점수와 성비 허용 여부를 조 groups(기본: 모든 조)에 대해 한 번에 계산
+
+    성비와 연령은 추가한 뒤의 점수이고, 학과/지역은 조원이 의·치·한·간 학과이거나 지역이 '기타'가 아니면
+    2명 이상인 학과/지역 수에 1을 더해 계산합니다.
+    """
+    is_male = member.gender == '남'
+    age = member.age
+    new_bucket = arrays.bucket_members[groups, arrays.bucket_ids[(age // 5) * 5]] == 0
+    male, female = arrays.male[groups], arrays.female[groups]
+    return (_group_scores(arrays.size[groups] + 1, male + is_male, female + (not is_male),
+                          arrays.age_sum[groups] + age, arrays.age_sq_sum[groups] + age * age,
+                          arrays.bucket_count[groups] + new_bucket,
+                          arrays.major_pairs[groups] + (member.major in MEDICAL_MAJORS),
+                          arrays.region_pairs[groups] + (member.region != '기타')),
+            _gender_allows_array(male, female, is_male))
+
+class SwapSearch:
+    """조원 교환(swap) 지역 탐색
+
+    조원 1명(member1, 조 g1)에 대해 후보 조(candidate_groups, 최대 candidate_limit개)의 조원(member2, 조 g2)과의
+    교환 효과를 델타 평가로 한 번에 계산하므로 한 번의 탐색 비용이 전체 조원 수에 따라 늘지 않습니다.
+    두 조에서 바뀌는 것은 교환되는 두 사람뿐이므로
+    카운터에서 한 명을 빼고 한 명을 더한 값으로 새 점수를 구하며, 명단을 복사하거나
+    실제로 교환해 본 뒤 되돌리지 않습니다. 개선되는 교환만 실제로 적용합니다.
+
+    개선 교환이 없던 조원은 자기 조나 상대 조가 바뀌기 전까지 다시 탐색하지 않습니다
+    (don't-look bit).
+    """
+
+    candidate_sample = 128  # 후보 조를 고르기 전에 뽑는 조 수
+    candidate_limit = 32    # 교환 상대를 찾는 후보 조 수
+
+    def __init__(self, members: List[MemberProfile], groups: List[GroupState],
+                 feasibility: FeasibilityMatrix, arrays: GroupArrays,
+                 rng: Optional[np.random.Generator] = None):
+        self.members = members
+        self.groups = groups
+        self.feasibility = feasibility
+        self.arrays = arrays
+        self.rng = rng if rng is not None else np.random.default_rng(0)
+
+        self.is_male = np.array([member.gender == '남' for member in members], dtype=np.int64)
+        self.is_female = np.array([member.gender == '여' for member in members], dtype=np.int64)
+        self.age = np.array([member.age for member in members], dtype=np.int64)
+        self.bucket = np.array([arrays.bucket_ids[(member.age // 5) * 5] for member in members], dtype=np.int64)
+        self.major = np.array([arrays.major_ids[member.major] for member in members], dtype=np.int64)
+        self.medical = np.array([member.major in MEDICAL_MAJORS for member in members], dtype=bool)
+        self.region = np.array([arrays.region_ids[member.region] for member in members], dtype=np.int64)
+        self.school = np.array([member.school_id for member in members], dtype=np.int64)
+
+        # 조원별 소속 조 번호 (-1: 미배정), 조별 조원 인덱스 (slots[g, :조원 수], 나머지는 -1)와 조원의 칸 위치
+        self.owner = np.full(len(members), -1, dtype=np.int64)
+        self.slots = np.full((len(groups), max((group.size for group in groups), default=0) + 1), -1, dtype=np.int64)
+        self.slot = np.full(len(members), -1, dtype=np.int64)
+        for group in groups:
+            for position, member in enumerate(group.members):
+                self.owner[member.index] = group.index
+                self.slots[group.index, position] = member.index
+                self.slot[member.index] = position
+        self.settled = np.zeros(len(members), dtype=bool)
+
+        # 계측용 카운터 (PhaseProfile 참고): best_swap 호출 수, 판정한 교환 후보 쌍/이동 후보 수,
+        # 실제로 적용한 이동/교환 수 (_relocate로 되돌린 이동은 세지 않음)
+        self.evaluations = 0
+        self.pairs = 0
+        self.move_attempts = 0
+        self.moves = 0
+        self.swaps = 0
+
+    def _unsettle(self, *groups: GroupState):
+        for group in groups:
+            for member in group.members:
+                self.settled[member.index] = False
+
+    def move(self, member: MemberProfile, source: GroupState, target: GroupState):
+        """조원을 다른 조로 이동"""
+        self.moves += 1
+        self._relocate(member, source, target)
+
+    def _relocate(self, member: MemberProfile, source: GroupState, target: GroupState):
+        """move와 같지만 moves에 세지 않음 (되돌리기, 가장 좋았던 배정 복원 같은 내부 처리용)"""
+        source.remove(member)
+        target.add(member)
+        self.owner[member.index] = target.index
+        # source에서는 마지막 칸의 조원을 빈 칸으로 옮기고, target에는 끝에 추가
+        index, slots = member.index, self.slots
+        last = slots[source.index, source.size]
+        slots[source.index, self.slot[index]] = last
+        self.slot[last] = self.slot[index]
+        slots[source.index, source.size] = -1
+        if target.size > slots.shape[1]:
+            self.slots = slots = np.pad(slots, ((0, 0), (0, slots.shape[1])), constant_values=-1)
+        slots[target.index, target.size - 1] = index
+        self.slot[index] = target.size - 1
+        self._unsettle(source, target)
+
+    def swap(self, member1: MemberProfile, group1: GroupState, member2: MemberProfile, group2: GroupState):
+        """두 조의 조원을 맞교환"""
+        self.swaps += 1
+        group1.swap(member1, member2)
+        group2.swap(member2, member1)
+        self.owner[member1.index] = group2.index
+        self.owner[member2.index] = group1.index
+        slot1, slot2 = self.slot[member1.index], self.slot[member2.index]
+        self.slots[group1.index, slot1] = member2.index
+        self.slots[group2.index, slot2] = member1.index
+        self.slot[member1.index], self.slot[member2.index] = slot2, slot1
+        self._unsettle(group1, group2)
+
+    def _scores_after(self, groups, out, into) -> np.ndarray:
+        """조 groups[k]에서 조원 out[k]를 빼고 into[k]를 넣었을 때의 종합 점수
+
+        각 인자는 배열 또는 (모든 k에 공통인) 스칼라 인덱스일 수 있습니다.
+        """
+        arrays = self.arrays
+        changed = self.bucket[out] != self.bucket[into]
+        bucket_count = (arrays.bucket_count[groups]
+                        - (changed & (arrays.bucket_members[groups, self.bucket[out]] == 1))
+                        + (changed & (arrays.bucket_members[groups, self.bucket[into]] == 0)))
+
+        changed = self.major[out] != self.major[into]
+        major_pairs = (arrays.major_pairs[groups]
+                       - (changed & self.medical[out] & (arrays.major_counts[groups, self.major[out]] == 2))
+                       + (changed & self.medical[into] & (arrays.major_counts[groups, self.major[into]] == 1)))
+
+        changed = self.region[out] != self.region[into]
+        region_pairs = (arrays.region_pairs[groups]
+                        - (changed & (arrays.region_counts[groups, self.region[out]] == 2))
+                        + (changed & (arrays.region_counts[groups, self.region[into]] == 1)))
+
+        age_in = self.age[into]
+        age_out = self.age[out]
+        return _group_scores(arrays.size[groups],
+                             arrays.male[groups] - self.is_male[out] + self.is_male[into],
+                             arrays.female[groups] - self.is_female[out] + self.is_female[into],
+                             arrays.age_sum[groups] - age_out + age_in,
+                             arrays.age_sq_sum[groups] - age_out * age_out + age_in * age_in,
+                             bucket_count, major_pairs, region_pairs)
+
+    def _accepts(self, groups, out, into) -> np.ndarray:
+        """조 groups[k]에서 out[k]를 뺀 뒤 into[k]를 넣어도 학교 중복/성비 제한에 걸리지 않는지
+
+        나이/학번 조건(정적)은 best_swap에서 미리 걸러냅니다.
+        """
+        school_out = self.school[out]
+        school_in = self.school[into]
+        word = school_in // 64
+        bit = (school_in % 64).astype(np.uint64)
+        taken = ((self.feasibility.school_bits[groups, word] >> bit) & np.uint64(1)) == 1
+        return ((~taken | (school_in == school_out)) &
+                _gender_allows_array(self.arrays.male[groups] - self.is_male[out],
+                                     self.arrays.female[groups] - self.is_female[out],
+                                     self.is_male[into]))
+
+    def donor(self, group: GroupState, min_members: int, after: int = -1) -> Optional[MemberProfile]:
+        """group으로 옮길 수 있는 다른 조의 조원 (없으면 None)
+
+        조원이 min_members명보다 많고 조 번호(index)가 after보다 큰 조 중 앞 조부터, 그 조 안에서는
+        앞 조원부터 고릅니다.
+        학번/나이(정적), 같은 학교, 성비 조건을 모든 조원에 대해 배열로 한 번에 판정합니다.
+        """
+        self.feasibility.checks += 1
+        owner = self.owner
+        self.move_attempts += int(np.count_nonzero((owner > after) & (owner != group.index)))
+        word = self.school // 64
+        bit = (self.school % 64).astype(np.uint64)
+        taken = ((group.school_bits[word] >> bit) & np.uint64(1)) == 1
+        movable = ((owner > after) & (owner != group.index) & self.feasibility.static[:, group.index] &
+                   ~((self.school >= 0) & taken) &
+                   _gender_allows_array(group.male, group.female, self.is_male.astype(bool)))
+        movable[movable] = self.arrays.size[owner[movable]] > min_members
+        if not movable.any():
+            return None
+        source = self.groups[int(owner[movable].min())]
+        return next(member for member in source.members if movable[member.index])
+
+    def candidate_groups(self, member: MemberProfile) -> np.ndarray:
+        """member와 교환할 상대를 찾을 조 번호 (최대 candidate_limit개)
+
+        나이/학번 조건(FeasibilityMatrix.static 행)상 member가 들어갈 수 있는 다른 조에서 임의로 candidate_sample개를
+        뽑고, 그중 member를 넣었을 때 점수가 가장 많이 오르는 조를 고릅니다. 조가 많아도 점수 계산은 뽑은 조에만 합니다.
+        """
+        group = self.owner[member.index]
+        feasible = self.feasibility.static[member.index].copy()
+        feasible[group] = False
+        groups = np.flatnonzero(feasible)
+        if groups.size > self.candidate_sample:
+            groups = self.rng.choice(groups, self.candidate_sample, replace=False)
+        if groups.size <= self.candidate_limit:
+            return groups
+        scores, _ = score_candidates(member, self.arrays, groups)
+        gain = scores - self.arrays.group_scores(groups)
+        return groups[np.argpartition(-gain, self.candidate_limit - 1)[:self.candidate_limit]]
+
+    def best_swap(self, member: MemberProfile, allowed: Optional[np.ndarray] = None,
+                  free: Optional[np.ndarray] = None) -> Tuple[float, int]:
+        """member와 교환했을 때 전체 점수가 가장 많이 오르는 상대 조원 (증가량, 인덱스)
+
+        상대는 allowed(조 번호 배열, 기본: candidate_groups)에 속한 조원 중에서 고르며,
+        free(조원별 bool 배열)를 주면 그중 True인 조원만 고릅니다.
+        """
+        self.evaluations += 1
+        index = member.index
+        group = self.owner[index]
+        if allowed is None:
+            allowed = self.candidate_groups(member)
+        partners = self.slots[allowed].ravel()
+        partners = partners[partners >= 0]
+        if free is not None:
+            partners = partners[free[partners]]
+        self.pairs += partners.size
+        # 나이/학번 조건(정적)으로 먼저 후보를 줄임
+        static = self.feasibility.static
+        partner_groups = self.owner[partners]
+        keep = (partner_groups != group) & static[partners, group] & static[index, partner_groups]
+        partners = partners[keep]
+        partner_groups = partner_groups[keep]
+        count = partners.size
+        if count == 0:
+            return 0.0, -1
+
+        # 앞 count개는 member의 조(member를 빼고 상대를 넣음), 뒤 count개는 상대의 조를 한 번에 계산
+        groups = np.concatenate([np.full(count, group), partner_groups])
+        out = np.concatenate([np.full(count, index), partners])
+        into = np.concatenate([partners, np.full(count, index)])
+        accepts = self._accepts(groups, out, into)
+        feasible = accepts[:count] & accepts[count:]
+        if not feasible.any():
+            return 0.0, -1
+        change = self._scores_after(groups, out, into) - self.arrays.group_scores(groups)
+        delta = np.where(feasible, change[:count] + change[count:], -np.inf)
+        best = int(np.argmax(delta))
+        return float(delta[best]), int(partners[best])
+
+    def improve(self) -> int:
+        """모든 조원에 대해 가장 좋은 개선 교환을 한 번씩 적용하고 적용 횟수를 반환"""
+        accepted = 0
+        for member in self.members:
+            if self.owner[member.index] < 0 or self.settled[member.index]:
+                continue
+            gain, partner = self.best_swap(member)
+            if partner >= 0 and gain > 1e-12:
+                self.swap(member, self.groups[self.owner[member.index]],
+                          self.members[partner], self.groups[self.owner[partner]])
+                accepted += 1
+            else:
+                self.settled[member.index] = True
+        return accepted
+
+ENGINES = {
+    'greedy': '탐욕 배정 + 교환 개선 (기본)',
+    'annealing': '시뮬레이티드 어닐링',
+    'tabu': '타부 탐색',
+    'exact': '정확 해법 (OR-Tools CP-SAT)',
+}
+
+def total_objective(groups) -> float:
+    """전체 목적함수: 조별 종합 점수(성비 40%, 연령 25%, 학과 20%, 지역 15%)의 합"""
+    return sum(group.score() for group in groups)
+
+PHASES = {
+    'greedy': '탐욕 배정',
+    'balance': '인원 균형 조정',
+    'improve': '교환 개선',
+    'annealing': '시뮬레이티드 어닐링',
+    'tabu': '타부 탐색',
+    'exact': '정확 해법 (CP-SAT)',
+    'output': '결과 정리',
+    'done': '완료',
+}
+
+# 조기 종료를 반영하는 단계 (시간 제한 동안 계속 개선하는 단계)
+ANYTIME_PHASES = ('annealing', 'tabu', 'exact')
+
+PROGRESS_INTERVAL = 0.25  # 진행 상황 콜백 최소 간격 (초)
+
+ProgressCallback = Callable[[Dict], Optional[bool]]
+
+class Progress:
+    """assign_groups 진행 상황 보고
+
+    callback은 다음 키를 가진 dict를 받습니다.
+    - phase, phase_name: 현재 단계 (PHASES)
+    - placed, total: 배정된 조원 수 / 전체 조원 수
+    - current, best: 현재 / 지금까지 가장 좋은 목적함수 (exact 단계는 CP-SAT 대리 목적함수)
+    - elapsed: 시작 후 경과 시간 (초), fraction: 현재 단계 진행률 (0~1)
+    callback이 True를 반환하면 조기 종료를 요청한 것으로 보고, ANYTIME_PHASES 단계는 그때까지
+    찾은 가장 좋은 배정으로 끝냅니다. 단계가 바뀔 때를 빼면 interval초에 한 번만 호출합니다.
+    """
+
+    def __init__(self, callback: Optional[ProgressCallback], total: int, interval: float = PROGRESS_INTERVAL):
+        self.callback = callback
+        self.total = total
+        self.interval = interval
+        self.start = time.perf_counter()
+        self.phase = None
+        self.phase_start = self.start
+        self.duration = None
+        self.best = -math.inf
+        self.last_report = -math.inf
+        self.stop_requested = False
+
+    def enter(self, phase: str, duration: Optional[float] = None):
+        """새 단계 시작 (duration: 시간 제한이 있는 단계의 제한 시간)"""
+        self.phase = phase
+        self.phase_start = time.perf_counter()
+        self.duration = duration
+        self.best = -math.inf  # 단계마다 목적함수 척도가 다를 수 있음 (exact는 대리 목적함수)
+
+    def due(self) -> bool:
+        """보고할 때가 되었는지 (콜백이 없으면 항상 False)"""
+        return self.callback is not None and time.perf_counter() - self.last_report >= self.interval
+
+    def report(self, placed: int, current: float, best: Optional[float] = None,
+               fraction: Optional[float] = None) -> bool:
+        """진행 상황을 콜백에 전달하고 조기 종료가 요청되었는지 반환 (best를 생략하면 단계 내 최고값)"""
+        now = time.perf_counter()
+        self.best = max(self.best, current) if best is None else best
+        if self.callback is None:
             return False
-    
-    # === 2단계: 최적화 조건 체크 (유연한 제한) ===
-    
-    # 4. 성비 균형 체크 (조원만 대상으로 계산)
-    # 조장/헬퍼는 고정이므로 조원만으로 성비 계산
-    member_male_count = sum(1 for m in group['members'] if m['성별'] == '남')
-    member_female_count = sum(1 for m in group['members'] if m['성별'] == '여')
-    
-    # 새 멤버 추가 시 성비 계산
-    if member['성별'] == '남':
-        new_male = member_male_count + 1
-        new_female = member_female_count
+        if fraction is None:
+            if self.duration:
+                fraction = (now - self.phase_start) / self.duration
+            else:
+                fraction = placed / self.total if self.total else 1.0
+        self.last_report = now
+        event = {
+            'phase': self.phase,
+            'phase_name': PHASES.get(self.phase, self.phase),
+            'placed': placed,
+            'total': self.total,
+            'current': current,
+            'best': self.best,
+            'elapsed': now - self.start,
+            'fraction': min(1.0, max(0.0, fraction)),
+        }
+        if self.callback(event):
+            self.stop_requested = True
+        return self.stop_requested and self.phase in ANYTIME_PHASES
+
+class PhaseProfile:
+    """assign_groups 단계별 계측 (벽시계 시간, 호출/이동 횟수, 단계 전후 목적함수)
+
+    watch(obj, 이름=속성명)으로 등록한 객체의 정수 카운터와 add()로 직접 센 값을 단계가
+    바뀔 때마다 스냅숏으로 찍어 단계별 증가량을 기록합니다. 같은 이름으로 여러 객체를
+    등록하면 합산합니다. 카운터는 각 객체가 정수 속성으로 세므로 계측 비용은 거의 없습니다.
+
+    - feasibility_checks: 하드 조건 판정 호출 수 (배열로 한 번에 판정해도 1회)
+    - scoring_calls: 점수 계산 호출 수 (배열로 한 번에 계산해도 1회)
+    - move_attempts / swap_attempts: 판정한 (조원, 조) 이동 후보 / 조원 쌍 교환 후보 수
+    - moves / swaps: 배정에 실제로 적용한 이동/교환 수 (되돌리기와 최고 배정 복원은 제외)
+    """
+    COUNTERS = ('feasibility_checks', 'scoring_calls', 'move_attempts', 'moves', 'swap_attempts', 'swaps')
+
+    def __init__(self, groups: List[GroupState]):
+        self.groups = groups
+        self.start = time.perf_counter()
+        self.sources: List[Tuple[object, Dict[str, str]]] = []
+        self.extra = Counter()
+        self.phases: List[Dict] = []
+        self._phase = None
+
+    def watch(self, obj, **counters: str):
+        """obj의 정수 속성을 카운터로 등록 (예: watch(search, moves='moves'))"""
+        self.sources.append((obj, counters))
+
+    def add(self, counter: str, count: int = 1):
+        self.extra[counter] += count
+
+    def snapshot(self) -> Dict[str, int]:
+        totals = {counter: self.extra[counter] for counter in self.COUNTERS}
+        for obj, counters in self.sources:
+            for counter, attribute in counters.items():
+                totals[counter] += getattr(obj, attribute)
+        return totals
+
+    def enter(self, phase: Optional[str]):
+        """이전 단계를 마감하고 새 단계 시작 (None이면 마감만)"""
+        now = time.perf_counter()
+        objective = total_objective(self.groups)
+        counters = self.snapshot()
+        if self._phase is not None:
+            name, started, objective_before, counters_before = self._phase
+            self.phases.append({
+                'phase': name,
+                'seconds': now - started,
+                'objective_before': objective_before,
+                'objective_after': objective,
+                'counters': {counter: counters[counter] - counters_before[counter] for counter in self.COUNTERS},
+            })
+        self._phase = None if phase is None else (phase, now, objective, counters)
+
+    def as_dict(self) -> Dict:
+        """결과 attrs['profile']에 기록하는 구조 {'total_seconds', 'phases', 'counters'}"""
+        return {
+            'total_seconds': time.perf_counter() - self.start,
+            'phases': self.phases,
+            'counters': self.snapshot(),
+        }
+
+def profile_table(profile: Dict) -> pd.DataFrame:
+    """attrs['profile']을 단계별 표로 변환"""
+    rows = []
+    for phase in profile['phases']:
+        row = {
+            '단계': PHASES.get(phase['phase'], phase['phase']),
+            '시간(초)': round(phase['seconds'], 4),
+            '목적함수(전)': round(phase['objective_before'], 4),
+            '목적함수(후)': round(phase['objective_after'], 4),
+        }
+        row.update(phase['counters'])
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+class NeighbourhoodSearch:
+    """이동(move)/교환(swap) 이웃을 사용하는 메타휴리스틱 (시뮬레이티드 어닐링, 타부 탐색)
+
+    SwapSearch가 관리하는 배정 위에서 동작하며, 이웃의 점수 변화는 두 조에 대해
+    GroupState.score_after로 O(1)에 계산합니다. 이동은 조 인원이 [min_members, max_members]를
+    벗어나지 않을 때만 허용합니다. 시간 제한 동안 찾은 가장 좋은 배정을 끝날 때 복원합니다.
+    """
+
+    def __init__(self, search: SwapSearch, min_members: int, max_members: int, rng: random.Random,
+                 progress: Optional[Progress] = None):
+        self.search = search
+        self.min_members = min_members
+        self.max_members = max_members
+        self.rng = rng
+        self.progress = progress
+        self.assigned = [member for member in search.members if search.owner[member.index] >= 0]
+        self.current = total_objective(search.groups)
+        self.best = self.current
+        self.best_owner = search.owner.copy()
+        self.iterations = 0
+        self.accepted = 0
+        self.move_attempts = 0  # 제안한 이동/교환 이웃 수 (조건에 걸린 것 포함)
+        self.swap_attempts = 0
+        self.evaluated = 0  # 점수 변화를 계산한 이웃 수
+
+    def _random_neighbour(self):
+        """임의의 실행 가능한 이웃 하나 (점수 변화, member1, group1, member2, group2), 없으면 None
+
+        member2가 None이면 member1을 group2로 이동, 아니면 두 조원을 맞교환합니다.
+        """
+        search = self.search
+        rng = self.rng
+        member1 = rng.choice(self.assigned)
+        group1 = search.groups[search.owner[member1.index]]
+
+        if rng.random() < 0.5:
+            self.move_attempts += 1
+            group2 = rng.choice(search.groups)
+            if (group2 is group1 or group1.size <= self.min_members or group2.size >= self.max_members or
+                    not search.feasibility.can_assign(group2, member1)):
+                return None
+            self.evaluated += 1
+            delta = (group1.score_after(out=member1) - group1.score() +
+                     group2.score_after(into=member1) - group2.score())
+            return delta, member1, group1, None, group2
+
+        self.swap_attempts += 1
+        member2 = rng.choice(self.assigned)
+        group2 = search.groups[search.owner[member2.index]]
+        if group2 is group1 or not search.feasibility.can_swap(group1, member1, group2, member2):
+            return None
+        self.evaluated += 1
+        delta = (group1.score_after(member1, member2) - group1.score() +
+                 group2.score_after(member2, member1) - group2.score())
+        return delta, member1, group1, member2, group2
+
+    def _apply(self, neighbour):
+        delta, member1, group1, member2, group2 = neighbour
+        if member2 is None:
+            self.search.move(member1, group1, group2)
+        else:
+            self.search.swap(member1, group1, member2, group2)
+        self.current += delta
+        self.accepted += 1
+        if self.current > self.best + 1e-12:
+            self.best = self.current
+            self.best_owner = self.search.owner.copy()
+
+    def _stop(self, fraction: float) -> bool:
+        """진행 상황을 보고하고 조기 종료가 요청되었는지 반환"""
+        progress = self.progress
+        if progress is None or not progress.due():
+            return progress is not None and progress.stop_requested
+        return progress.report(len(self.assigned), self.current, self.best, fraction)
+
+    def restore_best(self):
+        """가장 좋았던 배정으로 되돌림"""
+        search = self.search
+        for member in self.assigned:
+            current = search.owner[member.index]
+            best = self.best_owner[member.index]
+            if current != best:
+                search._relocate(member, search.groups[current], search.groups[best])
+        self.current = total_objective(search.groups)
+
+    def anneal(self, time_limit: float, start_temperature: float = 0.05, end_temperature: float = 0.0005):
+        """시뮬레이티드 어닐링 (시간에 따라 온도를 지수적으로 낮춤)"""
+        if not self.assigned:
+            return
+        start = time.perf_counter()
+        temperature = start_temperature
+        while True:
+            if self.iterations % 100 == 0:
+                progress = (time.perf_counter() - start) / time_limit if time_limit > 0 else 1.0
+                if progress >= 1.0 or self._stop(progress):
+                    break
+                temperature = start_temperature * (end_temperature / start_temperature) ** progress
+            self.iterations += 1
+
+            neighbour = self._random_neighbour()
+            if neighbour is None:
+                continue
+            delta = neighbour[0]
+            if delta >= 0 or self.rng.random() < math.exp(delta / temperature):
+                self._apply(neighbour)
+        self.restore_best()
+
+    def tabu(self, time_limit: float, sample_size: int = 8, tenure: int = None, patience: int = None):
+        """타부 탐색 (후보 이웃 중 가장 좋은 이웃으로 이동, 최근 움직인 조원은 tenure 동안 금지)
+
+        반복마다 임의로 고른 sample_size명에 대해 금지되지 않은 상대와의 가장 좋은 교환(SwapSearch.best_swap)과
+        임의의 이동/교환 이웃 하나씩을 후보로 만듭니다. 시작 배정은 이미 교환 개선의 국소 최적이므로
+        임의 표본만으로는 개선 이웃을 거의 찾지 못합니다. patience번 반복하는 동안 최고 기록이 갱신되지 않으면
+        가장 좋았던 배정으로 돌아가 금지 목록을 비우고 다시 탐색합니다.
+        """
+        if not self.assigned:
+            return
+        search = self.search
+        if tenure is None:
+            tenure = max(5, min(50, len(self.assigned) // 10))
+        if patience is None:
+            patience = 10 * tenure
+        tabu_until = np.zeros(len(search.members), dtype=np.int64)
+        last_improved = 0
+        start = time.perf_counter()
+        while True:
+            elapsed = time.perf_counter() - start
+            if elapsed >= time_limit or self._stop(elapsed / time_limit):
+                break
+            self.iterations += 1
+            if self.iterations - last_improved > patience:
+                self.restore_best()
+                tabu_until[:] = 0
+                last_improved = self.iterations
+            free = tabu_until <= self.iterations
+            best_neighbour = None
+            for _ in range(sample_size):
+                candidates = [self._random_neighbour()]
+                member1 = self.rng.choice(self.assigned)
+                if free[member1.index]:
+                    delta, partner = search.best_swap(member1, free=free)
+                    if partner >= 0:
+                        member2 = search.members[partner]
+                        candidates.append((delta, member1, search.groups[search.owner[member1.index]],
+                                           member2, search.groups[search.owner[partner]]))
+                for neighbour in candidates:
+                    if neighbour is None:
+                        continue
+                    delta, member1, _, member2, _ = neighbour
+                    is_tabu = not free[member1.index] or (member2 is not None and not free[member2.index])
+                    # 최고 기록을 갱신하는 이웃은 금지 목록에 있어도 허용 (aspiration)
+                    if is_tabu and self.current + delta <= self.best + 1e-12:
+                        continue
+                    if best_neighbour is None or delta > best_neighbour[0]:
+                        best_neighbour = neighbour
+            if best_neighbour is None:
+                continue
+            best_before = self.best
+            self._apply(best_neighbour)
+            if self.best > best_before:
+                last_improved = self.iterations
+            tabu_until[best_neighbour[1].index] = self.iterations + tenure
+            if best_neighbour[3] is not None:
+                tabu_until[best_neighbour[3].index] = self.iterations + tenure
+        self.restore_best()
+
+class ExactSolver:
+    """OR-Tools CP-SAT 기반 정확 해법
+
+    의대 24/25학번 분리와 나이 조건(FeasibilityMatrix.static)은 갈 수 있는 조로 표현하고, 최소/최대 조원 수,
+    같은 학교 금지, 조건상 갈 수 없는 현재 조에 남는 것은 다른 조건보다 훨씬 큰 벌점(위반 1건당 SCALE)으로
+    표현합니다. 그래서 현재 배정이 하드 조건을 어겨도 모델은 항상 풀 수 있고, 위반을 줄이는 방향으로 탐색합니다.
+    네 가지 최적화 조건은 비선형이므로 선형화한 대리 목적함수로 표현합니다.
+    - 성비: 조원 남녀 수 차이 |남 - 여|에 대한 벌점
+    - 연령: 조마다 등장하는 연령대(5세 단위) 수
+    - 학과: 2명 이상인 의·치·한·간 학과 수
+    - 지역: 2명 이상인 지역 수 (5개 상한)
+    현재 배정(탐욕 + 교환 개선 결과)을 힌트(warm start)로 주고, 시간 제한 안에서 찾은 해가
+    하드 조건 위반 수를 늘리지 않으면서 실제 목적함수(total_objective)를 개선할 때만 적용합니다.
+    조건상 갈 수 있는 조가 하나도 없는 조원은 현재 조에 고정합니다.
+    """
+    SCALE = 100000
+
+    def __init__(self, search: SwapSearch, min_members: int, max_members: int,
+                 progress: Optional[Progress] = None):
+        if cp_model is None:
+            raise ImportError("exact 엔진을 사용하려면 ortools 패키지가 필요합니다 (pip install ortools)")
+        self.search = search
+        self.min_members = min_members
+        self.max_members = max_members
+        self.progress = progress
+
+    def solve(self, time_limit: float, seed: int = 0) -> Dict:
+        """모델을 풀고 결과 요약(status, objective, bound, gap, applied, ...)을 반환"""
+        search = self.search
+        groups = search.groups
+        owner = search.owner
+        members = [member for member in search.members if owner[member.index] >= 0]
+        if not members:
+            return {'status': 'EMPTY', 'applied': False}
+
+        model = cp_model.CpModel()
+        group_vars: List[List[Tuple[MemberProfile, object]]] = [[] for _ in groups]
+        choice: Dict[int, List[Tuple[int, object]]] = {}
+        objective = []
+        pinned = 0
+        for member in members:
+            current = owner[member.index]
+            allowed = [int(group_index) for group_index in np.flatnonzero(search.feasibility.static[member.index])]
+            if not allowed:
+                pinned += 1
+            # 현재 조는 조건상 갈 수 없어도 선택지에 두고 벌점을 줌 (현재 배정이 항상 해가 되도록)
+            options = []
+            for group_index in sorted(set(allowed) | {current}):
+                var = model.NewBoolVar(f"x_{member.index}_{group_index}")
+                model.AddHint(var, current == group_index)
+                options.append((group_index, var))
+                group_vars[group_index].append((member, var))
+                if group_index not in allowed:
+                    objective.append(-self.SCALE * var)
+            model.AddExactlyOne(var for _, var in options)
+            choice[member.index] = options
+
+        average_size = max(1.0, len(members) / len(groups))
+        gender_weight = round(0.4 / average_size * self.SCALE)
+        bucket_weight = max(1, round(0.25 * 0.3 / 100 / average_size * self.SCALE))
+        major_weight = round(0.2 / 5 * self.SCALE)
+        region_weight = round(0.15 / 5 * self.SCALE)
+
+        for group, entries in zip(groups, group_vars):
+            # 조원 수: 최소 미달과 최대 초과 모두 큰 벌점 (어긴 힌트에서도 출발할 수 있도록)
+            size = sum(var for _, var in entries)
+            shortfall = model.NewIntVar(0, self.min_members, f"shortfall_{group.index}")
+            model.Add(shortfall >= self.min_members - size)
+            model.AddHint(shortfall, max(0, self.min_members - group.size))
+            overflow = model.NewIntVar(0, max(0, len(entries) - self.max_members), f"overflow_{group.index}")
+            model.Add(overflow >= size - self.max_members)
+            model.AddHint(overflow, max(0, group.size - self.max_members))
+            objective.append(-self.SCALE * (shortfall + overflow))
+
+            # 같은 학교 금지: 학교별로 두 번째 사람부터 큰 벌점
+            by_school: Dict[str, list] = defaultdict(list)
+            for member, var in entries:
+                by_school[member.school].append(var)
+            current_schools = Counter(member.school for member in group.members)
+            for school, school_vars in by_school.items():
+                if len(school_vars) > 1:
+                    duplicates = model.NewIntVar(0, len(school_vars) - 1, '')
+                    model.Add(duplicates >= sum(school_vars) - 1)
+                    model.AddHint(duplicates, max(0, current_schools[school] - 1))
+                    objective.append(-self.SCALE * duplicates)
+
+            # 성비: |남 - 여| 최소화
+            male = sum(var for member, var in entries if member.gender == '남')
+            female = sum(var for member, var in entries if member.gender == '여')
+            gap = model.NewIntVar(0, self.max_members, f"gender_gap_{group.index}")
+            model.Add(gap >= male - female)
+            model.Add(gap >= female - male)
+            model.AddHint(gap, abs(group.male - group.female))
+            objective.append(-gender_weight * gap)
+
+            # 연령대 다양성
+            by_bucket: Dict[int, list] = defaultdict(list)
+            for member, var in entries:
+                by_bucket[(member.age // 5) * 5].append(var)
+            current_buckets = {(member.age // 5) * 5 for member in group.members}
+            for bucket, bucket_vars in by_bucket.items():
+                present = model.NewBoolVar('')
+                model.Add(present <= sum(bucket_vars))
+                model.AddHint(present, bucket in current_buckets)
+                objective.append(bucket_weight * present)
+
+            # 학과 분포 / 지역 다양성 (조장/헬퍼 포함, 2명 이상인 학과·지역 수)
+            base_majors = dict(group.major_counts)
+            base_regions = dict(group.region_counts)
+            for member in group.members:
+                base_majors[member.major] -= 1
+                base_regions[member.region] -= 1
+            for major in MEDICAL_MAJORS:
+                major_vars = [var for member, var in entries if member.major == major]
+                if base_majors.get(major, 0) + len(major_vars) >= 2:
+                    pair = model.NewBoolVar('')
+                    model.Add(2 * pair <= base_majors.get(major, 0) + sum(major_vars))
+                    model.AddHint(pair, group.major_counts.get(major, 0) >= 2)
+                    objective.append(major_weight * pair)
+            region_pairs = []
+            for region in set(base_regions) | {member.region for member, _ in entries}:
+                region_vars = [var for member, var in entries if member.region == region]
+                if base_regions.get(region, 0) + len(region_vars) >= 2:
+                    pair = model.NewBoolVar('')
+                    model.Add(2 * pair <= base_regions.get(region, 0) + sum(region_vars))
+                    model.AddHint(pair, group.region_counts.get(region, 0) >= 2)
+                    region_pairs.append(pair)
+            if region_pairs:
+                capped = model.NewIntVar(0, 5, '')
+                model.Add(capped <= sum(region_pairs))
+                model.AddHint(capped, min(5, sum(1 for count in group.region_counts.values() if count >= 2)))
+                objective.append(region_weight * capped)
+
+        model.Maximize(sum(objective))
+
+        solver = cp_model.CpSolver()
+        solver.parameters.max_time_in_seconds = float(time_limit)
+        solver.parameters.random_seed = seed % (2 ** 31)
+        if self.progress is not None and self.progress.callback is not None:
+            status = solver.Solve(model, _SolutionProgress(self.progress, len(members), time_limit, self.SCALE))
+        else:
+            status = solver.Solve(model)
+        report = {
+            'status': solver.StatusName(status),
+            'fixed_members': pinned,
+            'applied': False,
+        }
+        if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+            logger.warning("CP-SAT이 %s 상태로 끝나 기존 배정을 유지합니다 (조원 %d명, 조 %d개, 시간 제한 %.1f초)",
+                           report['status'], len(members), len(groups), time_limit)
+            return report
+
+        value = solver.ObjectiveValue() / self.SCALE
+        bound = solver.BestObjectiveBound() / self.SCALE
+        report['objective'] = value
+        report['bound'] = bound
+        report['gap'] = abs(bound - value) / max(abs(bound), abs(value), 1e-9)
+
+        # 하드 조건 위반이 줄거나, 같으면서 실제 목적함수가 좋아질 때만 적용
+        before = owner.copy()
+        violations_before = self._violations()
+        report['objective_before'] = total_objective(groups)
+        moved = 0
+        for member in members:
+            target = next(group_index for group_index, var in choice[member.index] if solver.Value(var))
+            current = owner[member.index]
+            if current != target:
+                search._relocate(member, groups[current], groups[target])
+                moved += 1
+        report['objective_after'] = total_objective(groups)
+        violations_after = self._violations()
+        report['violations_before'] = violations_before
+        report['violations_after'] = violations_after
+        if (violations_after, -report['objective_after']) > (violations_before, -report['objective_before']):
+            for member in members:
+                current = owner[member.index]
+                if current != before[member.index]:
+                    search._relocate(member, groups[current], groups[before[member.index]])
+        else:
+            # 적용한 해의 이동만 moves에 셈 (되돌린 해는 배정을 바꾸지 않음)
+            search.moves += moved
+            report['applied'] = True
+        return report
+
+    def _violations(self) -> int:
+        """모델의 벌점과 같은 기준의 하드 조건 위반 수 (인원 미달/초과, 같은 학교 중복, 갈 수 없는 조에 배정)"""
+        static = self.search.feasibility.static
+        total = 0
+        for group in self.search.groups:
+            total += max(0, self.min_members - group.size) + max(0, group.size - self.max_members)
+            total += sum(count - 1 for count in Counter(member.school for member in group.members).values())
+            total += sum(1 for member in group.members if not static[member.index, group.index])
+        return total
+
+if cp_model is not None:
+    class _SolutionProgress(cp_model.CpSolverSolutionCallback):
+        """CP-SAT이 더 좋은 해를 찾을 때마다 진행 상황을 보고하고, 조기 종료 요청이 있으면 탐색 중단"""
+
+        def __init__(self, progress: Progress, placed: int, time_limit: float, scale: int):
+            super().__init__()
+            self.progress = progress
+            self.placed = placed
+            self.time_limit = time_limit
+            self.scale = scale
+
+        def on_solution_callback(self):
+            value = self.ObjectiveValue() / self.scale
+            if self.progress.report(self.placed, value, value, self.WallTime() / self.time_limit):
+                self.StopSearch()
+
+def _gender_allows(group: GroupState, member: MemberProfile) -> bool:
+    """조원만의 성비가 너무 극단적(한 성별 80% 초과)이 되지 않는지 확인"""
+    return _gender_allows_counts(group.male, group.female, member)
+
+def _gender_allows_counts(male: int, female: int, member: MemberProfile) -> bool:
+    """조원 남녀 수가 male/female인 조에 member를 추가해도 성비가 극단적이지 않은지 확인"""
+    if member.gender == '남':
+        new_male = male + 1
+        new_female = female
     else:
-        new_male = member_male_count
-        new_female = member_female_count + 1
+        new_male = male
+        new_female = female + 1
     
-    # 조원 총 인원
     total_member_count = new_male + new_female
-    
-    # 조원만의 성비가 너무 극단적이면 제한 (예: 한 성별이 80% 이상)
-    if total_member_count > 0:
-        male_ratio = new_male / total_member_count
-        female_ratio = new_female / total_member_count
-        
-        # 한 성별이 80% 이상이면 배정 제한 (너무 극단적인 성비 방지)
-        if male_ratio > 0.8 or female_ratio > 0.8:
-            return False
-    
-    return True
+    return new_male / total_member_count <= 0.8 and new_female / total_member_count <= 0.8
+
+def _gender_balance(male: int, female: int) -> float:
+    """조원 남녀 수로부터 성비 균형 점수 계산"""
+    total = male + female
+    if total == 0:
+        return 1.0
+
+    male_ratio = male / total
+    female_ratio = female / total
+
+    # 균형 점수 계산 (50:50에 가까울수록 높은 점수)
+    balance_score = min(male_ratio, female_ratio) * 2  # 0.5일 때 1.0, 0.4일 때 0.8, 0.3일 때 0.6
+
+    # 극단적인 성비 방지 (한 성별이 80% 이상이면 낮은 점수)
+    if male_ratio > 0.8 or female_ratio > 0.8:
+        balance_score *= 0.3  # 극단적인 성비는 30% 점수만
+
+    return balance_score
+
+def _age_spread(count: int, age_sum: int, age_sq_sum: int, bucket_count: int) -> float:
+    """나이 합계/제곱합/연령대 수로부터 연령 분포 점수 계산"""
+    if count <= 1:
+        return 1.0
+
+    # 연령 분산 (분산이 클수록 다양함)
+    mean_age = age_sum / count
+    variance = max(age_sq_sum / count - mean_age * mean_age, 0.0)
+
+    # 연령대가 다양할수록 높은 점수
+    diversity_score = bucket_count / count
+
+    # 분산과 다양성을 결합한 점수
+    return (variance * 0.7 + diversity_score * 0.3) / 100  # 정규화
+
+def _weighted_score(gender_score: float, age_score: float, major_score: float, region_score: float) -> float:
+    """종합 점수 (성비 40%, 연령 25%, 학과 20%, 지역 15%)"""
+    return (gender_score * 0.4 +
+            age_score * 0.25 +
+            major_score * 0.2 +
+            region_score * 0.15)
+
+def _group_score(count: int, male: int, female: int, age_sum: int, age_sq_sum: int, bucket_count: int,
+                 major_pairs: int, region_pairs: int) -> float:
+    """조 카운터(조원 수, 남녀 수, 나이 합계/제곱합, 연령대 수, 2명 이상인 학과/지역 수)로부터 종합 점수 계산"""
+    return _weighted_score(_gender_balance(male, female),
+                           _age_spread(count, age_sum, age_sq_sum, bucket_count),
+                           min(major_pairs / 5, 1.0),
+                           min(region_pairs / 5, 1.0))
 
 def calculate_group_stats(group: Dict) -> Dict:
     """조별 통계 계산"""
@@ -197,6 +1494,12 @@ def calculate_group_stats(group: Dict) -> Dict:
     regions = [extract_region(m.get('캠퍼스', m.get('학교/학년', ''))) for m in all_members]
     region_counts = Counter(regions)
     
+    return _group_stats(male_count, female_count, member_male_count, member_female_count, len(all_members),
+                        dict(major_counts), dict(region_counts))
+
+def _group_stats(male_count: int, female_count: int, member_male_count: int, member_female_count: int,
+                 total_count: int, major_counts: Dict[str, int], region_counts: Dict[str, int]) -> Dict:
+    """조별 통계 dict와 조건 충족 여부 (calculate_group_stats, GroupState.stats 공용)"""
     # 조건 충족 여부
     conditions = {
         '의대24_25_분리': True,  # 기본적으로 True (can_assign에서 체크됨)
@@ -214,24 +1517,349 @@ def calculate_group_stats(group: Dict) -> Dict:
         'female_count': female_count,
         'member_male_count': member_male_count,
         'member_female_count': member_female_count,
-        'total_count': len(all_members),
-        'major_distribution': dict(major_counts),
-        'region_distribution': dict(region_counts),
+        'total_count': total_count,
+        'major_distribution': major_counts,
+        'region_distribution': region_counts,
         'conditions_met': conditions
     }
 
+def _build_groups(leaders: pd.DataFrame, available_groups: List[str]) -> Dict[str, GroupState]:
+    """조장/헬퍼 데이터로 조별 GroupState 생성 (조장이나 헬퍼가 없는 조는 제외)"""
+    groups: Dict[str, GroupState] = {}
+    if '조장or헬퍼' in leaders.columns:
+        role_column = '조장or헬퍼'
+    elif '역할' in leaders.columns:
+        role_column = '역할'
+    else:
+        print(f"경고: 조장/헬퍼 구분 컬럼을 찾을 수 없습니다. 사용 가능한 컬럼: {list(leaders.columns)}")
+        role_column = None
+    
+    # 조 번호별 첫 조장/헬퍼 행 (조마다 DataFrame을 다시 거르지 않도록 한 번만 순회)
+    first_rows: Dict[Tuple[str, str], Dict] = {}
+    if role_column is not None:
+        for record in leaders.to_dict('records'):
+            first_rows.setdefault((record['조 숫자'], record[role_column]), record)
+    
+    for grp_num in available_groups:
+        if role_column is None:
+            continue
+        
+        leader = first_rows.get((grp_num, '조장'))
+        if leader is None:
+            print(f"경고: 조 {grp_num}에 조장이 없습니다.")
+            continue
+        
+        helper = first_rows.get((grp_num, '헬퍼'))
+        if helper is None:
+            print(f"경고: 조 {grp_num}에 헬퍼가 없습니다.")
+            continue
+        
+        groups[str(grp_num)] = GroupState(str(grp_num), leader, helper)
+    
+    if not groups:
+        raise ValueError("유효한 조장/헬퍼 데이터가 없습니다.")
+    return groups
+
+def analyze_feasibility(leaders: pd.DataFrame, members: pd.DataFrame, min_members: int = 6,
+                        max_members: int = 8, table: Optional[MemberTable] = None) -> Dict:
+    """탐색 전에 하드 조건을 만족할 수 없는 명단인지 O(N + G)로 검사 (presolve)
+
+    table(명단 캐시에서 꺼낸 조원 인코딩)을 주면 조원 명단을 다시 분류하지 않습니다.
+
+    반환값:
+        feasible: 모든 하드 조건과 인원 범위를 만족할 여지가 있는지
+        issues: [{'code', 'severity'('error'|'warning'), 'message', 'count', 'details'}]
+        bounds: 조 수, 조원 수, 전체 정원 범위 등 계산에 쓴 값
+        elapsed_ms: 검사에 걸린 시간
+    """
+    start = time.perf_counter()
+    issues = []
+    
+    available_groups = sorted(leaders['조 숫자'].unique(), key=lambda x: int(x))
+    with contextlib.redirect_stdout(io.StringIO()):
+        try:
+            group_list = list(_build_groups(leaders, available_groups).values())
+        except ValueError:
+            group_list = []
+    if table is None or len(table) != len(members):
+        table = MemberTable(members)
+    profiles = table.profiles()
+    names = members['이름'].to_numpy() if '이름' in members.columns else np.full(len(members), '', dtype=object)
+    num_groups = len(group_list)
+    num_members = len(profiles)
+    
+    bounds = {
+        'groups': num_groups,
+        'members': num_members,
+        'min_total': min_members * num_groups,
+        'max_total': max_members * num_groups,
+    }
+    
+    if num_groups == 0:
+        issues.append({'code': 'no_groups', 'severity': 'error',
+                       'message': "유효한 조장/헬퍼 데이터가 없습니다.", 'count': 0, 'details': []})
+        return _feasibility_report(issues, bounds, start)
+    
+    # 1. 전체 인원 범위: min·G <= N <= max·G
+    if num_members < bounds['min_total']:
+        issues.append({'code': 'too_few_members', 'severity': 'error',
+                       'message': f"조원 {num_members}명으로는 {num_groups}개 조를 최소 {min_members}명씩 채울 수 없습니다 "
+                                  f"(최소 {bounds['min_total']}명 필요).",
+                       'count': bounds['min_total'] - num_members, 'details': []})
+    elif num_members > bounds['max_total']:
+        issues.append({'code': 'too_many_members', 'severity': 'error',
+                       'message': f"조원 {num_members}명이 {num_groups}개 조의 최대 정원 {bounds['max_total']}명을 넘습니다.",
+                       'count': num_members - bounds['max_total'], 'details': []})
+    
+    # 2. 같은 학교 금지: 한 학교 인원이 조 수보다 많으면 겹침을 피할 수 없음
+    school_counts = Counter(profile.school for profile in profiles)
+    crowded = sorted(((school or '(학교 미기재)', count) for school, count in school_counts.items()
+                      if count > num_groups), key=lambda item: -item[1])
+    if crowded:
+        issues.append({'code': 'school_over_groups', 'severity': 'error',
+                       'message': f"조 수({num_groups})보다 인원이 많은 학교가 {len(crowded)}곳 있어 "
+                                  f"같은 학교 학생이 같은 조에 배정될 수밖에 없습니다.",
+                       'count': sum(count - num_groups for _, count in crowded),
+                       'details': [f"{school}: {count}명" for school, count in crowded]})
+    
+    # 3. 나이 조건 + 의대 24/25학번 분리: 조원마다 들어갈 수 있는 조 수의 상한
+    #    (37세 조장 조는 39세까지, 나머지 조는 헬퍼보다 어려야 함)
+    def eligible_counter(subset: List[GroupState]):
+        helper_ages = np.sort([group.helper_age for group in subset if group.leader_age != 37])
+        leader_37 = sum(1 for group in subset if group.leader_age == 37)
+        def count(age: int) -> int:
+            return int(helper_ages.size - np.searchsorted(helper_ages, age, side='right')) + (leader_37 if age <= 39 else 0)
+        return count
+    
+    count_all = eligible_counter(group_list)
+    conflict_counters = {
+        year: eligible_counter([group for group in group_list
+                                if group.leader_major == "의대" and group.leader_year in ("24", "25")
+                                and group.leader_year != year])
+        for year in ("24", "25")
+    }
+    cohort_members = {"24": 0, "25": 0}
+    too_old = []
+    no_group = []
+    for profile in profiles:
+        eligible = count_all(profile.age)
+        if eligible == 0:
+            too_old.append(profile)
+            continue
+        if profile.major == "의대" and profile.year in cohort_members:
+            cohort_members[profile.year] += 1
+            if eligible - conflict_counters[profile.year](profile.age) == 0:
+                no_group.append(profile)
+    
+    if too_old:
+        issues.append({'code': 'older_than_helpers', 'severity': 'error',
+                       'message': f"모든 헬퍼보다 나이가 많아(37세 조장 조는 39세 초과) 들어갈 조가 없는 조원이 {len(too_old)}명 있습니다.",
+                       'count': len(too_old),
+                       'details': [f"{names[profile.row]} ({profile.age}세)" for profile in too_old]})
+    if no_group:
+        issues.append({'code': 'cohort_no_group', 'severity': 'error',
+                       'message': f"의대 24/25학번 분리와 나이 조건을 함께 만족하는 조가 없는 조원이 {len(no_group)}명 있습니다.",
+                       'count': len(no_group),
+                       'details': [f"{names[profile.row]} (의대 {profile.year}학번, {profile.age}세)"
+                                   for profile in no_group]})
+    
+    # 4. 나이별 정원 상한: a세 이상 조원은 a세를 받을 수 있는 조에만 들어가므로 그 조들의 정원을 넘으면 안 됨
+    #    (나이가 많을수록 들어갈 수 있는 조가 포함 관계로 줄어들어, 나이마다 이 조건을 보면 충분함)
+    ages, age_counts = np.unique([profile.age for profile in profiles if count_all(profile.age) > 0],
+                                 return_counts=True)
+    older = np.cumsum(age_counts[::-1])[::-1]  # ages[i]세 이상 조원 수
+    over_capacity = []
+    for age, count in zip(ages.tolist(), older.tolist()):
+        groups = count_all(age)
+        if count > groups * max_members:
+            over_capacity.append((age, count, groups))
+    if over_capacity:
+        issues.append({'code': 'age_capacity', 'severity': 'error',
+                       'message': f"나이 조건상 들어갈 수 있는 조의 정원보다 조원이 많은 나이 구간이 {len(over_capacity)}개 있습니다.",
+                       'count': max(count - groups * max_members for _, count, groups in over_capacity),
+                       'details': [f"{age}세 이상 조원 {count}명 > 받을 수 있는 {groups}개 조 정원 {groups * max_members}명"
+                                   for age, count, groups in over_capacity]})
+    
+    # 5. 학번별 정원 상한: 의대 24(25)학번 조원은 의대 25(24)학번 조장 조에 갈 수 없음
+    for year, count in cohort_members.items():
+        other = "25" if year == "24" else "24"
+        open_groups = num_groups - sum(1 for group in group_list
+                                       if group.leader_major == "의대" and group.leader_year == other)
+        bounds[f'cohort_{year}_members'] = count
+        bounds[f'cohort_{year}_groups'] = open_groups
+        if count > open_groups * max_members:
+            issues.append({'code': f'cohort_{year}_capacity', 'severity': 'error',
+                           'message': f"의대 {year}학번 조원 {count}명이 들어갈 수 있는 {open_groups}개 조의 "
+                                      f"정원({open_groups * max_members}명)을 넘습니다.",
+                           'count': count - open_groups * max_members, 'details': []})
+    
+    # 6. 지역을 알 수 없는 캠퍼스 (하드 조건은 아니지만 지역 다양성 점수가 부정확해짐)
+    if table.unknown_campuses:
+        issues.append({'code': 'unknown_campus', 'severity': 'warning',
+                       'message': f"지역을 알 수 없어 '기타'로 분류된 캠퍼스가 {len(table.unknown_campuses)}곳 있습니다.",
+                       'count': sum(table.unknown_campuses.values()),
+                       'details': [f"{campus}: {count}명" for campus, count in table.unknown_campuses.most_common()]})
+    
+    return _feasibility_report(issues, bounds, start)
+
+def _feasibility_report(issues: List[Dict], bounds: Dict, start: float) -> Dict:
+    return {
+        'feasible': not any(issue['severity'] == 'error' for issue in issues),
+        'issues': issues,
+        'bounds': bounds,
+        'elapsed_ms': (time.perf_counter() - start) * 1000,
+    }
+
+def format_feasibility_report(report: Dict) -> str:
+    """analyze_feasibility 결과를 사람이 읽을 수 있는 문자열로 변환"""
+    bounds = report['bounds']
+    lines = [f"사전 검사: 조 {bounds['groups']}개, 조원 {bounds['members']}명 "
+             f"(정원 {bounds.get('min_total', 0)}-{bounds.get('max_total', 0)}명), {report['elapsed_ms']:.1f}ms"]
+    if not report['issues']:
+        lines.append("✅ 하드 조건을 만족할 수 없는 요소가 없습니다.")
+    for issue in report['issues']:
+        mark = "❌" if issue['severity'] == 'error' else "⚠️"
+        lines.append(f"{mark} {issue['message']}")
+        for detail in issue['details'][:10]:
+            lines.append(f"    - {detail}")
+        if len(issue['details']) > 10:
+            lines.append(f"    ... 외 {len(issue['details']) - 10}건")
+    return "\n".join(lines)
+
+class AssignmentResult:
+    """조 배정 결과
+
+    배정은 조장/헬퍼 명단 행, 조원 명단 행 위치(member_rows)와 각 조원의 조 번호/조 순서 배열로 들고 있고,
+    stats는 배정 중 갱신한 조별 카운터로 계산한 calculate_group_stats 형식의 통계입니다.
+    조장/헬퍼/조원 한 줄씩의 DataFrame은 dataframe에 처음 접근할 때 원본 명단에서 열 단위로 만들고
+    (attrs에 seed, objective, profile 기록), groups는 조 번호 → {'조 번호', 'leader', 'helper',
+    'members': [행 dict], 'stats'} 형식(generate_summary_report, 웹 결과 화면이 쓰는 형식)으로 필요할 때 만듭니다.
+    """
+
+    def __init__(self, staff: List[Dict], members: pd.DataFrame, member_rows: np.ndarray,
+                 member_numbers: List[str], member_groups: np.ndarray, stats: Dict[str, Dict],
+                 seed: int, objective: float, profile: Dict):
+        self.staff = staff
+        # 결과에 쓰는 열만 보관 (다중 시작 작업 프로세스에서 돌려받을 때 명단 전체를 복사하지 않음)
+        self.members = members[[column for column in members.columns if column in MEMBER_COLUMNS.values()]]
+        self.member_rows = member_rows
+        self.member_numbers = member_numbers
+        self.member_groups = member_groups
+        self.stats = stats
+        self.seed = seed
+        self.objective = objective
+        self.profile = profile
+        self._dataframe: Optional[pd.DataFrame] = None
+        self._groups: Optional[Dict[str, Dict]] = None
+
+    @property
+    def dataframe(self) -> pd.DataFrame:
+        """조 배정 결과 DataFrame (처음 접근할 때 한 번만 만듦)"""
+        if self._dataframe is None:
+            df = assignment_frame(self.staff, self.members, self.member_rows, self.member_numbers,
+                                  self.member_groups)
+            df.attrs['seed'] = self.seed
+            df.attrs['objective'] = self.objective
+            df.attrs['profile'] = self.profile
+            self._dataframe = df
+        return self._dataframe
+
+    @property
+    def groups(self) -> Dict[str, Dict]:
+        """조 번호별 조장/헬퍼/조원 행 dict와 통계 (처음 접근할 때 한 번만 만듦)"""
+        if self._groups is None:
+            self._groups = group_records(self.dataframe, self.stats)
+        return self._groups
+
+    def to_csv(self, path: str):
+        """결과 CSV를 원자적으로 저장"""
+        write_csv_atomic(self.dataframe, path)
+
+    def summary(self, output_file: Optional[str] = None) -> pd.DataFrame:
+        """조별 요약 보고서 (output_file을 주면 요약 CSV도 저장)"""
+        return generate_summary_report(self.groups, output_file)
+
+    def hard_violations(self, members: pd.DataFrame, table: Optional[MemberTable] = None) -> Dict[str, int]:
+        """하드 조건(의대24_25_분리, 같은학교_금지, 나이_조건)별 위반 조 수를 배정 결과에서 다시 판정
+
+        stats의 하드 조건은 배정 중 검사를 거쳤다는 뜻으로 항상 True이므로, 검증할 때는 원본 조원 명단
+        (members, 결과에는 캠퍼스 열이 없음)과 조장/헬퍼 행으로 FeasibilityMatrix와 같은 기준을 적용합니다.
+        """
+        if table is None or len(table) != len(members):
+            table = MemberTable(members)
+        leaders, helpers = self.staff[0::2], self.staff[1::2]
+        rows, groups = self.member_rows, self.member_groups
+
+        # 1. 의대 24/25학번 분리 (조장 기준)
+        member_year = np.asarray(table.years, dtype=object)[table.year[rows]]
+        leader_year = np.array([cohort_year(leader.get('학번', '')) for leader in leaders], dtype=object)[groups]
+        leader_med = np.array([extract_major(leader.get('학과', '')) == "의대" for leader in leaders], dtype=bool)
+        cohort_conflict = ((table.major[rows] == MAJOR_CODES.index("의대")) & np.isin(member_year, ["24", "25"]) &
+                           leader_med[groups] & np.isin(leader_year, ["24", "25"]) & (member_year != leader_year))
+
+        # 2. 같은 학교 금지 (조 안에서 같은 학교 id가 두 번 이상)
+        keys = groups.astype(np.int64) * max(len(table.schools), 1) + table.school[rows]
+        unique_keys, counts = np.unique(keys, return_counts=True)
+        school_groups = unique_keys[counts > 1] // max(len(table.schools), 1)
+
+        # 3. 나이 조건 (헬퍼보다 어려야 함, 37세 조장 예외: 39세까지 허용)
+        age = table.age[rows].astype(np.int64)
+        leader_37 = np.array([leader.get('나이', 0) == 37 for leader in leaders], dtype=bool)[groups]
+        helper_age = np.array([helper.get('나이', 0) for helper in helpers], dtype=np.int64)[groups]
+        age_conflict = ~np.where(leader_37, age <= 39, age < helper_age)
+
+        return {
+            '의대24_25_분리': len(np.unique(groups[cohort_conflict])),
+            '같은학교_금지': len(np.unique(school_groups)),
+            '나이_조건': len(np.unique(groups[age_conflict])),
+        }
+
 def assign_groups(leaders: pd.DataFrame, members: pd.DataFrame, min_members: int = 6, max_members: int = 8, 
-                 max_gender_diff: int = 1) -> pd.DataFrame:
-    """조 배정 메인 함수"""
+                  max_gender_diff: int = 1, engine: str = 'greedy', time_limit: float = 10.0,
+                  seed: Optional[int] = None, progress: Optional[ProgressCallback] = None) -> pd.DataFrame:
+    """조 배정 결과를 DataFrame으로 반환 (solve_groups(...).dataframe과 같음)"""
+    return solve_groups(leaders, members, min_members, max_members, max_gender_diff, engine, time_limit,
+                        seed, progress).dataframe
+
+def solve_groups(leaders: pd.DataFrame, members: pd.DataFrame, min_members: int = 6, max_members: int = 8, 
+                 max_gender_diff: int = 1, engine: str = 'greedy', time_limit: float = 10.0,
+                 seed: Optional[int] = None, progress: Optional[ProgressCallback] = None,
+                 table: Optional[MemberTable] = None) -> AssignmentResult:
+    """조 배정 메인 함수
+
+    engine이 'annealing' 또는 'tabu'이면 탐욕 배정 + 교환 개선 결과에서 출발해
+    time_limit초 동안 메타휴리스틱으로 추가 개선합니다. 'exact'이면 같은 결과를 힌트로
+    CP-SAT 모델을 time_limit초 동안 풀어 최적성 갭과 함께 보고합니다.
+
+    모든 무작위 선택은 seed로 초기화한 난수 생성기를 사용하므로 같은 seed로 다시 실행하면
+    greedy 엔진의 결과가 그대로 재현됩니다 (시간 제한이 있는 엔진은 반복 횟수가 달라질 수 있음).
+    조별 구성과 통계, 사용한 seed, 최종 목적함수, 단계별 계측(PhaseProfile)을 AssignmentResult로 반환합니다.
+
+    progress를 주면 단계, 배정된 조원 수, 현재/최고 목적함수, 경과 시간을 주기적으로 전달하며,
+    progress가 True를 반환하면 annealing/tabu/exact 단계를 조기 종료합니다 (Progress 참고).
+    table(명단 캐시에서 꺼낸 조원 인코딩, RosterCache.member_table)을 주면 조원 명단을 다시 분류하지 않습니다.
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"알 수 없는 배정 엔진입니다: {engine} (가능: {', '.join(ENGINES)})")
+    if engine == 'exact' and cp_model is None:
+        raise ImportError("exact 엔진을 사용하려면 ortools 패키지가 필요합니다 (pip install ortools)")
+    
+    if seed is None:
+        seed = random.randrange(2 ** 31)
+    rng = random.Random(seed)
     
     # 디버깅: 컬럼명 확인
     print(f"조장/헬퍼 파일 컬럼: {list(leaders.columns)}")
     print(f"조원 파일 컬럼: {list(members.columns)}")
     
+    # 조원 명단을 배정에 필요한 열만 정수 코드로 인코딩 (학과/지역/학교는 서로 다른 문자열마다 한 번만 분류)
+    if table is None or len(table) != len(members):
+        table = MemberTable(members)
+    names = members['이름'].to_numpy() if '이름' in members.columns else np.full(len(members), '', dtype=object)
+    
     # 전체 데이터의 실제 성비 계산
-    all_members_data = members.to_dict('records')
-    total_male = sum(1 for m in all_members_data if m['성별'] == '남')
-    total_female = sum(1 for m in all_members_data if m['성별'] == '여')
+    total_male = int(np.count_nonzero(table.gender == _GENDER_INDEX['남']))
+    total_female = int(np.count_nonzero(table.gender == _GENDER_INDEX['여']))
     total_members = total_male + total_female
     
     if total_members > 0:
@@ -246,511 +1874,254 @@ def assign_groups(leaders: pd.DataFrame, members: pd.DataFrame, min_members: int
     available_groups = sorted(leaders['조 숫자'].unique(), key=lambda x: int(x))
     print(f"사용 가능한 조 번호: {available_groups}")
     
-    # 그룹 초기화
-    groups = {}
-    for grp_num in available_groups:
-        leader_df = leaders[leaders['조 숫자'] == grp_num]
-        helper_df = leaders[leaders['조 숫자'] == grp_num]
-        
-        # 조장 찾기 (컬럼명 확인 후 수정)
-        if '조장or헬퍼' in leaders.columns:
-            leader_row = leader_df[leader_df['조장or헬퍼'] == '조장']
-        elif '역할' in leaders.columns:
-            leader_row = leader_df[leader_df['역할'] == '조장']
-        else:
-            print(f"경고: 조장/헬퍼 구분 컬럼을 찾을 수 없습니다. 사용 가능한 컬럼: {list(leaders.columns)}")
-            continue
-            
-        if leader_row.empty:
-            print(f"경고: 조 {grp_num}에 조장이 없습니다.")
-            continue
-        
-        # 헬퍼 찾기 (컬럼명 확인 후 수정)
-        if '조장or헬퍼' in leaders.columns:
-            helper_row = helper_df[helper_df['조장or헬퍼'] == '헬퍼']
-        elif '역할' in leaders.columns:
-            helper_row = helper_df[helper_df['역할'] == '헬퍼']
-        else:
-            print(f"경고: 조장/헬퍼 구분 컬럼을 찾을 수 없습니다.")
-            continue
-            
-        if helper_row.empty:
-            print(f"경고: 조 {grp_num}에 헬퍼가 없습니다.")
-            continue
-        
-        groups[str(grp_num)] = {
-            '조 번호': str(grp_num),
-            'leader': leader_row.iloc[0].to_dict(),
-            'helper': helper_row.iloc[0].to_dict(),
-            'members': [],
-            'used_schools': set(),
-            'used_regions': set(),
-            'age_distribution': []  # 연령 분포 추적
-        }
-    
-    if not groups:
-        raise ValueError("유효한 조장/헬퍼 데이터가 없습니다.")
+    groups = _build_groups(leaders, available_groups)
     
     print(f"생성된 조 수: {len(groups)}")
     print(f"조원 인원 범위: {min_members}-{max_members}명")
     
-    # 조원을 연령대별로 분류
-    members_list = members.to_dict('records')
+    members_list = table.profiles()
+    if table.unknown_campuses:
+        print(f"지역 미분류 캠퍼스('기타'): "
+              f"{', '.join(f'{campus}({count}명)' for campus, count in table.unknown_campuses.most_common())}")
+    group_list = list(groups.values())
+    
+    # 하드 제약 사전 계산 (조원 × 조) 및 벡터화 점수 계산용 조별 배열
+    feasibility = FeasibilityMatrix(members_list, group_list)
+    arrays = GroupArrays(members_list, group_list)
     
     # 연령대별 분류 (5세 단위)
     age_groups = {}
     for member in members_list:
-        age = member.get('나이', 0)
-        age_group = (age // 5) * 5  # 20-24, 25-29, 30-34 등
+        age_group = (member.age // 5) * 5  # 20-24, 25-29, 30-34 등
         if age_group not in age_groups:
             age_groups[age_group] = []
         age_groups[age_group].append(member)
     
     print(f"연령대별 분포: {[(k, len(v)) for k, v in sorted(age_groups.items())]}")
     
+    reporter = Progress(progress, len(members_list))
+    placed = 0
+    profile = PhaseProfile(group_list)
+    profile.watch(feasibility, feasibility_checks='checks')
+    
     # 1단계: 연령대별 균형 배정
+    reporter.enter('greedy')
+    profile.enter('greedy')
     for age_group, age_members in sorted(age_groups.items()):
-        random.shuffle(age_members)  # 각 연령대 내에서 랜덤화
+        rng.shuffle(age_members)  # 각 연령대 내에서 랜덤화
         
         for member in age_members:
-            assigned = False
+            # 모든 조에 대한 종합 점수를 한 번에 계산 (성비 40%, 연령 25%, 학과 20%, 지역 15%)
+            scores, gender_ok = score_candidates(member, arrays)
+            mask = feasibility.candidates(member) & gender_ok & (arrays.size < max_members)
             
-            # 가능한 조들을 성비와 연령 분포를 고려하여 평가
-            candidate_groups = []
-            for group in groups.values():
-                if len(group['members']) < max_members and can_assign_to_group(group, member, group['used_schools'], group['used_regions'], actual_gender_ratio, max_gender_diff):
-                    # 성비 점수 계산 (높은 우선순위)
-                    gender_score = calculate_gender_balance_score(group, member, actual_gender_ratio)
-                    # 연령 분포 점수 계산 (중간 우선순위)
-                    age_score = calculate_age_distribution_score(group, member)
-                    # 학과 분포 점수 계산 (중간 우선순위)
-                    major_score = calculate_major_distribution_score(group, member)
-                    # 지역 다양성 점수 계산 (낮은 우선순위)
-                    region_score = calculate_region_diversity_score(group, member)
-                    
-                    # 종합 점수 (성비 40%, 연령 25%, 학과 20%, 지역 15%)
-                    total_score = (gender_score * 0.4 + 
-                                 age_score * 0.25 + 
-                                 major_score * 0.2 + 
-                                 region_score * 0.15)
-                    candidate_groups.append((group, total_score))
-            
-            if candidate_groups:
+            if mask.any():
                 # 종합 점수가 가장 좋은 조 선택
-                candidate_groups.sort(key=lambda x: x[1], reverse=True)
-                best_group = candidate_groups[0][0]
-                
-                best_group['members'].append(member)
-                best_group['used_schools'].add(canonical_school(member.get('캠퍼스', '')))
-                best_group['used_regions'].add(extract_region(member.get('캠퍼스', '')))
-                best_group['age_distribution'].append(member.get('나이', 0))
-                assigned = True
-            
-            if not assigned:
+                best_index = int(np.argmax(np.where(mask, scores, -np.inf)))
+            else:
                 # 조건을 만족하는 조가 없으면 가장 적은 조에 배정
-                min_group = min(groups.values(), key=lambda g: len(g['members']))
-                min_group['members'].append(member)
-                min_group['used_schools'].add(canonical_school(member.get('캠퍼스', '')))
-                min_group['used_regions'].add(extract_region(member.get('캠퍼스', '')))
-                min_group['age_distribution'].append(member.get('나이', 0))
+                best_index = int(np.argmin(arrays.size))
+            group_list[best_index].add(member)
+            placed += 1
+            profile.add('scoring_calls')
+            if reporter.due():
+                # 배정 도중의 목적함수는 단조롭지 않으므로 현재 값을 그대로 보고
+                objective = total_objective(group_list)
+                reporter.report(placed, objective, objective)
     
     # 2단계: 최소 인원 조건 확인 및 조정
     under_min_groups = []
     over_max_groups = []
     
     for group in groups.values():
-        if len(group['members']) < min_members:
+        if group.size < min_members:
             under_min_groups.append(group)
-            print(f"경고: 조 {group['조 번호']}의 조원이 {len(group['members'])}명으로 최소 인원({min_members}명)에 미달합니다.")
-        elif len(group['members']) > max_members:
+            print(f"경고: 조 {group.number}의 조원이 {group.size}명으로 최소 인원({min_members}명)에 미달합니다.")
+        elif group.size > max_members:
             over_max_groups.append(group)
-            print(f"경고: 조 {group['조 번호']}의 조원이 {len(group['members'])}명으로 최대 인원({max_members}명)을 초과합니다.")
+            print(f"경고: 조 {group.number}의 조원이 {group.size}명으로 최대 인원({max_members}명)을 초과합니다.")
     
     # 최소 인원 미달 조들을 위한 재배정
+    reporter.enter('balance')
+    reporter.report(placed, total_objective(group_list))
+    profile.enter('balance')
     if under_min_groups:
         print(f"최소 인원 미달 조 {len(under_min_groups)}개에 대한 재배정을 시작합니다.")
         
         # 최대 인원 초과 조에서 멤버를 최소 인원 미달 조로 이동
         for under_group in under_min_groups:
-            needed_members = min_members - len(under_group['members'])
+            needed_members = min_members - under_group.size
             
             for over_group in over_max_groups:
                 if needed_members <= 0:
                     break
                     
                 # 초과 조에서 이동 가능한 멤버 찾기
-                movable_members = []
-                for member in over_group['members']:
-                    if can_assign_to_group(under_group, member, under_group['used_schools'], under_group['used_regions'], actual_gender_ratio, max_gender_diff):
-                        movable_members.append(member)
+                movable_members = [member for member in over_group.members
+                                   if feasibility.can_assign(under_group, member)]
+                profile.add('move_attempts', over_group.size)
                 
                 # 이동할 멤버 선택 (가장 적은 수로)
-                move_count = min(needed_members, len(movable_members), len(over_group['members']) - min_members)
+                move_count = min(needed_members, len(movable_members), over_group.size - min_members)
                 
-                for i in range(move_count):
-                    if i < len(movable_members):
-                        member_to_move = movable_members[i]
-                        
-                        # 멤버 이동
-                        over_group['members'].remove(member_to_move)
-                        under_group['members'].append(member_to_move)
-                        
-                        # 사용된 학교/지역 업데이트
-                        under_group['used_schools'].add(canonical_school(member_to_move.get('캠퍼스', '')))
-                        under_group['used_regions'].add(extract_region(member_to_move.get('캠퍼스', '')))
-                        under_group['age_distribution'].append(member_to_move.get('나이', 0))
-                        
-                        # 초과 조에서 제거
-                        over_group['used_schools'].discard(canonical_school(member_to_move.get('캠퍼스', '')))
-                        over_group['used_regions'].discard(extract_region(member_to_move.get('캠퍼스', '')))
-                        if member_to_move.get('나이', 0) in over_group['age_distribution']:
-                            over_group['age_distribution'].remove(member_to_move.get('나이', 0))
-                        
-                        needed_members -= 1
-                        print(f"조 {over_group['조 번호']}에서 조 {under_group['조 번호']}로 {member_to_move.get('이름', '')} 이동")
+                for member_to_move in movable_members[:move_count]:
+                    over_group.remove(member_to_move)
+                    under_group.add(member_to_move)
+                    needed_members -= 1
+                    profile.add('moves')
+                    logger.debug("조 %s에서 조 %s로 %s 이동", over_group.number, under_group.number,
+                                 names[member_to_move.row])
                 
                 # 초과 조가 더 이상 초과하지 않으면 목록에서 제거
-                if len(over_group['members']) <= max_members:
+                if over_group.size <= max_members:
                     over_max_groups.remove(over_group)
     
     # 최종 상태 확인
-    final_under_min = [g for g in groups.values() if len(g['members']) < min_members]
-    final_over_max = [g for g in groups.values() if len(g['members']) > max_members]
+    final_under_min = [g for g in groups.values() if g.size < min_members]
+    final_over_max = [g for g in groups.values() if g.size > max_members]
     
     if final_under_min:
         print(f"⚠️ 재배정 후에도 최소 인원 미달 조 {len(final_under_min)}개가 남아있습니다.")
         for group in final_under_min:
-            print(f"  - 조 {group['조 번호']}: {len(group['members'])}명 (최소 {min_members}명 필요)")
+            print(f"  - 조 {group.number}: {group.size}명 (최소 {min_members}명 필요)")
     
     if final_over_max:
         print(f"⚠️ 재배정 후에도 최대 인원 초과 조 {len(final_over_max)}개가 남아있습니다.")
         for group in final_over_max:
-            print(f"  - 조 {group['조 번호']}: {len(group['members'])}명 (최대 {max_members}명 초과)")
+            print(f"  - 조 {group.number}: {group.size}명 (최대 {max_members}명 초과)")
     
     # 3단계: 성비 및 연령 분포 최적화 (인원 균형 우선)
-    for _ in range(3):  # 3번 반복하여 최적화
+    search = SwapSearch(members_list, group_list, feasibility, arrays, np.random.default_rng(rng.getrandbits(64)))
+    profile.watch(search, scoring_calls='evaluations', swap_attempts='pairs', move_attempts='move_attempts',
+                  moves='moves', swaps='swaps')
+    profile.enter('improve')
+    reporter.enter('improve')
+    reporter.report(placed, total_objective(group_list), fraction=0.0)
+    for round_index in range(3):  # 최대 3번 반복하여 최적화
+        moved = 0
+        
         # 먼저 인원 균형 최적화
         for group in groups.values():
-            if len(group['members']) < min_members:
-                # 최소 인원 미달 조는 다른 조에서 멤버를 가져오기 시도
-                for other_group in groups.values():
-                    if other_group == group or len(other_group['members']) <= min_members:
-                        continue
-                    
-                    # 다른 조에서 이동 가능한 멤버 찾기
-                    for member in other_group['members']:
-                        if can_assign_to_group(group, member, group['used_schools'], group['used_regions'], actual_gender_ratio, max_gender_diff):
-                            # 멤버 이동
-                            other_group['members'].remove(member)
-                            group['members'].append(member)
-                            
-                            # 사용된 학교/지역 업데이트
-                            group['used_schools'].add(canonical_school(member.get('캠퍼스', '')))
-                            group['used_regions'].add(extract_region(member.get('캠퍼스', '')))
-                            group['age_distribution'].append(member.get('나이', 0))
-                            
-                            other_group['used_schools'].discard(canonical_school(member.get('캠퍼스', '')))
-                            other_group['used_regions'].discard(extract_region(member.get('캠퍼스', '')))
-                            if member.get('나이', 0) in other_group['age_distribution']:
-                                other_group['age_distribution'].remove(member.get('나이', 0))
-                            
-                            print(f"인원 균형: 조 {other_group['조 번호']}에서 조 {group['조 번호']}로 {member.get('이름', '')} 이동")
-                            break
-                    
-                    if len(group['members']) >= min_members:
+            if group.size < min_members:
+                # 최소 인원 미달 조는 다른 조에서 멤버를 가져오기 시도 (모든 조원을 배열로 한 번에 판정)
+                # 조마다 한 명씩, 앞 조부터 가져옴
+                donor_index = -1
+                while group.size < min_members:
+                    member = search.donor(group, min_members, donor_index)
+                    if member is None:
                         break
+                    donor_index = int(search.owner[member.index])
+                    other_group = group_list[donor_index]
+                    search.move(member, other_group, group)
+                    moved += 1
+                    logger.debug("인원 균형: 조 %s에서 조 %s로 %s 이동", other_group.number, group.number,
+                                 names[member.row])
         
-        # 그 다음 성비 및 연령 분포 최적화
-        for group in groups.values():
-            if len(group['members']) < min_members:
-                continue
-            
-            # 현재 조의 종합 점수 계산
-            current_gender_score = calculate_group_gender_score(group, actual_gender_ratio)
-            current_age_score = calculate_group_age_score(group)
-            current_major_score = calculate_group_major_score(group)
-            current_region_score = calculate_group_region_score(group)
-            current_total_score = (current_gender_score * 0.4 + 
-                                 current_age_score * 0.25 + 
-                                 current_major_score * 0.2 + 
-                                 current_region_score * 0.15)
-            
-            # 다른 조와 교환 시도 (인원 균형 유지하면서)
-            for other_group in groups.values():
-                if other_group == group or len(other_group['members']) < min_members:
-                    continue
-                
-                # 조원 교환 시도
-                for i, member1 in enumerate(group['members']):
-                    for j, member2 in enumerate(other_group['members']):
-                        # 교환 가능성 확인 (인원 균형 유지)
-                        if (can_assign_to_group(other_group, member1, other_group['used_schools'], other_group['used_regions'], actual_gender_ratio, max_gender_diff) and
-                            can_assign_to_group(group, member2, group['used_schools'], group['used_regions'], actual_gender_ratio, max_gender_diff)):
-                            
-                            # 교환 후 점수 계산
-                            temp_group1 = group.copy()
-                            temp_group2 = other_group.copy()
-                            
-                            temp_group1['members'][i] = member2
-                            temp_group2['members'][j] = member1
-                            
-                            new_gender_score1 = calculate_group_gender_score(temp_group1, actual_gender_ratio)
-                            new_age_score1 = calculate_group_age_score(temp_group1)
-                            new_major_score1 = calculate_group_major_score(temp_group1)
-                            new_region_score1 = calculate_group_region_score(temp_group1)
-                            new_total_score1 = (new_gender_score1 * 0.4 + 
-                                              new_age_score1 * 0.25 + 
-                                              new_major_score1 * 0.2 + 
-                                              new_region_score1 * 0.15)
-                            
-                            new_gender_score2 = calculate_group_gender_score(temp_group2, actual_gender_ratio)
-                            new_age_score2 = calculate_group_age_score(temp_group2)
-                            new_major_score2 = calculate_group_major_score(temp_group2)
-                            new_region_score2 = calculate_group_region_score(temp_group2)
-                            new_total_score2 = (new_gender_score2 * 0.4 + 
-                                              new_age_score2 * 0.25 + 
-                                              new_major_score2 * 0.2 + 
-                                              new_region_score2 * 0.15)
-                            
-                            other_gender_score = calculate_group_gender_score(other_group, actual_gender_ratio)
-                            other_age_score = calculate_group_age_score(other_group)
-                            other_major_score = calculate_group_major_score(other_group)
-                            other_region_score = calculate_group_region_score(other_group)
-                            other_total_score = (other_gender_score * 0.4 + 
-                                               other_age_score * 0.25 + 
-                                               other_major_score * 0.2 + 
-                                               other_region_score * 0.15)
-                            
-                            # 전체 점수가 개선되면 교환
-                            if new_total_score1 + new_total_score2 > current_total_score + other_total_score:
-                                group['members'][i] = member2
-                                other_group['members'][j] = member1
-                                
-                                # 연령 분포 업데이트
-                                group['age_distribution'][i] = member2.get('나이', 0)
-                                other_group['age_distribution'][j] = member1.get('나이', 0)
-                                break
-    
-    # 결과 데이터프레임 생성
-    rows = []
-    for group in groups.values():
-        # 조장
-        rows.append({
-            '조 번호': group['조 번호'],
-            '역할': '조장',
-            '이름': group['leader'].get('이름', ''),
-            '학과': group['leader'].get('학과', ''),
-            '학번': group['leader'].get('학번', ''),
-            '나이': group['leader'].get('나이', 0),
-            '학교': group['leader'].get('학교/학년', ''),
-            '성별': group['leader'].get('성별', ''),
-            '전화번호': group['leader'].get('연락처', ''),
-            '트랙': 'EBS'
-        })
-        
-        # 헬퍼
-        rows.append({
-            '조 번호': group['조 번호'],
-            '역할': '헬퍼',
-            '이름': group['helper'].get('이름', ''),
-            '학과': group['helper'].get('학과', ''),
-            '학번': group['helper'].get('학번', ''),
-            '나이': group['helper'].get('나이', 0),
-            '학교': group['helper'].get('학교/학년', ''),
-            '성별': group['helper'].get('성별', ''),
-            '전화번호': group['helper'].get('연락처', ''),
-            '트랙': 'EBS'
-        })
-        
-        # 조원들
-        for member in group['members']:
-            rows.append({
-                '조 번호': group['조 번호'],
-                '역할': '조원',
-                '이름': member.get('이름', ''),
-                '학과': member.get('학과', ''),
-                '학번': member.get('학번', ''),
-                '나이': member.get('나이', 0),
-                '지역': member.get('지역', ''),
-                '성별': member.get('성별', ''),
-                '전화번호': member.get('연락처', ''),
-                '트랙': member.get('트랙', 'EBS')
-            })
-    
-    return pd.DataFrame(rows)
-
-def calculate_gender_balance_score(group: Dict, new_member: Dict, total_gender_ratio: float) -> float:
-    """조에 새로운 멤버를 추가했을 때의 성비 균형 점수 계산 (조원만 대상)"""
-    # 조원만 대상으로 성비 계산 (조장/헬퍼 제외)
-    member_male_count = sum(1 for m in group['members'] if m['성별'] == '남')
-    member_female_count = sum(1 for m in group['members'] if m['성별'] == '여')
-    
-    # 새 멤버 추가 시 성비 계산
-    if new_member['성별'] == '남':
-        new_male = member_male_count + 1
-        new_female = member_female_count
-    else:
-        new_male = member_male_count
-        new_female = member_female_count + 1
-    
-    total_member_count = new_male + new_female
-    
-    if total_member_count == 0:
-        return 1.0  # 첫 번째 조원
-    
-    # 조원 성비 계산
-    current_male_ratio = new_male / total_member_count
-    current_female_ratio = new_female / total_member_count
-    
-    # 균형 점수 계산 (50:50에 가까울수록 높은 점수)
-    balance_ratio = min(current_male_ratio, current_female_ratio)  # 더 작은 비율
-    balance_score = balance_ratio * 2  # 0.5일 때 1.0, 0.4일 때 0.8, 0.3일 때 0.6
-    
-    # 극단적인 성비 방지 (한 성별이 80% 이상이면 낮은 점수)
-    if current_male_ratio > 0.8 or current_female_ratio > 0.8:
-        balance_score *= 0.3  # 극단적인 성비는 30% 점수만
-    
-    return balance_score
-
-def calculate_age_distribution_score(group: Dict, new_member: Dict) -> float:
-    """조에 새로운 멤버를 추가했을 때의 연령 분포 점수 계산"""
-    current_ages = group['age_distribution'].copy()
-    new_age = new_member.get('나이', 0)
-    current_ages.append(new_age)
-    
-    if len(current_ages) <= 1:
-        return 1.0  # 첫 번째 멤버는 높은 점수
-    
-    # 연령 분산 계산 (분산이 클수록 다양함)
-    mean_age = sum(current_ages) / len(current_ages)
-    variance = sum((age - mean_age) ** 2 for age in current_ages) / len(current_ages)
-    
-    # 연령대별 균형 점수
-    age_groups = {}
-    for age in current_ages:
-        age_group = (age // 5) * 5
-        age_groups[age_group] = age_groups.get(age_group, 0) + 1
-    
-    # 연령대가 다양할수록 높은 점수
-    diversity_score = len(age_groups) / max(len(current_ages), 1)
-    
-    # 분산과 다양성을 결합한 점수
-    score = (variance * 0.7 + diversity_score * 0.3) / 100  # 정규화
-    
-    return score
-
-def calculate_major_distribution_score(group: Dict, new_member: Dict) -> float:
-    """조에 새로운 멤버를 추가했을 때의 학과 분포 점수 계산"""
-    all_members = [group['leader'], group['helper']] + group['members']
-    major_counts = Counter([extract_major(m.get('학과', '')) for m in all_members])
-    
-    # 새 멤버 추가 시 학과 분포 계산
-    new_major = extract_major(new_member.get('학과', ''))
-    new_major_count = major_counts.get(new_major, 0) + 1
-    
-    # 학과 분포 점수 (의대,치대,한의대,간호대 중 2명 이상인 학과가 많을수록 높은 점수)
-    major_score = sum(1 for major, count in major_counts.items() if major in ['의대', '치대', '한의대', '간호대'] and count >= 2)
-    
-    # 새 멤버가 의대,치대,한의대,간호대 중 하나라면 점수 증가
-    if new_major in ['의대', '치대', '한의대', '간호대']:
-        major_score += 1
-    
-    # 점수 정규화 (0~5 사이)
-    return min(major_score / 5, 1.0)
-
-def calculate_region_diversity_score(group: Dict, new_member: Dict) -> float:
-    """조에 새로운 멤버를 추가했을 때의 지역 다양성 점수 계산"""
-    all_members = [group['leader'], group['helper']] + group['members']
-    regions = [extract_region(m.get('캠퍼스', m.get('학교/학년', ''))) for m in all_members]
-    region_counts = Counter(regions)
-    
-    # 새 멤버 추가 시 지역 분포 계산
-    new_region = extract_region(new_member.get('캠퍼스', ''))
-    new_region_count = region_counts.get(new_region, 0) + 1
-    
-    # 지역 다양성 점수 (3개 이상 지역에서 온 사람이 많을수록 높은 점수)
-    region_score = sum(1 for region, count in region_counts.items() if count >= 2)
+        # 그 다음 성비 및 연령 분포 최적화 (조원 교환은 인원을 바꾸지 않음)
+        swapped = search.improve()
+        reporter.report(placed, total_objective(group_list), fraction=(round_index + 1) / 3)
+        if moved == 0 and swapped == 0:
+            break
+    
+    # 4단계 (선택): 정확 해법 또는 메타휴리스틱으로 추가 개선
+    if engine == 'exact':
+        profile.enter('exact')
+        reporter.enter('exact', time_limit)
+        reporter.report(placed, total_objective(group_list), fraction=0.0)
+        report = ExactSolver(search, min_members, max_members, reporter).solve(time_limit, seed)
+        if 'gap' in report:
+            print(f"{ENGINES[engine]}: {report['status']}, 대리 목적함수 {report['objective']:.4f} "
+                  f"(상한 {report['bound']:.4f}, 갭 {report['gap']:.2%}), "
+                  f"목적함수 {report['objective_before']:.4f} -> {report['objective_after']:.4f}, "
+                  f"하드 조건 위반 {report['violations_before']}건 -> {report['violations_after']}건 "
+                  f"({'적용' if report['applied'] else '개선 없음, 기존 배정 유지'})")
+        else:
+            print(f"{ENGINES[engine]}: {report['status']} - 해를 찾지 못해 기존 배정을 유지합니다.")
+    elif engine != 'greedy':
+        profile.enter(engine)
+        reporter.enter(engine, time_limit)
+        reporter.report(placed, total_objective(group_list), fraction=0.0)
+        metaheuristic = NeighbourhoodSearch(search, min_members, max_members, rng, reporter)
+        profile.watch(metaheuristic, move_attempts='move_attempts', swap_attempts='swap_attempts',
+                      scoring_calls='evaluated')
+        start_objective = metaheuristic.current
+        if engine == 'annealing':
+            metaheuristic.anneal(time_limit)
+        else:
+            metaheuristic.tabu(time_limit)
+        print(f"{ENGINES[engine]}: {metaheuristic.iterations}회 반복, {metaheuristic.accepted}회 적용, "
+              f"목적함수 {start_objective:.4f} -> {metaheuristic.current:.4f}")
     
-    # 새 멤버가 다른 지역에서 온 경우 점수 증가
-    if new_region != '기타': # 기타 지역은 다양성에 포함되지 않음
-        region_score += 1
+    profile.enter('output')
     
-    # 점수 정규화 (0~5 사이)
-    return min(region_score / 5, 1.0)
+    # 배정 결과를 조원 행 위치/조 번호 배열로 정리 (결과 표는 AssignmentResult가 원본 명단에서 한 번에 만듦)
+    staff = []
+    for group in groups.values():
+        staff.append({**group.leader, '조 번호': group.number})
+        staff.append({**group.helper, '조 번호': group.number})
+    sizes = [len(group.members) for group in groups.values()]
+    member_rows = np.fromiter((member.row for group in groups.values() for member in group.members),
+                              dtype=np.int64, count=sum(sizes))
+    member_groups = np.repeat(np.arange(len(groups)), sizes)
+    member_numbers = [group.number for group in groups.values() for _ in group.members]
+    stats = {group.number: group.stats() for group in groups.values()}
+    
+    objective = total_objective(group_list)
+    profile.enter(None)
+    result = AssignmentResult(staff, members, member_rows, member_numbers, member_groups, stats,
+                              seed, objective, profile.as_dict())
+    reporter.enter('done')
+    reporter.report(placed, objective, objective, fraction=1.0)
+    return result
 
-def calculate_group_gender_score(group: Dict, total_gender_ratio: float) -> float:
-    """조의 현재 성비 균형 점수 계산 (조원만 대상)"""
-    # 조원만 대상으로 성비 계산 (조장/헬퍼 제외)
-    member_male_count = sum(1 for m in group['members'] if m['성별'] == '남')
-    member_female_count = sum(1 for m in group['members'] if m['성별'] == '여')
-    
-    total_member_count = member_male_count + member_female_count
-    
-    if total_member_count == 0:
-        return 1.0  # 조원이 없으면 기본 점수
-    
-    # 조원 성비 계산
-    current_male_ratio = member_male_count / total_member_count
-    current_female_ratio = member_female_count / total_member_count
-    
-    # 균형 점수 계산 (50:50에 가까울수록 높은 점수)
-    balance_ratio = min(current_male_ratio, current_female_ratio)  # 더 작은 비율
-    balance_score = balance_ratio * 2  # 0.5일 때 1.0, 0.4일 때 0.8, 0.3일 때 0.6
-    
-    # 극단적인 성비 방지 (한 성별이 80% 이상이면 낮은 점수)
-    if current_male_ratio > 0.8 or current_female_ratio > 0.8:
-        balance_score *= 0.3  # 극단적인 성비는 30% 점수만
-    
-    return balance_score
+def _run_restart(leaders: pd.DataFrame, members: pd.DataFrame, seed: int, kwargs: Dict) -> AssignmentResult:
+    """다중 시작의 한 번의 실행 (작업 프로세스에서 실행, 진행 로그는 숨김)"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return solve_groups(leaders, members, seed=seed, **kwargs)
 
-def calculate_group_age_score(group: Dict) -> float:
-    """조의 현재 연령 분포 점수 계산"""
-    ages = group['age_distribution']
-    if len(ages) <= 1:
-        return 1.0
-    
-    mean_age = sum(ages) / len(ages)
-    variance = sum((age - mean_age) ** 2 for age in ages) / len(ages)
-    
-    age_groups = {}
-    for age in ages:
-        age_group = (age // 5) * 5
-        age_groups[age_group] = age_groups.get(age_group, 0) + 1
-    
-    diversity_score = len(age_groups) / max(len(ages), 1)
-    
-    score = (variance * 0.7 + diversity_score * 0.3) / 100
-    return score
+def assign_groups_multistart(leaders: pd.DataFrame, members: pd.DataFrame, restarts: int = 4,
+                             workers: Optional[int] = None, seed: Optional[int] = None,
+                             **kwargs) -> pd.DataFrame:
+    """solve_groups_multistart의 가장 좋은 결과를 DataFrame으로 반환"""
+    return solve_groups_multistart(leaders, members, restarts, workers, seed, **kwargs).dataframe
 
-def calculate_group_major_score(group: Dict) -> float:
-    """조의 현재 학과 분포 점수 계산"""
-    all_members = [group['leader'], group['helper']] + group['members']
-    major_counts = Counter([extract_major(m.get('학과', '')) for m in all_members])
-    
-    # 학과 분포 점수 (의대,치대,한의대,간호대 중 2명 이상인 학과가 많을수록 높은 점수)
-    major_score = sum(1 for major, count in major_counts.items() if major in ['의대', '치대', '한의대', '간호대'] and count >= 2)
-    
-    # 점수 정규화 (0~5 사이)
-    return min(major_score / 5, 1.0)
+def solve_groups_multistart(leaders: pd.DataFrame, members: pd.DataFrame, restarts: int = 4,
+                            workers: Optional[int] = None, seed: Optional[int] = None,
+                            **kwargs) -> AssignmentResult:
+    """서로 다른 seed로 solve_groups를 restarts번 병렬 실행하고 목적함수가 가장 높은 결과를 반환
 
-def calculate_group_region_score(group: Dict) -> float:
-    """조의 현재 지역 다양성 점수 계산"""
-    all_members = [group['leader'], group['helper']] + group['members']
-    regions = [extract_region(m.get('캠퍼스', m.get('학교/학년', ''))) for m in all_members]
-    region_counts = Counter(regions)
-    
-    # 지역 다양성 점수 (3개 이상 지역에서 온 사람이 많을수록 높은 점수)
-    region_score = sum(1 for region, count in region_counts.items() if count >= 2)
-    
-    # 점수 정규화 (0~5 사이)
-    return min(region_score / 5, 1.0)
+    각 실행의 seed는 seed로 초기화한 난수 생성기에서 뽑으므로, 반환된 결과의 seed를
+    solve_groups(seed=...)에 넘기면 같은 배정을 재현할 수 있습니다. 나머지 인자는 solve_groups와 같습니다.
+    """
+    if restarts < 1:
+        raise ValueError("재시작 횟수는 1 이상이어야 합니다.")
+    if seed is None:
+        seed = random.randrange(2 ** 31)
+    seed_rng = random.Random(seed)
+    seeds = [seed_rng.randrange(2 ** 31) for _ in range(restarts)]
+    workers = min(restarts, workers or os.cpu_count() or 1)
+    
+    print(f"다중 시작: {restarts}회 실행 (작업 프로세스 {workers}개, 기준 seed {seed})")
+    if workers == 1:
+        results = [_run_restart(leaders, members, run_seed, kwargs) for run_seed in seeds]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(_run_restart, leaders, members, run_seed, kwargs) for run_seed in seeds]
+            results = [future.result() for future in futures]
+    
+    for result in results:
+        print(f"  seed {result.seed}: 목적함수 {result.objective:.4f}")
+    best = max(results, key=lambda result: result.objective)
+    print(f"최적 결과: seed {best.seed} (목적함수 {best.objective:.4f})")
+    return best
 
-def generate_summary_report(groups: Dict, output_file: str):
-    """조별 요약 보고서 생성"""
+def generate_summary_report(groups: Dict, output_file: Optional[str] = None):
+    """조별 요약 보고서 생성 (output_file을 주면 요약 CSV를 '<이름>_summary.csv'로 저장)"""
     summary_rows = []
     
     for group in groups.values():
-        stats = calculate_group_stats(group)
+        # 배정 결과(AssignmentResult.groups)는 배정 중 계산한 통계를 함께 가지고 있음
+        stats = group.get('stats') or calculate_group_stats(group)
         
         # 조건별 상세 설명 생성
         condition_details = {
@@ -824,49 +2195,88 @@ def generate_summary_report(groups: Dict, output_file: str):
         summary_rows.append(summary_row)
     
     summary_df = pd.DataFrame(summary_rows)
-    summary_df.to_csv(output_file.replace('.csv', '_summary.csv'), index=False, encoding='utf-8-sig')
+    if output_file is not None:
+        write_csv_atomic(summary_df, output_file.replace('.csv', '_summary.csv'))
     return summary_df
 
 def main():
     parser = argparse.ArgumentParser(description="수련회 조 배정 프로그램")
-    parser.add_argument('--leaders', required=True, help="조장/헬퍼 Excel 파일 (jojanghelpeo.xlsx)")
-    parser.add_argument('--members', required=True, help="조원 Excel 파일 (joweonmyeongdan.xlsx)")
+    parser.add_argument('--leaders', required=True, help="조장/헬퍼 명단 파일 (.xlsx/.xls/.csv/.parquet/.arrow)")
+    parser.add_argument('--members', required=True, help="조원 명단 파일 (.xlsx/.xls/.csv/.parquet/.arrow)")
     parser.add_argument('--out', default='final_group_assignment.csv', help="출력 CSV 파일")
     parser.add_argument('--min-members', type=int, default=6, help="각 조 최소 조원 수 (기본값: 6)")
     parser.add_argument('--max-members', type=int, default=8, help="각 조 최대 조원 수 (기본값: 8)")
     parser.add_argument('--max-gender-diff', type=int, default=1, help="성비 차이 허용 범위 (기본값: 1)")
+    parser.add_argument('--engine', choices=list(ENGINES), default='greedy',
+                        help="배정 엔진: greedy(기본), annealing(시뮬레이티드 어닐링), tabu(타부 탐색), exact(CP-SAT)")
+    parser.add_argument('--time-limit', type=float, default=10.0,
+                        help="annealing/tabu/exact 엔진의 탐색 시간 제한(초, 기본값: 10)")
+    parser.add_argument('--restarts', type=int, default=1,
+                        help="서로 다른 seed로 병렬 실행할 횟수 (기본값: 1, 2 이상이면 가장 좋은 결과 선택)")
+    parser.add_argument('--workers', type=int, default=None, help="다중 시작에 사용할 프로세스 수 (기본값: CPU 수)")
+    parser.add_argument('--seed', type=int, default=None, help="난수 seed (같은 seed로 결과 재현)")
+    parser.add_argument('--reader', choices=list(READERS), default='auto',
+                        help="Excel 읽기 방식: auto(기본), calamine, openpyxl")
+    parser.add_argument('--no-cache', action='store_true', help="명단 캐시를 쓰지 않고 항상 파일을 다시 읽기")
+    parser.add_argument('--check-only', action='store_true', help="사전 검사 결과만 출력하고 종료")
+    parser.add_argument('--allow-infeasible', action='store_true',
+                        help="사전 검사에서 하드 조건 위반이 예상되어도 배정을 진행")
+    parser.add_argument('--profile', nargs='?', const='assign_groups.pstats', default=None, metavar='PSTATS',
+                        help="단계별 실행 시간/호출 수를 출력하고 cProfile 결과를 파일로 저장 (기본: assign_groups.pstats)")
+    parser.add_argument('--verbose', '-v', action='store_true', help="조원 이동 같은 세부 로그 출력")
     args = parser.parse_args()
     
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO, format='%(message)s')
+    
     print("데이터 로딩 중...")
-    leaders, members = load_data(args.leaders, args.members)
+    table = None
+    if args.no_cache:
+        leaders, members = load_data(args.leaders, args.members, args.reader)
+    else:
+        # Flask/Streamlit과 같은 명단 캐시 사용 (내용이 같은 파일은 다시 파싱하지 않음)
+        from roster_cache import get_roster_cache, file_digest
+        cache = get_roster_cache()
+        leaders, members = cache.load_paths(args.leaders, args.members, args.reader)
+        with open(args.members, 'rb') as f:
+            table = cache.member_table(file_digest(f.read()), members)
+    
+    report = analyze_feasibility(leaders, members, args.min_members, args.max_members, table)
+    print(format_feasibility_report(report))
+    if args.check_only:
+        raise SystemExit(0 if report['feasible'] else 1)
+    if not report['feasible'] and not args.allow_infeasible:
+        print("하드 조건을 모두 만족하는 배정이 불가능합니다. 명단을 수정하거나 --allow-infeasible로 진행하세요.")
+        raise SystemExit(1)
     
     print("조 배정 중...")
-    df_assigned = assign_groups(leaders, members, args.min_members, args.max_members, args.max_gender_diff)
+    options = dict(min_members=args.min_members, max_members=args.max_members, max_gender_diff=args.max_gender_diff,
+                   engine=args.engine, time_limit=args.time_limit, table=table)
+    profiler = None
+    if args.profile:
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+    if args.restarts > 1:
+        result = solve_groups_multistart(leaders, members, args.restarts, args.workers, args.seed, **options)
+    else:
+        result = solve_groups(leaders, members, seed=args.seed, **options)
+    print(f"사용한 seed: {result.seed} (--seed {result.seed}로 재현 가능)")
+    if profiler is not None:
+        import pstats
+        profiler.disable()
+        profiler.dump_stats(args.profile)
+        print(f"\n=== 단계별 실행 시간 (총 {result.profile['total_seconds']:.3f}초) ===")
+        print(profile_table(result.profile).to_string(index=False))
+        if args.restarts > 1:
+            print("(다중 시작은 선택된 실행의 단계별 계측만 표시하며, cProfile은 작업 프로세스를 포함하지 않습니다)")
+        print(f"\ncProfile 결과가 {args.profile}에 저장되었습니다 (python -m pstats {args.profile}). 누적 시간 상위 15개:")
+        pstats.Stats(profiler).sort_stats('cumulative').print_stats(15)
     
     print("결과 저장 중...")
-    df_assigned.to_csv(args.out, index=False, encoding='utf-8-sig')
+    result.to_csv(args.out)
     
     print("요약 보고서 생성 중...")
-    # 그룹 정보 재구성
-    groups = {}
-    for _, row in df_assigned.iterrows():
-        grp_num = row['조 번호']
-        if grp_num not in groups:
-            groups[grp_num] = {
-                '조 번호': grp_num,
-                'leader': None,
-                'helper': None,
-                'members': []
-            }
-        
-        if row['역할'] == '조장':
-            groups[grp_num]['leader'] = row.to_dict()
-        elif row['역할'] == '헬퍼':
-            groups[grp_num]['helper'] = row.to_dict()
-        else:
-            groups[grp_num]['members'].append(row.to_dict())
-    
-    summary_df = generate_summary_report(groups, args.out)
+    summary_df = result.summary(args.out)
     
     print(f"조 배정 완료! 결과가 {args.out}에 저장되었습니다.")
     print(f"요약 보고서가 {args.out.replace('.csv', '_summary.csv')}에 저장되었습니다.")
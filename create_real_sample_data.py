@@ -3,110 +3,250 @@
 
 """
 실제 데이터 구조에 맞는 샘플 데이터 생성 스크립트
+
+인자 없이 실행하면 예전처럼 5개 조, 35명 샘플(real_leaders.xlsx, real_members.xlsx)을 만듭니다.
+조원 수, 조 수, 학교/학과/지역/성별/나이 분포와 시나리오(학교 편중, 의대 학번 편중 등)를 바꿔
+성능 측정(benchmark.py)이나 엣지 케이스 확인용 대규모 명단을 만들 수 있습니다.
 """
 
-import pandas as pd
+import argparse
+import os
 import random
+from typing import Dict, Optional, Sequence, Tuple
 
-def create_real_leader_data():
-    """실제 구조에 맞는 조장/헬퍼 샘플 데이터 생성"""
-    leaders_data = []
-    
-    # 5개 조의 조장/헬퍼 데이터
-    for group_num in range(1, 6):
-        # 조장
-        leaders_data.append({
-            '조 숫자': group_num,
-            '학교/학년': random.choice([
-                '대구한 본2', '서울대 본1', '연세대 본1', '고려대 본1', '성균관대 본1',
-                '부산대 본1', '경남대 본1', '대구대 본1', '경북대 본1',
-                '인천대 본1', '경기대 본1', '광주대 본1', '전남대 본1',
-                '대전대 본1', '충남대 본1', '강원대 본1', '제주대 본1'
-            ]),
-            '이름': f'조장{group_num}',
-            '학과': random.choice(['한', '의', '치', '간호', '약']),
-            '성별': random.choice(['남', '여']),
-            '조장or헬퍼': '조장',
-            '나이': random.randint(24, 35),
-            '연락처': f'010-{random.randint(1000, 9999)}-{random.randint(1000, 9999)}'
-        })
-        
-        # 헬퍼
-        leaders_data.append({
-            '조 숫자': group_num,
-            '학교/학년': random.choice([
-                '대구한 본2', '서울대 본1', '연세대 본1', '고려대 본1', '성균관대 본1',
-                '부산대 본1', '경남대 본1', '대구대 본1', '경북대 본1',
-                '인천대 본1', '경기대 본1', '광주대 본1', '전남대 본1',
-                '대전대 본1', '충남대 본1', '강원대 본1', '제주대 본1'
-            ]),
-            '이름': f'헬퍼{group_num}',
-            '학과': random.choice(['한', '의', '치', '간호', '약']),
-            '성별': random.choice(['남', '여']),
-            '조장or헬퍼': '헬퍼',
-            '나이': random.randint(23, 30),
-            '연락처': f'010-{random.randint(1000, 9999)}-{random.randint(1000, 9999)}'
-        })
-    
-    df_leaders = pd.DataFrame(leaders_data)
-    df_leaders.to_excel('real_leaders.xlsx', sheet_name='Sheet1', index=False)
-    print("실제 구조 조장/헬퍼 데이터 생성 완료: real_leaders.xlsx")
-
-def create_real_member_data():
-    """실제 구조에 맞는 조원 샘플 데이터 생성"""
-    members_data = []
-    
-    # 35명의 조원 데이터 (5개 조에 6-7명씩 배정)
-    for i in range(1, 36):
-        # 의대 24/25학번 분리 테스트를 위한 특별 케이스
-        if i <= 5:
-            major = '의'
-            year = '25'
-            grade = '예과1'
-        elif i <= 10:
-            major = '의'
-            year = '24'
-            grade = '예과2'
+import pandas as pd
+
+SCHOOLS = (
+    '충북대', '서울대', '연세대', '고려대', '성균관대',
+    '부산대', '경남대', '대구대', '경북대',
+    '인천대', '경기대', '광주대', '전남대',
+    '대전대', '충남대', '강원대', '제주대'
+)
+LEADER_SCHOOLS = (
+    '대구한 본2', '서울대 본1', '연세대 본1', '고려대 본1', '성균관대 본1',
+    '부산대 본1', '경남대 본1', '대구대 본1', '경북대 본1',
+    '인천대 본1', '경기대 본1', '광주대 본1', '전남대 본1',
+    '대전대 본1', '충남대 본1', '강원대 본1', '제주대 본1'
+)
+# 학교 수를 늘릴 때 붙이는 지역 (캠퍼스 이름으로 지역이 분류되도록 지역 키워드 사용)
+SCHOOL_REGIONS = ('서울', '경기', '대구', '경북', '부산', '경남', '전북', '충북', '천안', '강원', '광주', '전남', '대전', '충남')
+REGIONS = ('충북천안', '서울', '부산', '대구', '인천', '광주', '대전', '강원', '제주')
+MAJORS = ('의', '치', '한', '간호', '약', '물리', '임상')
+LEADER_MAJORS = ('한', '의', '치', '간호', '약')
+GRADES = ('예과1', '예과2', '본1', '본2', '본3')
+
+# 명단 시나리오 (generate_rosters의 scenario 인자)
+SCENARIOS = {
+    'balanced': '학교·학과·지역이 고르게 섞인 명단',
+    'school_heavy': '가장 큰 두 학교 인원이 조 수에 가까운 명단 (같은 학교 금지 조건이 빡빡함)',
+    'cohort_heavy': '의대 24/25학번 조원과 의대 24/25학번 조장이 많은 명단 (학번 분리 조건이 빡빡함)',
+    'age_heavy': '헬퍼와 나이가 비슷한 조원이 많은 명단 (나이 조건이 빡빡함)',
+}
+
+def school_names(count: int) -> Tuple[str, ...]:
+    """count개 학교 이름 (17개까지는 실제 이름, 그 뒤는 '서울3대'처럼 지역 키워드를 넣은 가상 이름)"""
+    names = list(SCHOOLS[:count])
+    index = 0
+    while len(names) < count:
+        region = SCHOOL_REGIONS[index % len(SCHOOL_REGIONS)]
+        names.append(f'{region}{index // len(SCHOOL_REGIONS) + 2}대')
+        index += 1
+    return tuple(names)
+
+def _weighted(rng: random.Random, weights: Optional[Dict[str, float]], choices: Sequence[str], k: int):
+    """weights가 있으면 가중치로, 없으면 choices에서 균등하게 k개 뽑기"""
+    if weights:
+        return rng.choices(list(weights), weights=list(weights.values()), k=k)
+    return rng.choices(list(choices), k=k)
+
+def parse_weights(text: str) -> Dict[str, float]:
+    """'서울대=3,연세대=1' 형식의 분포 문자열을 {값: 가중치}로 변환 (가중치를 생략하면 1)"""
+    weights = {}
+    for item in text.split(','):
+        name, _, weight = item.strip().partition('=')
+        name = name.strip()
+        if not name:
+            continue
+        try:
+            weights[name] = float(weight) if weight.strip() else 1.0
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"가중치는 숫자여야 합니다: {item.strip()}")
+        if weights[name] < 0:
+            raise argparse.ArgumentTypeError(f"가중치는 0 이상이어야 합니다: {item.strip()}")
+    if not weights or not any(weights.values()):
+        raise argparse.ArgumentTypeError(f"분포가 비어 있습니다: {text}")
+    return weights
+
+def _phone(rng: random.Random) -> str:
+    return f'010-{rng.randint(1000, 9999)}-{rng.randint(1000, 9999)}'
+
+def generate_leaders(groups: int = 5, scenario: str = 'balanced', seed: Optional[int] = None,
+                     member_max_age: int = 30, rng: Optional[random.Random] = None) -> pd.DataFrame:
+    """조장/헬퍼 명단 (조마다 조장 1명, 헬퍼 1명)
+
+    헬퍼는 조원 최대 나이(member_max_age)보다 많게 만들어 모든 조원이 어느 조에든 들어갈 수 있게 하고,
+    age_heavy 시나리오만 헬퍼 나이를 조원 나이 범위 안으로 낮춰 나이 조건을 일부러 빡빡하게 만듭니다.
+    """
+    rng = rng or random.Random(seed)
+    rows = []
+    for group_num in range(1, groups + 1):
+        for role in ('조장', '헬퍼'):
+            major = rng.choice(LEADER_MAJORS)
+            year = str(rng.randint(15, 22))
+            if scenario == 'cohort_heavy' and role == '조장' and group_num % 2 == 0:
+                major, year = '의', rng.choice(('24', '25'))
+            if role == '조장':
+                age = rng.randint(24, 35)
+            elif scenario == 'age_heavy':
+                age = rng.randint(member_max_age - 7, member_max_age - 4)
+            else:
+                age = rng.randint(member_max_age + 1, member_max_age + 6)
+            rows.append({
+                '조 숫자': group_num,
+                '학교/학년': rng.choice(LEADER_SCHOOLS),
+                '이름': f'{role}{group_num}',
+                '학과': major,
+                '학번': year,
+                '성별': rng.choice(('남', '여')),
+                '조장or헬퍼': role,
+                '나이': age,
+                '연락처': _phone(rng),
+            })
+    return pd.DataFrame(rows)
+
+def generate_members(members: int = 35, groups: int = 5, scenario: str = 'balanced', seed: Optional[int] = None,
+                     school_count: Optional[int] = None, schools: Optional[Dict[str, float]] = None,
+                     majors: Optional[Dict[str, float]] = None, regions: Optional[Dict[str, float]] = None,
+                     male_ratio: float = 0.5, age_range: Tuple[int, int] = (20, 30),
+                     rng: Optional[random.Random] = None) -> pd.DataFrame:
+    """조원 명단 ('등록 데이터' 시트 구조)
+
+    schools/majors/regions는 {값: 가중치}로 분포를 지정하며, 생략하면 균등 분포입니다.
+    학교 수(school_count)를 생략하면 조원 수에 맞춰 조 수를 넘지 않는 인원이 되도록 정합니다.
+    """
+    if scenario not in SCENARIOS:
+        raise ValueError(f"알 수 없는 시나리오입니다: {scenario} (가능: {', '.join(SCENARIOS)})")
+    rng = rng or random.Random(seed)
+
+    if school_count is None:
+        # 학교당 평균 인원이 조 수의 절반 정도가 되도록 (같은 학교 금지 조건을 만족할 여지를 둠)
+        school_count = max(len(SCHOOLS), -(-2 * members // max(groups, 1)))
+    names = school_names(school_count)
+    if schools is None and scenario == 'school_heavy':
+        # 가장 큰 두 학교는 조 수와 같거나 조금 적은 인원 (모든 조에 한 명씩 들어가야 함)
+        rest = max(members - 2 * groups, 1) / max(len(names) - 2, 1)
+        schools = {name: rest for name in names[2:]}
+        schools[names[0]] = groups
+        schools[names[1]] = groups * 0.9
+
+    school_values = _weighted(rng, schools, names, members)
+    major_values = _weighted(rng, majors, MAJORS, members)
+    region_values = _weighted(rng, regions, REGIONS, members)
+
+    rows = []
+    for i in range(members):
+        number = i + 1
+        major = major_values[i]
+        if number <= members * 2 // 7:
+            # 의대 24/25학번 분리 테스트를 위한 특별 케이스 (예전 샘플과 같이 35명 중 10명 비율)
+            major, year, grade = '의', ('25', '24')[number % 2], ('예과1', '예과2')[number % 2]
+        elif scenario == 'cohort_heavy' and rng.random() < 0.5:
+            major, year = '의', rng.choice(('24', '25'))
+            grade = '예과1' if year == '25' else '예과2'
+        else:
+            year = str(rng.randint(23, 25))
+            grade = rng.choice(GRADES)
+        if scenario == 'age_heavy' and rng.random() < 0.5:
+            age = rng.randint(age_range[1] - 5, age_range[1])
         else:
-            major = random.choice(['의', '치', '한', '간호', '약', '물리', '임상'])
-            year = f'{random.randint(23, 25)}'
-            grade = random.choice(['예과1', '예과2', '본1', '본2', '본3'])
-        
-        members_data.append({
-            '번호': i,
-            '이름': f'조원{i}',
-            '성별': random.choice(['남', '여']),
-            '지역': random.choice(['충북천안', '서울', '부산', '대구', '인천', '광주', '대전', '강원', '제주']),
-            '캠퍼스': random.choice([
-                '충북대', '서울대', '연세대', '고려대', '성균관대',
-                '부산대', '경남대', '대구대', '경북대',
-                '인천대', '경기대', '광주대', '전남대',
-                '대전대', '충남대', '강원대', '제주대'
-            ]),
+            age = rng.randint(*age_range)
+
+        rows.append({
+            '번호': number,
+            '이름': f'조원{number}',
+            '성별': '남' if rng.random() < male_ratio else '여',
+            '지역': region_values[i],
+            '캠퍼스': school_values[i],
             '트랙': 'EBS',
             '참가유형': '일반참',
             '학과': major,
             '학년': grade,
             '학번': year,
             '졸업년도': '-',
-            '나이': f'{random.randint(20, 30)}세',
-            '연락처': f'010{random.randint(10000000, 99999999)}',
+            '나이': f'{age}세',
+            '연락처': f'010{rng.randint(10000000, 99999999)}',
             '참가일정': '월, 화, 수, 목, 금',
             '기숙사사용여부': '사용',
-            '은행명': random.choice(['하나은행', '신한은행', '국민은행', '우리은행']),
-            '계좌번호': f'{random.randint(100000000000000, 999999999999999)}',
-            '예금주': f'조원{i}',
+            '은행명': rng.choice(('하나은행', '신한은행', '국민은행', '우리은행')),
+            '계좌번호': f'{rng.randint(100000000000000, 999999999999999)}',
+            '예금주': f'조원{number}',
             '결제금액': 220000,
             '상태': '승인됨',
             '등록일': '2025.7.15. 14:50'
         })
-    
-    df_members = pd.DataFrame(members_data)
-    df_members.to_excel('real_members.xlsx', sheet_name='등록 데이터', index=False)
-    print("실제 구조 조원 데이터 생성 완료: real_members.xlsx")
+    return pd.DataFrame(rows)
+
+def generate_rosters(members: int = 35, groups: Optional[int] = None, scenario: str = 'balanced',
+                     seed: Optional[int] = None, **member_options) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """(조장/헬퍼, 조원) 명단 생성 (groups를 생략하면 조당 조원 7명 기준)"""
+    if groups is None:
+        groups = max(1, round(members / 7))
+    rng = random.Random(seed)
+    member_max_age = member_options.get('age_range', (20, 30))[1]
+    leaders = generate_leaders(groups, scenario, member_max_age=member_max_age, rng=rng)
+    return leaders, generate_members(members, groups, scenario, rng=rng, **member_options)
+
+def save_rosters(leaders: pd.DataFrame, members: pd.DataFrame, out_dir: str = '.', fmt: str = 'xlsx',
+                 prefix: str = 'real') -> Tuple[str, str]:
+    """명단을 파일로 저장하고 (조장/헬퍼 경로, 조원 경로) 반환 (fmt: xlsx, csv, parquet)"""
+    os.makedirs(out_dir, exist_ok=True)
+    leaders_path = os.path.join(out_dir, f'{prefix}_leaders.{fmt}')
+    members_path = os.path.join(out_dir, f'{prefix}_members.{fmt}')
+    if fmt == 'xlsx':
+        leaders.to_excel(leaders_path, sheet_name='Sheet1', index=False)
+        members.to_excel(members_path, sheet_name='등록 데이터', index=False)
+    elif fmt == 'csv':
+        leaders.to_csv(leaders_path, index=False, encoding='utf-8-sig')
+        members.to_csv(members_path, index=False, encoding='utf-8-sig')
+    elif fmt == 'parquet':
+        leaders.astype(str).to_parquet(leaders_path, index=False)
+        members.astype(str).to_parquet(members_path, index=False)
+    else:
+        raise ValueError(f"지원하지 않는 형식입니다: {fmt} (가능: xlsx, csv, parquet)")
+    return leaders_path, members_path
+
+def main():
+    parser = argparse.ArgumentParser(description="조 배정 샘플/합성 명단 생성")
+    parser.add_argument('--members', type=int, default=35, help="조원 수 (기본값: 35)")
+    parser.add_argument('--groups', type=int, default=None, help="조 수 (기본값: 조당 조원 7명 기준)")
+    parser.add_argument('--scenario', choices=list(SCENARIOS), default='balanced',
+                        help="명단 시나리오: " + ", ".join(f"{name}({description})" for name, description in SCENARIOS.items()))
+    parser.add_argument('--schools', type=int, default=None, help="학교 수 (기본값: 조원/조 수에 맞춰 자동)")
+    parser.add_argument('--school-weights', type=parse_weights, default=None, metavar='학교=가중치,...',
+                        help="학교 분포 (예: 서울대=3,연세대=1, 지정하면 --schools와 시나리오의 학교 분포 대신 사용)")
+    parser.add_argument('--major-weights', type=parse_weights, default=None, metavar='학과=가중치,...',
+                        help=f"학과 분포 (예: 의=2,간호=1, 기본값: {'/'.join(MAJORS)} 균등)")
+    parser.add_argument('--region-weights', type=parse_weights, default=None, metavar='지역=가중치,...',
+                        help=f"지역 분포 (예: 서울=3,부산=1, 기본값: {'/'.join(REGIONS)} 균등)")
+    parser.add_argument('--male-ratio', type=float, default=0.5, help="남성 비율 (기본값: 0.5)")
+    parser.add_argument('--min-age', type=int, default=20, help="조원 최소 나이 (기본값: 20)")
+    parser.add_argument('--max-age', type=int, default=30, help="조원 최대 나이 (기본값: 30)")
+    parser.add_argument('--seed', type=int, default=None, help="난수 seed (같은 seed로 같은 명단 생성)")
+    parser.add_argument('--format', choices=('xlsx', 'csv', 'parquet'), default='xlsx', help="저장 형식 (기본값: xlsx)")
+    parser.add_argument('--out-dir', default='.', help="저장 폴더 (기본값: 현재 폴더)")
+    parser.add_argument('--prefix', default='real', help="파일 이름 앞부분 (기본값: real)")
+    args = parser.parse_args()
 
-if __name__ == '__main__':
     print("실제 데이터 구조 샘플 데이터 생성 중...")
-    create_real_leader_data()
-    create_real_member_data()
-    print("모든 실제 구조 샘플 데이터 생성 완료!") 
\ No newline at end of file
+    leaders, members = generate_rosters(args.members, args.groups, args.scenario, args.seed,
+                                        school_count=args.schools, schools=args.school_weights,
+                                        majors=args.major_weights, regions=args.region_weights,
+                                        male_ratio=args.male_ratio,
+                                        age_range=(args.min_age, args.max_age))
+    leaders_path, members_path = save_rosters(leaders, members, args.out_dir, args.format, args.prefix)
+    print(f"조장/헬퍼 {len(leaders)}명: {leaders_path}")
+    print(f"조원 {len(members)}명: {members_path}")
+    print("모든 실제 구조 샘플 데이터 생성 완료!")
+
+if __name__ == '__main__':
+    main()
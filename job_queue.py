@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+조 배정 백그라운드 작업 큐
+무거운 조 배정을 HTTP 요청 밖의 작업 프로세스에서 실행하고 상태를 조회할 수 있게 합니다.
+"""
+
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, Optional
+
+JOB_WORKERS = int(os.environ.get('JOB_WORKERS', 2))
+JOB_RETENTION = 60 * 60  # 끝난 작업을 작업표에 남겨 두는 시간 (초)
+
+JOB_STATES = ('queued', 'running', 'done', 'failed')
+
+class JobQueue:
+    """작업 프로세스 수가 제한된 조 배정 작업 큐
+
+    submit한 작업은 'queued'로 시작해 작업 함수가 실행을 시작하면 'running', 함수가
+    {'success': True, ...}를 반환하면 'done', 실패를 반환하거나 예외가 나면 'failed'가 됩니다.
+    실행 시작은 started(job)이 돌려주는 시작 시각(작업 함수가 남긴 표시, 아직이면 None)으로 판단합니다.
+    Future.running()은 작업 프로세스 호출 대기열에 올라간 작업에도 True라서 쓰지 않습니다.
+    작업 프로세스가 비정상 종료되면(메모리 부족으로 강제 종료 등) 그 풀의 작업은 모두 'failed'가 되고,
+    망가진 풀은 버린 뒤 다음 작업부터 새 풀에서 실행합니다.
+    작업표는 이 프로세스 메모리에 있으며 끝난 작업은 JOB_RETENTION초 뒤에 정리됩니다.
+    on_finish(job, result)를 주면 작업이 끝날 때마다 이 프로세스에서 호출합니다
+    (result는 함수의 반환값, 예외로 끝났으면 None).
+    """
+
+    def __init__(self, max_workers: int = JOB_WORKERS,
+                 on_finish: Optional[Callable[[Dict, Optional[Dict]], None]] = None,
+                 started: Optional[Callable[[Dict], Optional[float]]] = None):
+        self.max_workers = max_workers
+        self.on_finish = on_finish
+        self.started = started
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._jobs: Dict[str, Dict] = {}
+        self._futures: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def _pool(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    def _discard(self, pool: ProcessPoolExecutor):
+        """작업 프로세스가 죽어 망가진 풀을 버림 (다음 _pool()이 새 풀을 만듦, lock을 잡은 상태에서 호출)"""
+        if self._executor is pool:
+            self._executor = None
+            pool.shutdown(wait=False)
+
+    def submit(self, session_id: str, fn: Callable, *args, **kwargs) -> str:
+        """작업을 큐에 넣고 작업 ID 반환 (fn은 작업 프로세스에서 실행되므로 모듈 최상위 함수여야 함)"""
+        job_id = uuid.uuid4().hex
+        job = {
+            'id': job_id,
+            'session_id': session_id,
+            'status': 'queued',
+            'error': None,
+            'created_at': time.time(),
+            'started_at': None,
+            'finished_at': None,
+        }
+        with self._lock:
+            self._prune()
+            self._jobs[job_id] = job
+            pool = self._pool()
+            try:
+                future = pool.submit(fn, *args, **kwargs)
+            except BrokenProcessPool:
+                # 이전 작업 중 작업 프로세스가 죽어 풀이 망가졌으면 새 풀에 다시 제출
+                self._discard(pool)
+                pool = self._pool()
+                future = pool.submit(fn, *args, **kwargs)
+            self._futures[job_id] = future
+        future.add_done_callback(lambda done, job_id=job_id, pool=pool: self._finish(job_id, done, pool))
+        return job_id
+
+    def _finish(self, job_id: str, future: Future, pool: ProcessPoolExecutor):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return
+            self._refresh(job)
+            job['finished_at'] = time.time()
+            job['started_at'] = job['started_at'] or job['finished_at']
+            try:
+                result = future.result()
+            except BrokenProcessPool:
+                result = None
+                job['status'] = 'failed'
+                job['error'] = '작업 프로세스가 비정상 종료되었습니다 (메모리 부족 등). 다시 시도해주세요.'
+                self._discard(pool)
+            except Exception as e:
+                result = None
+                job['status'] = 'failed'
+                job['error'] = str(e)
+            else:
+                if result.get('success'):
+                    job['status'] = 'done'
+                else:
+                    job['status'] = 'failed'
+                    job['error'] = result.get('error', '알 수 없는 오류')
+            self._futures.pop(job_id, None)
+            finished = dict(job)
+        if self.on_finish is not None:
+            self.on_finish(finished, result)
+
+    def _prune(self):
+        """오래전에 끝난 작업을 작업표에서 제거 (lock을 잡은 상태에서 호출)"""
+        cutoff = time.time() - JOB_RETENTION
+        for job_id in [job_id for job_id, job in self._jobs.items()
+                       if job['finished_at'] is not None and job['finished_at'] < cutoff]:
+            del self._jobs[job_id]
+
+    def _refresh(self, job: Dict):
+        """시작 표시가 있는 대기 작업을 'running'으로 표시 (lock을 잡은 상태에서 호출)"""
+        if job['status'] != 'queued' or self.started is None:
+            return
+        started_at = self.started(job)
+        if started_at is not None:
+            job['status'] = 'running'
+            job['started_at'] = started_at
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        """작업 상태 사본 (없는 작업이면 None)"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            self._refresh(job)
+            return dict(job)
+
+    def counts(self) -> Dict[str, int]:
+        """상태별 작업 수 (작업표에 남아 있는 작업 기준)"""
+        with self._lock:
+            counts = {state: 0 for state in JOB_STATES}
+            for job in self._jobs.values():
+                self._refresh(job)
+                counts[job['status']] += 1
+            return counts
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
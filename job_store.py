@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+조 배정 세션 저장소
+세션(작업)마다 겹치지 않는 ID와 업로드/결과 폴더를 만들고, 결과 파일을 원자적으로 씁니다.
+여러 요청이 같은 초에 들어오거나 여러 작업 프로세스가 동시에 써도 서로의 결과를 덮어쓰지 않습니다.
+"""
+
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+import uuid
+import weakref
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable, Dict, Iterator, Optional
+
+import pandas as pd
+
+from result_export import write_csv
+
+try:
+    import fcntl  # POSIX: 프로세스 간 파일 잠금
+except ImportError:  # Windows 등에서는 프로세스 안 잠금만 사용
+    fcntl = None
+
+# 20250101_120000_1a2b3c4d (예전 형식 20250101_120000도 읽기는 허용)
+SESSION_ID_PATTERN = re.compile(r'^\d{8}_\d{6}(_[0-9a-f]{8})?$')
+
+LOCK_FILENAME = '.lock'
+PROGRESS_FILENAME = 'progress.json'
+STOP_FILENAME = '.stop'
+
+def atomic_write(path: str, write: Callable[[str], None]):
+    """같은 폴더의 임시 파일에 write(임시 경로)로 쓴 뒤 이름을 바꿔 path를 한 번에 교체
+
+    읽는 쪽은 항상 이전 파일 또는 완성된 새 파일만 보게 됩니다.
+    """
+    folder = os.path.dirname(path) or '.'
+    fd, tmp_path = tempfile.mkstemp(dir=folder, prefix='.' + os.path.basename(path) + '.', suffix='.tmp')
+    os.close(fd)
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+def write_csv_atomic(df: pd.DataFrame, path: str, **kwargs):
+    """DataFrame을 CSV로 원자적으로 저장 (기본: index 없이 utf-8-sig, result_export.write_csv로 행을 나눠 씀)"""
+    atomic_write(path, lambda tmp_path: write_csv(df, tmp_path, **kwargs))
+
+def write_json_atomic(data: Dict, path: str, indent: Optional[int] = 2):
+    """dict를 JSON으로 원자적으로 저장 (indent=None이면 공백 없이 한 줄로)"""
+    separators = (',', ':') if indent is None else None
+    def write(tmp_path):
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=indent, separators=separators)
+    atomic_write(path, write)
+
+class JobStore:
+    """세션별 업로드/결과 폴더 관리
+
+    new_session()은 타임스탬프 뒤에 무작위 8자리를 붙인 ID를 만들고, 결과 폴더를
+    exist_ok=False로 만들어 ID를 선점합니다 (드물게 겹치면 새 ID로 다시 시도).
+    lock(session_id)은 같은 세션에 쓰는 작업을 하나씩 실행하게 합니다 (프로세스 안에서는
+    threading.Lock, POSIX에서는 결과 폴더의 .lock 파일에 flock도 함께 잡음).
+    세션별 threading.Lock은 WeakValueDictionary에 두므로 그 세션을 잠근 작업이 모두 끝나면 사라집니다.
+    """
+
+    def __init__(self, upload_folder: str = 'uploads', result_folder: str = 'results'):
+        self.upload_folder = upload_folder
+        self.result_folder = result_folder
+        self._locks: 'weakref.WeakValueDictionary[str, threading.Lock]' = weakref.WeakValueDictionary()
+        self._locks_lock = threading.Lock()
+        os.makedirs(upload_folder, exist_ok=True)
+        os.makedirs(result_folder, exist_ok=True)
+
+    def new_session(self) -> str:
+        """겹치지 않는 세션 ID를 만들고 결과 폴더를 선점"""
+        while True:
+            session_id = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
+            try:
+                os.makedirs(os.path.join(self.result_folder, session_id))
+            except FileExistsError:
+                continue
+            return session_id
+
+    @staticmethod
+    def is_valid_id(session_id: str) -> bool:
+        """URL 등 외부에서 받은 세션 ID가 저장소 형식인지 (경로 조작 방지)"""
+        return bool(SESSION_ID_PATTERN.match(session_id or ''))
+
+    def _folder(self, root: str, session_id: str) -> str:
+        if not self.is_valid_id(session_id):
+            raise ValueError(f"잘못된 세션 ID입니다: {session_id}")
+        return os.path.join(root, session_id)
+
+    def upload_dir(self, session_id: str) -> str:
+        """세션의 업로드 폴더 (없으면 생성)"""
+        folder = self._folder(self.upload_folder, session_id)
+        os.makedirs(folder, exist_ok=True)
+        return folder
+
+    def result_dir(self, session_id: str) -> str:
+        """세션의 결과 폴더 경로 (생성하지 않음)"""
+        return self._folder(self.result_folder, session_id)
+
+    def result_path(self, session_id: str, filename: str) -> str:
+        return os.path.join(self.result_dir(session_id), filename)
+
+    def load_result(self, session_id: str) -> Optional[Dict]:
+        """예전 형식 result.json 내용 (없거나 잘못된 ID면 None, 새 결과는 result_store.ResultReader로 읽음)"""
+        if not self.is_valid_id(session_id):
+            return None
+        try:
+            with open(self.result_path(session_id, 'result.json'), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def write_progress(self, session_id: str, event: Dict):
+        """작업 프로세스가 보고한 진행 상황 저장 (웹 프로세스가 읽어 SSE로 전달)"""
+        write_json_atomic(event, self.result_path(session_id, PROGRESS_FILENAME))
+
+    def read_progress(self, session_id: str) -> Optional[Dict]:
+        """마지막 진행 상황 (아직 없으면 None)"""
+        try:
+            with open(self.result_path(session_id, PROGRESS_FILENAME), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def mark_started(self, session_id: str, total: int = 0) -> float:
+        """작업 프로세스가 작업을 시작했다는 진행 상황을 쓰고 시작 시각을 반환
+
+        이후 진행 상황에도 같은 'started_at'을 넣어 쓰면 started_at()으로 시작 여부와 시각을 알 수 있습니다.
+        """
+        started_at = time.time()
+        self.write_progress(session_id, {'phase': 'started', 'phase_name': '작업 시작', 'placed': 0, 'total': total,
+                                         'current': 0.0, 'best': 0.0, 'elapsed': 0.0, 'fraction': 0.0,
+                                         'started_at': started_at})
+        return started_at
+
+    def started_at(self, session_id: str) -> Optional[float]:
+        """작업 프로세스가 기록한 시작 시각 (아직 시작하지 않았으면 None)"""
+        progress = self.read_progress(session_id)
+        return progress.get('started_at') if progress else None
+
+    def request_stop(self, session_id: str):
+        """조기 종료 요청 (작업 프로세스가 다음 진행 보고 때 확인)"""
+        with open(self.result_path(session_id, STOP_FILENAME), 'w'):
+            pass
+
+    def stop_requested(self, session_id: str) -> bool:
+        return os.path.exists(self.result_path(session_id, STOP_FILENAME))
+
+    @contextmanager
+    def lock(self, session_id: str) -> Iterator[str]:
+        """세션 결과 폴더를 잠그고 그 경로를 넘겨줌"""
+        folder = self.result_dir(session_id)
+        os.makedirs(folder, exist_ok=True)
+        with self._locks_lock:
+            thread_lock = self._locks.setdefault(session_id, threading.Lock())
+        with thread_lock:
+            if fcntl is None:
+                yield folder
+                return
+            with open(os.path.join(folder, LOCK_FILENAME), 'w') as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield folder
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+조 배정 결과 캐시
+명단 내용, 배정 설정(인원 범위, 성비 차이, 엔진, 시간 제한), seed를 합친 SHA-256을 키로
+배정 결과, 요약 보고서, 조별 통계를 저장합니다. 같은 명단을 같은 설정과 seed로 다시 제출하면
+solve_groups를 다시 실행하지 않고 저장된 결과를 돌려줍니다.
+seed 없이 실행한 배정은 실행마다 결과가 달라지므로 캐시에서 찾지 않고, 실제로 쓴 seed(AssignmentResult.seed)를
+키로 저장해 두어 그 seed로 다시 제출하면 재사용합니다.
+Flask(app.py)와 Streamlit(streamlit_app.py)이 results/ 아래의 같은 캐시 폴더를 공유합니다.
+"""
+
+import copy
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import uuid
+from collections import OrderedDict
+from typing import Dict, Optional
+
+import pandas as pd
+
+from job_store import write_json_atomic
+
+CACHE_FOLDER = os.environ.get('RESULT_CACHE_DIR', os.path.join('results', 'cache'))
+CACHE_MAX_BYTES = int(os.environ.get('RESULT_CACHE_MAX_MB', 256)) * 1024 * 1024
+MEMORY_ENTRIES = 16
+
+# 배정 알고리즘이나 저장 형식이 바뀌면 올려서 예전 결과를 무시
+CACHE_VERSION = 2
+
+ASSIGNMENT_FILENAME = 'assignment.parquet'
+SUMMARY_FILENAME = 'summary.parquet'
+GROUPS_FILENAME = 'groups.json'
+
+def roster_digest(df: pd.DataFrame) -> str:
+    """파싱된 명단 DataFrame 내용의 SHA-256 (열 이름, 행 순서 포함)"""
+    digest = hashlib.sha256(json.dumps([str(column) for column in df.columns], ensure_ascii=False).encode('utf-8'))
+    digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+def result_key(leaders: pd.DataFrame, members: pd.DataFrame, min_members: int, max_members: int,
+               max_gender_diff: int = 1, engine: str = 'greedy', time_limit: float = 10.0,
+               seed: Optional[int] = None) -> Optional[str]:
+    """결과 캐시 키 (seed는 배정에 실제로 쓴 seed, None이면 재현할 수 없는 배정이라 키 없이 None)"""
+    if seed is None:
+        return None
+    params = {
+        'version': CACHE_VERSION,
+        'leaders': roster_digest(leaders),
+        'members': roster_digest(members),
+        'min_members': int(min_members),
+        'max_members': int(max_members),
+        'max_gender_diff': int(max_gender_diff),
+        'engine': engine,
+        # greedy는 시간 제한을 쓰지 않으므로 키에서 제외
+        'time_limit': None if engine == 'greedy' else float(time_limit),
+        'seed': int(seed),
+    }
+    return hashlib.sha256(json.dumps(params, sort_keys=True).encode('utf-8')).hexdigest()
+
+class ResultCache:
+    """조 배정 결과 캐시 (메모리 LRU + 용량 제한 디스크 캐시)
+
+    항목은 {'assignment': 배정 결과 DataFrame, 'summary': 요약 보고서 DataFrame,
+    'groups': 조 번호별 조장/헬퍼/조원과 'stats'(AssignmentResult.groups)} 형식입니다.
+    디스크에는 키마다 폴더 하나(assignment.parquet, summary.parquet, groups.json)를 임시 폴더에
+    쓴 뒤 이름을 바꿔 만들므로 여러 프로세스가 동시에 써도 반쯤 쓰인 항목을 읽지 않습니다.
+    읽을 때마다 폴더 수정 시각을 갱신하고, 전체 크기가 max_bytes를 넘으면 가장 오래 쓰지 않은 항목부터 지웁니다.
+    """
+
+    def __init__(self, folder: str = CACHE_FOLDER, max_bytes: int = CACHE_MAX_BYTES,
+                 memory_entries: int = MEMORY_ENTRIES):
+        self.folder = folder
+        self.max_bytes = max_bytes
+        self.memory_entries = memory_entries
+        self._memory: 'OrderedDict[str, Dict]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(folder, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.folder, key)
+
+    def _remember(self, key: str, entry: Dict):
+        with self._lock:
+            self._memory[key] = entry
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+
+    @staticmethod
+    def _copy(entry: Dict) -> Dict:
+        return {
+            'assignment': entry['assignment'].copy(),
+            'summary': entry['summary'].copy(),
+            'groups': copy.deepcopy(entry['groups']),
+        }
+
+    def get(self, key: str) -> Optional[Dict]:
+        """캐시에 있으면 결과 항목(복사본)을, 없으면 None을 반환"""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return self._copy(entry)
+
+        path = self._path(key)
+        try:
+            entry = {
+                'assignment': pd.read_parquet(os.path.join(path, ASSIGNMENT_FILENAME)),
+                'summary': pd.read_parquet(os.path.join(path, SUMMARY_FILENAME)),
+            }
+            with open(os.path.join(path, GROUPS_FILENAME), 'r', encoding='utf-8') as f:
+                entry['groups'] = json.load(f)
+            os.utime(path)  # LRU: 최근 사용 시각 갱신
+        except (FileNotFoundError, OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        self._remember(key, entry)
+        return self._copy(entry)
+
+    def put(self, key: str, assignment: pd.DataFrame, summary: pd.DataFrame, groups: Dict):
+        """결과를 디스크와 메모리에 저장하고 용량을 넘으면 오래된 항목 삭제"""
+        entry = {'assignment': assignment.copy(), 'summary': summary.copy(), 'groups': copy.deepcopy(groups)}
+        self._remember(key, entry)
+        tmp_path = tempfile.mkdtemp(dir=self.folder, prefix='.tmp-')
+        try:
+            assignment.to_parquet(os.path.join(tmp_path, ASSIGNMENT_FILENAME), index=False)
+            summary.to_parquet(os.path.join(tmp_path, SUMMARY_FILENAME), index=False)
+            write_json_atomic(groups, os.path.join(tmp_path, GROUPS_FILENAME))
+            # 새로 배정한 결과로 갱신할 때는 이전 항목을 옆으로 옮긴 뒤 교체
+            stale_path = os.path.join(self.folder, f".old-{uuid.uuid4().hex}")
+            try:
+                os.rename(self._path(key), stale_path)
+            except FileNotFoundError:
+                stale_path = None
+            try:
+                os.replace(tmp_path, self._path(key))
+            except OSError:
+                # 그 사이 다른 프로세스가 같은 키를 저장함 (그 결과를 그대로 사용)
+                shutil.rmtree(tmp_path, ignore_errors=True)
+            if stale_path is not None:
+                shutil.rmtree(stale_path, ignore_errors=True)
+        except Exception:
+            shutil.rmtree(tmp_path, ignore_errors=True)
+            raise
+        self.evict()
+
+    def evict(self):
+        """디스크 캐시 전체 크기가 max_bytes 이하가 될 때까지 오래된 항목부터 삭제"""
+        entries = []
+        for name in os.listdir(self.folder):
+            path = os.path.join(self.folder, name)
+            if name.startswith('.') or not os.path.isdir(path):
+                continue
+            try:
+                mtime = os.stat(path).st_mtime
+                size = sum(entry.stat().st_size for entry in os.scandir(path))
+            except FileNotFoundError:
+                continue
+            entries.append((mtime, size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+
+_default_cache: Optional[ResultCache] = None
+_default_lock = threading.Lock()
+
+def get_result_cache() -> ResultCache:
+    """프로세스 전체에서 공유하는 기본 캐시 (CACHE_FOLDER, CACHE_MAX_BYTES)"""
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = ResultCache()
+        return _default_cache
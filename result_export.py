@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+조 배정 결과 내보내기
+배정 결과(조원 행 위치 + 조 번호 배열)를 원본 명단에 열 단위로 붙여 결과 표를 만들고,
+CSV는 일정한 행 수씩 나눠 쓰고 XLSX는 openpyxl write-only 모드로 행을 흘려 써서
+명단이 커져도 내보내기 시간과 최대 메모리가 행 수에 비례하는 정도로 유지되게 합니다.
+camp_group_assignment(AssignmentResult), job_store(write_csv_atomic), streamlit_app.py가 사용합니다.
+"""
+
+import io
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
+
+# 결과 DataFrame 열 순서 (조장/헬퍼는 '학교', 조원은 '지역'만 있고 나머지는 빈 값)
+RESULT_COLUMNS = ('조 번호', '역할', '이름', '학과', '학번', '나이', '학교', '성별', '전화번호', '트랙', '지역')
+
+# 결과 열 ← 조장/헬퍼 명단 열
+STAFF_COLUMNS = {'이름': '이름', '학과': '학과', '학번': '학번', '나이': '나이', '학교': '학교/학년',
+                 '성별': '성별', '전화번호': '연락처'}
+# 결과 열 ← 조원 명단 열
+MEMBER_COLUMNS = {'이름': '이름', '학과': '학과', '학번': '학번', '나이': '나이', '지역': '지역',
+                  '성별': '성별', '전화번호': '연락처', '트랙': '트랙'}
+DEFAULTS = {'이름': '', '학과': '', '학번': '', '나이': 0, '학교': '', '지역': '', '성별': '', '전화번호': '',
+            '트랙': 'EBS'}
+
+# 상세정보 시트 열 순서 (조장/헬퍼의 학교와 조원의 지역을 '학교/지역' 한 열로 합침)
+DETAIL_COLUMNS = ('조 번호', '역할', '이름', '성별', '나이', '학과', '학교/지역', '전화번호', '학번', '트랙')
+
+CSV_CHUNK_ROWS = 10000
+XLSX_CHUNK_ROWS = 5000
+
+def assignment_frame(staff: List[Dict], members: pd.DataFrame, member_rows: np.ndarray,
+                     member_numbers: Sequence, member_groups: np.ndarray) -> pd.DataFrame:
+    """조 배정 결과 DataFrame (조 순서대로 조장, 헬퍼, 조원)
+
+    staff는 조 순서대로 조장, 헬퍼 명단 행 dict를 번갈아 담은 목록이고, member_rows는 배정 순서대로의
+    조원 명단 행 위치, member_numbers/member_groups는 각 조원의 조 번호와 조 순서(0부터)입니다.
+    조원 열은 원본 명단에서 행 위치로 한 번에 꺼냅니다.
+    """
+    group_count = len(staff) // 2
+    staff_df = pd.DataFrame({
+        '조 번호': [row['조 번호'] for row in staff],
+        '역할': ['조장', '헬퍼'] * group_count,
+        **{column: [row.get(source, DEFAULTS[column]) for row in staff]
+           for column, source in STAFF_COLUMNS.items()},
+        '트랙': 'EBS',
+    })
+    member_df = pd.DataFrame({
+        '조 번호': pd.Series(member_numbers, dtype=object),
+        '역할': '조원',
+        **{column: (members[source].take(member_rows).reset_index(drop=True) if source in members.columns
+                    else DEFAULTS[column])
+           for column, source in MEMBER_COLUMNS.items()},
+    })
+    # 조별로 조장, 헬퍼, 조원 순서가 되도록 (조 순서, 구분)으로 안정 정렬
+    group_keys = np.concatenate([np.repeat(np.arange(group_count), 2), member_groups])
+    role_keys = np.concatenate([np.tile([0, 1], group_count), np.full(len(member_rows), 2)])
+    order = np.lexsort((role_keys, group_keys))
+    df = pd.concat([staff_df, member_df], ignore_index=True).take(order).reset_index(drop=True)
+    df = df.infer_objects()
+    return df[[column for column in RESULT_COLUMNS if column in df.columns]]
+
+def group_records(df_assigned: pd.DataFrame, stats: Dict) -> Dict[str, Dict]:
+    """결과 DataFrame → 조 번호별 {'조 번호', 'leader', 'helper', 'members', 'stats'} (JSON으로 저장 가능한 값)
+
+    조장/헬퍼 행에는 '지역'이, 조원 행에는 '학교'가 들어가지 않습니다.
+    """
+    staff_columns = [column for column in df_assigned.columns if column != '지역']
+    member_columns = [column for column in df_assigned.columns if column != '학교']
+    roles = df_assigned['역할'].to_numpy()
+    staff_records = df_assigned.loc[roles != '조원', staff_columns].to_dict('records')
+    member_records = df_assigned.loc[roles == '조원', member_columns].to_dict('records')
+
+    groups = {}
+    for record in staff_records:
+        group = groups.setdefault(record['조 번호'], {'조 번호': record['조 번호'], 'leader': None,
+                                                    'helper': None, 'members': []})
+        group['leader' if record['역할'] == '조장' else 'helper'] = record
+    for record in member_records:
+        groups[record['조 번호']]['members'].append(record)
+    for number, group in groups.items():
+        group['stats'] = stats[number]
+    return groups
+
+def detail_frame(df_assigned: pd.DataFrame) -> pd.DataFrame:
+    """상세정보 시트 (조장/헬퍼는 학교, 조원은 지역을 '학교/지역'으로)"""
+    staff = df_assigned['역할'].isin(['조장', '헬퍼'])
+    school = df_assigned['학교'] if '학교' in df_assigned.columns else pd.Series('', index=df_assigned.index)
+    region = df_assigned['지역'] if '지역' in df_assigned.columns else pd.Series('', index=df_assigned.index)
+    detail = pd.DataFrame({column: df_assigned[column] if column in df_assigned.columns else DEFAULTS[column]
+                           for column in DETAIL_COLUMNS if column != '학교/지역'}, index=df_assigned.index)
+    detail['학교/지역'] = school.where(staff, region)
+    return detail[list(DETAIL_COLUMNS)]
+
+def write_csv(df: pd.DataFrame, path_or_buffer, chunk_rows: int = CSV_CHUNK_ROWS, **kwargs):
+    """CSV를 chunk_rows행씩 나눠 쓰기 (기본: index 없이 utf-8-sig)"""
+    kwargs.setdefault('index', False)
+    kwargs.setdefault('encoding', 'utf-8-sig')
+    df.to_csv(path_or_buffer, chunksize=chunk_rows, **kwargs)
+
+def csv_bytes(df: pd.DataFrame, chunk_rows: int = CSV_CHUNK_ROWS) -> bytes:
+    """utf-8-sig CSV 파일 내용"""
+    buffer = io.BytesIO()
+    write_csv(df, buffer, chunk_rows)
+    return buffer.getvalue()
+
+def _cell_values(chunk: pd.DataFrame):
+    """chunk의 각 행을 openpyxl이 쓸 수 있는 값 튜플로 (빈 값은 None, dict/list 등은 문자열)"""
+    values = chunk.astype(object)
+    values = values.where(chunk.notna(), None)
+    for row in values.itertuples(index=False, name=None):
+        yield tuple(value if value is None or isinstance(value, (str, int, float, bool, np.generic))
+                    else str(value) for value in row)
+
+def write_xlsx(sheets: Dict[str, pd.DataFrame], path_or_buffer, chunk_rows: int = XLSX_CHUNK_ROWS):
+    """시트 이름 → DataFrame을 XLSX로 저장
+
+    openpyxl write-only 통합 문서에 chunk_rows행씩 변환해 흘려 쓰므로 셀 객체를 한꺼번에 만들지 않습니다.
+    머리글은 pandas.to_excel처럼 굵게 씁니다.
+    """
+    workbook = Workbook(write_only=True)
+    bold = Font(bold=True)
+    for name, df in sheets.items():
+        sheet = workbook.create_sheet(title=name)
+        header = []
+        for column in df.columns:
+            cell = WriteOnlyCell(sheet, value=str(column))
+            cell.font = bold
+            header.append(cell)
+        sheet.append(header)
+        for start in range(0, len(df), chunk_rows):
+            for row in _cell_values(df.iloc[start:start + chunk_rows]):
+                sheet.append(row)
+    workbook.save(path_or_buffer)
+
+def result_workbook(df_assigned: pd.DataFrame, summary_df: pd.DataFrame,
+                    path_or_buffer: Optional[object] = None) -> Optional[bytes]:
+    """조배정결과, 조별요약, 상세정보 시트의 XLSX (path_or_buffer가 없으면 파일 내용을 반환)"""
+    sheets = {'조배정결과': df_assigned, '조별요약': summary_df, '상세정보': detail_frame(df_assigned)}
+    if path_or_buffer is not None:
+        write_xlsx(sheets, path_or_buffer)
+        return None
+    buffer = io.BytesIO()
+    write_xlsx(sheets, buffer)
+    return buffer.getvalue()
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+웹 결과 저장 형식
+세션 결과 폴더에 배정 결과 표(assignment.parquet, 조 순서대로 일정한 행 수의 row group으로 저장),
+조별 요약 보고서와 통계(summary.parquet, 조마다 한 행), 설정과 조 번호별 행 범위만 담은
+작은 JSON 헤더(result_header.json)를 씁니다.
+결과 화면과 API는 헤더와 보여 줄 조의 행 범위만 읽고, 읽은 내용은 파일 수정 시각으로 확인하는
+프로세스 안 LRU에 보관해 같은 결과를 다시 볼 때 파일을 다시 파싱하지 않습니다.
+"""
+
+import json
+import math
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+from job_store import JobStore, atomic_write, write_json_atomic
+from result_export import group_records
+
+HEADER_FILENAME = 'result_header.json'
+ASSIGNMENT_FILENAME = 'assignment.parquet'
+SUMMARY_FILENAME = 'summary.parquet'
+
+# 헤더 형식이 바뀌면 올림
+FORMAT_VERSION = 1
+ROW_GROUP_ROWS = 1024
+GROUPS_PER_PAGE = 50
+MEMORY_ENTRIES = 32
+
+def group_offsets(df_assigned: pd.DataFrame) -> Dict[str, List]:
+    """조 순서대로 조 번호와 결과 표 행 경계 (i번째 조는 offsets[i]~offsets[i + 1] 행)"""
+    numbers = df_assigned['조 번호'].to_numpy()
+    if len(numbers) == 0:
+        return {'numbers': [], 'offsets': [0]}
+    starts = np.concatenate([[0], np.flatnonzero(numbers[1:] != numbers[:-1]) + 1])
+    return {'numbers': [numbers[start] for start in starts],
+            'offsets': [int(start) for start in starts] + [len(numbers)]}
+
+def write_result(folder: str, header: Dict, df_assigned: pd.DataFrame, summary_df: pd.DataFrame,
+                 stats: Dict[str, Dict]):
+    """결과 표, 요약(Parquet)과 헤더(JSON)를 원자적으로 저장
+
+    header에는 설정 등을 담고, 조 번호별 행 경계는 여기서 'groups'로 추가합니다. stats(조 번호별 통계)는
+    요약 보고서의 'stats' 열(JSON 문자열)로 저장합니다. 헤더를 마지막에 쓰므로 헤더가 보이면 표도 완성되어 있습니다.
+    """
+    groups = group_offsets(df_assigned)
+    summary = summary_df.assign(stats=[json.dumps(stats[number], ensure_ascii=False)
+                                       for number in summary_df['조 번호']])
+    for filename, df in ((ASSIGNMENT_FILENAME, df_assigned), (SUMMARY_FILENAME, summary)):
+        atomic_write(os.path.join(folder, filename),
+                     lambda tmp_path, df=df: df.to_parquet(tmp_path, index=False, row_group_size=ROW_GROUP_ROWS))
+    write_json_atomic({**header, 'version': FORMAT_VERSION, 'groups': groups},
+                      os.path.join(folder, HEADER_FILENAME), indent=None)
+
+def read_rows(path: str, start: int, stop: int) -> pd.DataFrame:
+    """Parquet 파일의 [start, stop) 행 (그 범위가 걸친 row group만 읽음)"""
+    parquet = pq.ParquetFile(path)
+    indices = []
+    first = offset = 0
+    for index in range(parquet.num_row_groups):
+        rows = parquet.metadata.row_group(index).num_rows
+        if offset + rows > start and offset < stop:
+            if not indices:
+                first = offset
+            indices.append(index)
+        offset += rows
+    if not indices:
+        return parquet.schema_arrow.empty_table().to_pandas()
+    table = parquet.read_row_groups(indices)
+    return table.slice(start - first, stop - start).to_pandas()
+
+class ResultReader:
+    """세션 결과를 페이지 단위로 읽기 (파일 수정 시각으로 확인하는 LRU 캐시)
+
+    캐시 항목은 읽을 때의 (mtime_ns, 크기)와 함께 보관하고, 다시 배정해 파일이 바뀌면 새로 읽습니다.
+    result_header.json이 없는 예전 세션은 result.json 전체를 한 페이지로 보여 줍니다.
+    """
+
+    def __init__(self, store: JobStore, memory_entries: int = MEMORY_ENTRIES):
+        self.store = store
+        self.memory_entries = memory_entries
+        self._memory: 'OrderedDict[tuple, tuple]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _cached(self, key: tuple, paths: List[str], load: Callable[[], object]):
+        """paths가 마지막으로 읽었을 때와 같으면 캐시된 값, 아니면 load() 결과 (파일이 없으면 None)"""
+        try:
+            signature = tuple((stat.st_mtime_ns, stat.st_size) for stat in map(os.stat, paths))
+        except FileNotFoundError:
+            return None
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and entry[0] == signature:
+                self._memory.move_to_end(key)
+                return entry[1]
+        try:
+            value = load()
+        except FileNotFoundError:
+            return None
+        with self._lock:
+            self._memory[key] = (signature, value)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+        return value
+
+    def header(self, session_id: str) -> Optional[Dict]:
+        """결과 헤더 (설정, 조 번호별 행 경계; 없거나 잘못된 ID면 None)"""
+        if not self.store.is_valid_id(session_id):
+            return None
+        path = self.store.result_path(session_id, HEADER_FILENAME)
+
+        def load():
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        return self._cached(('header', session_id), [path], load)
+
+    def page(self, session_id: str, page: int = 1, per_page: int = GROUPS_PER_PAGE) -> Optional[Dict]:
+        """결과 화면 한 페이지 (per_page개 조의 조장/헬퍼/조원과 요약 행, 없으면 None)"""
+        header = self.header(session_id)
+        if header is None:
+            legacy = self.store.load_result(session_id)
+            if legacy is not None:
+                legacy.update(page=1, pages=1, per_page=len(legacy['groups']))
+            return legacy
+
+        numbers, offsets = header['groups']['numbers'], header['groups']['offsets']
+        pages = max(1, math.ceil(len(numbers) / per_page))
+        page = min(max(page, 1), pages)
+        first, last = (page - 1) * per_page, min(page * per_page, len(numbers))
+        paths = [self.store.result_path(session_id, filename)
+                 for filename in (HEADER_FILENAME, ASSIGNMENT_FILENAME, SUMMARY_FILENAME)]
+
+        def load():
+            # 이 페이지 조들의 결과 표 행과 요약 행만 읽음 (JSON API에서도 쓸 수 있게 빈 값은 None으로)
+            rows = read_rows(paths[1], offsets[first], offsets[last])
+            rows = rows.astype(object).where(rows.notna(), None)
+            summary = read_rows(paths[2], first, last)
+            stats = {number: json.loads(text) for number, text in zip(summary['조 번호'], summary['stats'])}
+            return (group_records(rows, stats) if len(rows) else {}), summary.drop(columns='stats').to_dict('records')
+        loaded = self._cached(('page', session_id, page, per_page), paths, load)
+        if loaded is None:
+            return None
+        groups, summary = loaded
+        return {
+            **{key: value for key, value in header.items() if key != 'groups'},
+            'groups': groups,
+            'summary': summary,
+            'page': page,
+            'pages': pages,
+            'per_page': per_page,
+        }
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+명단 파싱 결과 캐시
+업로드된 파일 내용의 SHA-256을 키로, 파싱한 명단과 조원 명단의 배정용 인코딩(MemberTable)을
+로컬 디스크에 Parquet으로 저장합니다. 같은 파일을 다시 올리거나 설정만 바꿔 다시 배정할 때는
+Excel을 다시 읽지 않고 학교/학과/지역도 다시 분류하지 않습니다.
+Flask(app.py), Streamlit(streamlit_app.py), CLI가 같은 캐시 폴더를 공유합니다.
+"""
+
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
+import pandas as pd
+
+from camp_group_assignment import MemberTable
+from roster_loader import load_leaders, load_members
+
+CACHE_FOLDER = os.environ.get('ROSTER_CACHE_DIR', os.path.join('cache', 'rosters'))
+CACHE_MAX_BYTES = int(os.environ.get('ROSTER_CACHE_MAX_MB', 256)) * 1024 * 1024
+MEMORY_ENTRIES = 16
+
+# 파싱/인코딩 방식(학교·학과·지역 분류 포함)이 바뀌면 올려서 예전 캐시 파일을 무시
+CACHE_VERSION = 1
+
+LOADERS: Dict[str, Callable[[str, str], pd.DataFrame]] = {
+    'leaders': load_leaders,
+    'members': load_members,
+}
+
+def file_digest(data: bytes) -> str:
+    """파일 내용의 SHA-256 (16진수)"""
+    return hashlib.sha256(data).hexdigest()
+
+class RosterCache:
+    """SHA-256 기반 명단 캐시 (메모리 LRU + 용량 제한 디스크 캐시)
+
+    디스크 파일은 읽을 때마다 수정 시각을 갱신하고, 전체 크기가 max_bytes를 넘으면
+    가장 오래 쓰지 않은 파일부터 지웁니다. 파일 쓰기는 임시 파일 + 이름 바꾸기로 하므로
+    여러 프로세스가 같은 폴더를 써도 반쯤 쓰인 파일을 읽지 않습니다.
+    """
+
+    def __init__(self, folder: str = CACHE_FOLDER, max_bytes: int = CACHE_MAX_BYTES,
+                 memory_entries: int = MEMORY_ENTRIES):
+        self.folder = folder
+        self.max_bytes = max_bytes
+        self.memory_entries = memory_entries
+        self._memory: 'OrderedDict[str, object]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(folder, exist_ok=True)
+
+    def _path(self, kind: str, digest: str) -> str:
+        return os.path.join(self.folder, f"{kind}-{digest}-v{CACHE_VERSION}.parquet")
+
+    def _remember(self, key: str, value):
+        with self._lock:
+            self._memory[key] = value
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+
+    def get(self, kind: str, digest: str) -> Optional[pd.DataFrame]:
+        """캐시에 있으면 파싱된 명단을, 없으면 None을 반환"""
+        key = f"{kind}-{digest}"
+        with self._lock:
+            df = self._memory.get(key)
+            if df is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return df.copy()
+
+        path = self._path(kind, digest)
+        try:
+            df = pd.read_parquet(path)
+            os.utime(path)  # LRU: 최근 사용 시각 갱신
+        except (FileNotFoundError, OSError, ValueError):
+            return None
+        self.hits += 1
+        self._remember(key, df)
+        return df.copy()
+
+    def put(self, kind: str, digest: str, df: pd.DataFrame):
+        """파싱된 명단을 디스크와 메모리에 저장하고 용량을 넘으면 오래된 파일 삭제"""
+        self._remember(f"{kind}-{digest}", df)
+        self._write(kind, digest, df)
+
+    def _write(self, kind: str, digest: str, df: pd.DataFrame):
+        fd, tmp_path = tempfile.mkstemp(dir=self.folder, suffix='.tmp')
+        os.close(fd)
+        try:
+            df.to_parquet(tmp_path, index=False)
+            os.replace(tmp_path, self._path(kind, digest))
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+        self.evict()
+
+    def member_table(self, digest: str, members: pd.DataFrame) -> MemberTable:
+        """조원 명단 파일(digest)의 배정용 인코딩을 캐시에서 꺼내거나 members를 인코딩해 저장
+
+        코드 열과 학교/학번 라벨을 'table' 항목으로 디스크에 두므로 작업 프로세스와 CLI도 다시 분류하지 않습니다.
+        MemberTable은 읽기 전용으로 쓰므로 복사하지 않고 돌려줍니다.
+        """
+        key = f"table-{digest}"
+        with self._lock:
+            table = self._memory.get(key)
+            if table is not None:
+                self._memory.move_to_end(key)
+                return table
+
+        path = self._path('table', digest)
+        try:
+            table = MemberTable.from_frame(pd.read_parquet(path))
+            os.utime(path)
+        except (FileNotFoundError, OSError, ValueError, KeyError):
+            table = MemberTable(members)
+            self._write('table', digest, table.to_frame())
+        self._remember(key, table)
+        return table
+
+    def evict(self):
+        """디스크 캐시 전체 크기가 max_bytes 이하가 될 때까지 오래된 파일부터 삭제"""
+        entries = []
+        for name in os.listdir(self.folder):
+            if not name.endswith('.parquet'):
+                continue
+            path = os.path.join(self.folder, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def load(self, kind: str, data: bytes, filename: str, reader: str = 'auto',
+             digest: Optional[str] = None) -> pd.DataFrame:
+        """명단 1개 (kind: 'leaders' 또는 'members')를 캐시에서 꺼내거나 파싱 후 저장
+
+        digest를 이미 계산했다면 넘겨서 다시 해시하지 않도록 할 수 있습니다.
+        """
+        digest = digest or file_digest(data)
+        df = self.get(kind, digest)
+        if df is not None:
+            return df
+
+        self.misses += 1
+        # 파서는 확장자로 형식을 판단하므로 원래 확장자로 임시 파일을 만듦
+        suffix = os.path.splitext(filename)[1] or '.xlsx'
+        fd, tmp_path = tempfile.mkstemp(suffix=suffix)
+        try:
+            with os.fdopen(fd, 'wb') as tmp:
+                tmp.write(data)
+            df = LOADERS[kind](tmp_path, reader)
+        finally:
+            os.unlink(tmp_path)
+        self.put(kind, digest, df)
+        return df.copy()
+
+    def load_rosters(self, leaders_data: bytes, leaders_name: str, members_data: bytes, members_name: str,
+                     reader: str = 'auto') -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """업로드된 두 명단의 내용(bytes)으로 (조장/헬퍼, 조원) DataFrame 반환"""
+        return (self.load('leaders', leaders_data, leaders_name, reader),
+                self.load('members', members_data, members_name, reader))
+
+    def load_paths(self, leaders_path: str, members_path: str,
+                   reader: str = 'auto') -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """디스크의 두 명단 파일로 (조장/헬퍼, 조원) DataFrame 반환"""
+        with open(leaders_path, 'rb') as f:
+            leaders_data = f.read()
+        with open(members_path, 'rb') as f:
+            members_data = f.read()
+        return self.load_rosters(leaders_data, leaders_path, members_data, members_path, reader)
+
+_default_cache: Optional[RosterCache] = None
+_default_lock = threading.Lock()
+
+def get_roster_cache() -> RosterCache:
+    """프로세스 전체에서 공유하는 기본 캐시 (CACHE_FOLDER, CACHE_MAX_BYTES)"""
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = RosterCache()
+        return _default_cache
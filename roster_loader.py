@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+명단 파일 로더
+Excel(.xlsx/.xls), CSV, Parquet, Arrow(Feather) 명단을 배정에 필요한 열만 읽어 들입니다.
+"""
+
+import os
+from typing import Callable, Optional, Tuple
+
+import pandas as pd
+
+try:
+    import python_calamine  # noqa: F401  (pandas의 'calamine' 엔진이 사용)
+    HAS_CALAMINE = True
+except ImportError:  # 선택 의존성: 없으면 openpyxl 사용
+    HAS_CALAMINE = False
+
+# 배정과 결과 출력에 쓰는 열 (나머지 신청서 열은 읽지 않음)
+LEADER_COLUMNS = ('조 숫자', '조장or헬퍼', '역할', '이름', '학과', '학번', '나이', '성별',
+                  '학교/학년', '캠퍼스', '연락처')
+MEMBER_COLUMNS = ('번호', '이름', '성별', '나이', '학과', '학번', '학년', '캠퍼스', '학교/학년',
+                  '지역', '트랙', '연락처')
+
+LEADERS_SHEET = "Sheet1"
+MEMBERS_SHEET = "등록 데이터"
+
+EXCEL_EXTENSIONS = {'xlsx', 'xls'}
+ROSTER_EXTENSIONS = EXCEL_EXTENSIONS | {'csv', 'parquet', 'arrow', 'feather'}
+
+READERS = {
+    'auto': '자동 (calamine 설치 시 calamine, 아니면 openpyxl)',
+    'calamine': 'python-calamine (Rust, 가장 빠름)',
+    'openpyxl': 'openpyxl 읽기 전용 스트리밍',
+}
+
+def _extension(path: str) -> str:
+    return os.path.splitext(str(path))[1].lower().lstrip('.')
+
+def _excel_engine(path: str, reader: str) -> Optional[str]:
+    """Excel 읽기 엔진 선택 (.xls는 pandas 기본 엔진에 맡김)"""
+    if reader not in READERS:
+        raise ValueError(f"알 수 없는 명단 읽기 방식입니다: {reader} (가능: {', '.join(READERS)})")
+    if reader == 'calamine' and not HAS_CALAMINE:
+        raise ImportError("calamine 읽기 방식을 사용하려면 python-calamine 패키지가 필요합니다 (pip install python-calamine)")
+    if reader == 'calamine' or (reader == 'auto' and HAS_CALAMINE):
+        return 'calamine'
+    if _extension(path) == 'xls':
+        return None
+    return 'openpyxl'  # pandas가 read_only=True로 열어 행 단위로 읽음
+
+def _as_str(df: pd.DataFrame) -> pd.DataFrame:
+    """read_excel(dtype=str)과 같게 모든 값을 문자열로 (빈 칸은 NaN 유지)"""
+    for column in df.columns:
+        values = df[column]
+        if not pd.api.types.is_string_dtype(values):
+            df[column] = values.where(values.isna(), values.astype(str))
+    return df
+
+def read_roster(path: str, columns: Tuple[str, ...], sheet_name: str, reader: str = 'auto') -> pd.DataFrame:
+    """명단 파일 1개를 필요한 열(columns 중 존재하는 것)만 문자열로 읽기
+
+    형식은 확장자로 판단합니다: .xlsx/.xls, .csv, .parquet, .arrow/.feather
+    """
+    wanted: Callable[[str], bool] = lambda column: str(column).strip() in columns
+    extension = _extension(path)
+
+    if extension in EXCEL_EXTENSIONS:
+        df = pd.read_excel(path, sheet_name=sheet_name, dtype=str, usecols=wanted,
+                           engine=_excel_engine(path, reader))
+    elif extension == 'csv':
+        df = pd.read_csv(path, dtype=str, usecols=wanted, encoding='utf-8-sig')
+    elif extension == 'parquet':
+        import pyarrow.parquet as pq
+        names = pq.read_schema(path).names
+        df = _as_str(pd.read_parquet(path, columns=[name for name in names if wanted(name)]))
+    elif extension in ('arrow', 'feather'):
+        import pyarrow.feather as feather
+        import pyarrow.ipc as ipc
+        with open(path, 'rb') as source:
+            names = ipc.open_file(source).schema.names
+        df = _as_str(feather.read_feather(path, columns=[name for name in names if wanted(name)]))
+    else:
+        raise ValueError(f"지원하지 않는 명단 형식입니다: .{extension} (가능: {', '.join(sorted(ROSTER_EXTENSIONS))})")
+
+    df.columns = [str(column).strip() for column in df.columns]
+    return df
+
+def load_leaders(path: str, reader: str = 'auto') -> pd.DataFrame:
+    """조장/헬퍼 명단을 읽고 나이를 정수로 변환 (숫자가 아니면 0)"""
+    df_leaders = read_roster(path, LEADER_COLUMNS, LEADERS_SHEET, reader)
+    df_leaders['나이'] = pd.to_numeric(df_leaders['나이'], errors='coerce').fillna(0).astype(int)
+    return df_leaders
+
+def load_members(path: str, reader: str = 'auto') -> pd.DataFrame:
+    """조원 명단을 읽고 나이 컬럼에서 "세"를 제거해 정수로 변환"""
+    df_members = read_roster(path, MEMBER_COLUMNS, MEMBERS_SHEET, reader)
+    df_members['나이'] = pd.to_numeric(df_members['나이'].str.replace("세", "", regex=False)).astype(int)
+    return df_members
+
+def load_rosters(leaders_file: str, members_file: str, reader: str = 'auto') -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """조장/헬퍼 명단과 조원 명단을 함께 읽기"""
+    return load_leaders(leaders_file, reader), load_members(members_file, reader)
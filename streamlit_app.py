@@ -9,20 +9,19 @@ Streamlit을 사용한 웹 인터페이스
 import streamlit as st
 import pandas as pd
 import numpy as np
-from collections import defaultdict, Counter
-import random
-import tempfile
-import os
-from datetime import datetime
+from collections import OrderedDict
 import json
 import base64
-from io import BytesIO
+from typing import Dict, Tuple
 
 # 기존 조 배정 로직 import
 from camp_group_assignment import (
-    load_data, canonical_school, extract_major, extract_region,
-    can_assign_to_group, calculate_group_stats, assign_groups, generate_summary_report
+    calculate_group_stats, solve_groups, ENGINES, analyze_feasibility, profile_table
 )
+from roster_loader import ROSTER_EXTENSIONS
+from roster_cache import RosterCache, get_roster_cache, file_digest
+from result_cache import ResultCache, get_result_cache, result_key
+from result_export import csv_bytes, result_workbook
 
 # 페이지 설정
 st.set_page_config(
@@ -201,48 +200,46 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+RESULT_RETENTION = 3  # 세션마다 session_state에 보관하는 최근 배정 결과 수
+
+@st.cache_resource
+def shared_caches() -> Tuple[RosterCache, ResultCache]:
+    """Flask 앱, CLI와 공유하는 명단 캐시와 결과 캐시 (서버 프로세스당 하나)"""
+    return get_roster_cache(), get_result_cache()
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def parse_rosters(leaders_digest: str, members_digest: str, leaders_name: str, members_name: str,
+                  _leaders_data: bytes, _members_data: bytes) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """업로드 파일 해시를 키로 파싱한 (조장/헬퍼, 조원) 명단 (파일 내용은 해시하지 않도록 _ 인자로 받음)"""
+    roster_cache, _ = shared_caches()
+    return (roster_cache.load('leaders', _leaders_data, leaders_name, digest=leaders_digest),
+            roster_cache.load('members', _members_data, members_name, digest=members_digest))
+
+def session_key(digests: Tuple[str, str], settings: Dict) -> str:
+    """업로드 파일 해시와 사이드바 설정으로 만든 session_state 결과 키"""
+    return json.dumps([list(digests), settings], sort_keys=True)
+
+def remember_result(key: str, result: Dict):
+    """배정 결과를 session_state에 보관 (최근 RESULT_RETENTION개만 남김)"""
+    results = st.session_state.setdefault('results', OrderedDict())
+    results[key] = result
+    results.move_to_end(key)
+    while len(results) > RESULT_RETENTION:
+        results.popitem(last=False)
+    st.session_state['last_result'] = key
+
+@st.cache_data(max_entries=RESULT_RETENTION, show_spinner=False)
+def download_links(result_id: str, _df_assigned: pd.DataFrame, _summary_df: pd.DataFrame) -> Tuple[str, str, str]:
+    """결과 ID(결과 캐시 키)별 엑셀/CSV 다운로드 링크 (다시 그릴 때 엑셀을 새로 만들지 않음)"""
+    b64 = base64.b64encode(csv_bytes(_df_assigned)).decode()
+    href = f'<a href="data:file/csv;base64,{b64}" download="조배정결과.csv" class="download-button">📊 조 배정 결과 다운로드 (CSV)</a>'
+    b64_summary = base64.b64encode(csv_bytes(_summary_df)).decode()
+    href_summary = f'<a href="data:file/csv;base64,{b64_summary}" download="조별요약.csv" class="download-button">📋 요약 보고서 다운로드 (CSV)</a>'
+    return create_excel_download(_df_assigned, _summary_df), href, href_summary
+
 def create_excel_download(df_assigned, summary_df):
-    """엑셀 파일 생성 및 다운로드 링크 생성"""
-    
-    # 엑셀 파일 생성
-    with BytesIO() as buffer:
-        with pd.ExcelWriter(buffer, engine='openpyxl') as writer:
-            # 조 배정 결과 시트
-            df_assigned.to_excel(writer, sheet_name='조배정결과', index=False)
-            
-            # 요약 보고서 시트
-            summary_df.to_excel(writer, sheet_name='조별요약', index=False)
-            
-            # 조별 상세 정보 시트 생성
-            detailed_data = []
-            for _, row in df_assigned.iterrows():
-                # 역할에 따라 다른 컬럼명 사용
-                if row['역할'] in ['조장', '헬퍼']:
-                    # 조장/헬퍼는 '학교/학년' 컬럼 사용
-                    school_info = row.get('학교', '')
-                else:
-                    # 조원은 '지역' 컬럼 사용
-                    school_info = row.get('지역', '')
-                
-                detailed_row = {
-                    '조 번호': row['조 번호'],
-                    '역할': row['역할'],
-                    '이름': row['이름'],
-                    '성별': row['성별'],
-                    '나이': row['나이'],
-                    '학과': row['학과'],
-                    '학교/지역': school_info,  # 통합된 컬럼명
-                    '전화번호': row.get('전화번호', ''),
-                    '학번': row.get('학번', ''),
-                    '트랙': row.get('트랙', 'EBS')
-                }
-                detailed_data.append(detailed_row)
-            
-            detailed_df = pd.DataFrame(detailed_data)
-            detailed_df.to_excel(writer, sheet_name='상세정보', index=False)
-        
-        buffer.seek(0)
-        excel_data = buffer.read()
+    """엑셀 파일 생성 및 다운로드 링크 생성 (조배정결과, 조별요약, 상세정보 시트)"""
+    excel_data = result_workbook(df_assigned, summary_df)
     
     # 다운로드 링크 생성
     b64 = base64.b64encode(excel_data).decode()
@@ -298,6 +295,45 @@ def main():
         )
         
         st.info(f"성비 설정: 전체 데이터 성비 기준, 최대 {max_gender_diff}명 차이 허용")
+        
+        # 배정 엔진 설정
+        st.subheader("🧠 배정 엔진")
+        
+        engine = st.selectbox(
+            "배정 엔진",
+            options=list(ENGINES),
+            format_func=lambda key: ENGINES[key],
+            help="어닐링/타부 탐색은 기본 배정 결과를 시간 제한 동안 추가로 개선합니다"
+        )
+        
+        time_limit = st.slider(
+            "탐색 시간 제한 (초)",
+            min_value=1,
+            max_value=120,
+            value=10,
+            disabled=engine == 'greedy',
+            help="어닐링/타부 탐색 엔진의 탐색 시간"
+        )
+        
+        # streamlit 1.28의 number_input은 빈 값(None)을 받지 못하므로 text_input으로 받아 정수로 변환
+        seed = st.text_input(
+            "seed (선택)",
+            value="",
+            placeholder="비우면 무작위",
+            help="0 이상의 정수. 같은 seed로 다시 배정하면 같은 결과를 만들고, 이전 결과가 있으면 재사용합니다"
+        ).strip()
+        
+        allow_infeasible = st.checkbox(
+            "조건 위반 감수",
+            value=False,
+            help="사전 검사에서 하드 조건 위반이 예상되어도 배정을 진행합니다"
+        )
+        
+        recompute = st.checkbox(
+            "새로 배정",
+            value=False,
+            help="같은 명단과 설정으로 배정한 이전 결과가 있어도 다시 배정합니다"
+        )
     
     # 파일 업로드
     st.header("📁 파일 업로드")
@@ -307,9 +343,9 @@ def main():
     with col1:
         st.subheader("조장/헬퍼 명단")
         leaders_file = st.file_uploader(
-            "조장/헬퍼 Excel 파일 업로드",
-            type=['xlsx', 'xls'],
-            help="조장과 헬퍼 정보가 포함된 Excel 파일"
+            "조장/헬퍼 명단 파일 업로드",
+            type=sorted(ROSTER_EXTENSIONS),
+            help="조장과 헬퍼 정보가 포함된 Excel/CSV/Parquet/Arrow 파일"
         )
         
         if leaders_file:
@@ -318,19 +354,29 @@ def main():
     with col2:
         st.subheader("조원 명단")
         members_file = st.file_uploader(
-            "조원 Excel 파일 업로드",
-            type=['xlsx', 'xls'],
-            help="조원 정보가 포함된 Excel 파일"
+            "조원 명단 파일 업로드",
+            type=sorted(ROSTER_EXTENSIONS),
+            help="조원 정보가 포함된 Excel/CSV/Parquet/Arrow 파일"
         )
         
         if members_file:
             st.success(f"✅ {members_file.name} 업로드 완료")
     
+    # 업로드 파일 해시와 설정이 같으면 다시 배정하지 않고 session_state의 결과를 다시 그림
+    settings = {'min_members': min_members, 'max_members': max_members, 'max_gender_diff': max_gender_diff,
+                'engine': engine, 'time_limit': time_limit, 'seed': int(seed) if seed.isdecimal() else None}
+    digests = None
+    if leaders_file is not None and members_file is not None:
+        digests = (file_digest(leaders_file.getvalue()), file_digest(members_file.getvalue()))
+    
     # 조 배정 실행
     if st.button("🚀 조 배정 시작", type="primary", use_container_width=True):
-        if leaders_file is None or members_file is None:
+        if digests is None:
             st.error("조장/헬퍼 명단과 조원 명단을 모두 업로드해주세요.")
             return
+        if seed and not seed.isdecimal():
+            st.error("seed는 0 이상의 정수로 입력하거나 비워두세요.")
+            return
         
         try:
             # 진행 상황 표시
@@ -343,82 +389,117 @@ def main():
                 </div>
                 """, unsafe_allow_html=True)
             
-            # 1단계: 파일 처리
-            with progress_container:
-                with st.spinner("📁 파일 처리 중..."):
-                    # 임시 파일로 저장
-                    with tempfile.NamedTemporaryFile(delete=False, suffix='.xlsx') as tmp_leaders:
-                        tmp_leaders.write(leaders_file.getvalue())
-                        leaders_path = tmp_leaders.name
-                    
-                    with tempfile.NamedTemporaryFile(delete=False, suffix='.xlsx') as tmp_members:
-                        tmp_members.write(members_file.getvalue())
-                        members_path = tmp_members.name
-                    
-                    st.success("✅ 파일 처리 완료")
-            
-            # 2단계: 데이터 로드
+            # 1단계: 데이터 로드 (같은 내용의 파일은 명단 캐시에서 바로 꺼냄)
             with progress_container:
                 with st.spinner("📊 데이터 로드 중..."):
-                    leaders, members = load_data(leaders_path, members_path)
+                    leaders, members = parse_rosters(*digests, leaders_file.name, members_file.name,
+                                                     leaders_file.getvalue(), members_file.getvalue())
+                    # 조원 인코딩도 명단 캐시에서 꺼내 사전 검사와 배정에서 다시 분류하지 않음
+                    table = shared_caches()[0].member_table(digests[1], members)
                     st.success(f"✅ 데이터 로드 완료 (조장/헬퍼: {len(leaders)}명, 조원: {len(members)}명)")
             
-            # 3단계: 조 배정 실행
-            with progress_container:
-                with st.spinner("🎯 조 배정 알고리즘 실행 중..."):
-                    df_assigned = assign_groups(leaders, members, min_members, max_members, max_gender_diff)
-                    st.success("✅ 조 배정 완료")
-            
-            # 4단계: 결과 처리
-            with progress_container:
-                with st.spinner("📋 결과 정리 중..."):
-                    # 그룹 정보 재구성
-                    groups = {}
-                    for _, row in df_assigned.iterrows():
-                        grp_num = row['조 번호']
-                        if grp_num not in groups:
-                            groups[grp_num] = {
-                                '조 번호': grp_num,
-                                'leader': None,
-                                'helper': None,
-                                'members': []
-                            }
-                        
-                        if row['역할'] == '조장':
-                            groups[grp_num]['leader'] = row.to_dict()
-                        elif row['역할'] == '헬퍼':
-                            groups[grp_num]['helper'] = row.to_dict()
-                        else:
-                            groups[grp_num]['members'].append(row.to_dict())
-                    
-                    # 요약 보고서 생성
-                    summary_df = generate_summary_report(groups, "temp_output.csv")
-                    st.success("✅ 결과 정리 완료")
-            
-            # 5단계: 임시 파일 정리
+            # 사전 검사: 탐색 전에 하드 조건을 만족할 수 없는 명단을 걸러냄
             with progress_container:
-                with st.spinner("🧹 임시 파일 정리 중..."):
-                    os.unlink(leaders_path)
-                    os.unlink(members_path)
-                    st.success("✅ 임시 파일 정리 완료")
-            
-            # 진행 상황 완료 표시
-            with progress_container:
-                st.markdown("""
-                <div class="progress-container" style="background: rgba(40, 167, 69, 0.1); border-left: 4px solid #28a745;">
-                    <h4>🎉 조 배정이 성공적으로 완료되었습니다!</h4>
-                </div>
-                """, unsafe_allow_html=True)
+                feasibility = analyze_feasibility(leaders, members, min_members, max_members, table)
+                for issue in feasibility['issues']:
+                    message = issue['message']
+                    if issue['details']:
+                        message += "\n\n" + ", ".join(issue['details'][:10])
+                    if issue['severity'] == 'error':
+                        st.error(f"❌ {message}")
+                    else:
+                        st.warning(f"⚠️ {message}")
+                if feasibility['feasible']:
+                    st.success(f"✅ 사전 검사 통과 ({feasibility['elapsed_ms']:.0f}ms)")
+                elif not allow_infeasible:
+                    st.error("하드 조건을 모두 만족하는 배정이 불가능합니다. 명단을 수정하거나 사이드바에서 '조건 위반 감수'를 선택하세요.")
+                    return
             
-            # 결과 표시
-            display_results(groups, summary_df, df_assigned, min_members, max_members, max_gender_diff)
+            # 같은 명단·설정·seed의 이전 결과가 있으면 배정과 결과 정리를 건너뜀 (seed가 없으면 찾지 않음)
+            _, cache = shared_caches()
+            cache_key = result_key(leaders, members, **settings)
+            cached = None if recompute or cache_key is None else cache.get(cache_key)
+            if cached is not None:
+                with progress_container:
+                    st.success("✅ 같은 명단과 설정의 이전 결과를 불러왔습니다 (사이드바의 '새로 배정'으로 다시 배정할 수 있습니다)")
+                result_id = f"{cache_key}-{cached['assignment'].attrs['seed']}"
+                remember_result(session_key(digests, settings), {'id': result_id, 'settings': settings, **cached})
+            else:
+                run_assignment(leaders, members, table, settings, progress_container, cache,
+                               session_key(digests, settings))
                 
         except Exception as e:
             st.error(f"조 배정 중 오류가 발생했습니다: {str(e)}")
             st.exception(e)
+    
+    # 결과 표시 (사이드바나 탭을 조작해 다시 실행될 때도 다시 배정하지 않음)
+    results = st.session_state.get('results', {})
+    result = results.get(session_key(digests, settings)) if digests is not None else None
+    if result is None and st.session_state.get('last_result') in results:
+        result = results[st.session_state['last_result']]
+        st.info("파일이나 설정이 바뀌었습니다. 아래는 마지막으로 배정한 결과이며, 새 설정으로 배정하려면 '조 배정 시작'을 누르세요.")
+    if result is not None:
+        display_results(result['groups'], result['summary'], result['assignment'],
+                        result['settings']['min_members'], result['settings']['max_members'],
+                        result['settings']['max_gender_diff'], result['id'])
+
+def run_assignment(leaders, members, table, settings, progress_container, cache, key):
+    """조 배정 실행 → 결과 정리 → 결과 캐시와 session_state에 저장 (진행 상황은 progress_container에 표시)
 
-def display_results(groups, summary_df, df_assigned, min_members, max_members, max_gender_diff):
-    """결과 표시"""
+    결과 캐시에는 실제로 쓴 seed를 키로 저장하므로 seed 없이 배정한 결과도 그 seed로 다시 배정하면 재사용합니다.
+    """
+    min_members, max_members = settings['min_members'], settings['max_members']
+    max_gender_diff, engine, time_limit = settings['max_gender_diff'], settings['engine'], settings['time_limit']
+    
+    # 2단계: 조 배정 실행 (단계별 진행률과 점수 변화를 실시간으로 표시)
+    with progress_container:
+        progress_bar = st.progress(0.0, text="🎯 조 배정 알고리즘 실행 중...")
+        progress_detail = st.empty()
+        objective_chart = st.empty()
+        history = []
+        
+        def show_progress(event):
+            progress_bar.progress(event['fraction'], text=f"🎯 {event['phase_name']} ({event['elapsed']:.1f}초)")
+            progress_detail.caption(f"배정 {event['placed']}/{event['total']}명 · "
+                                    f"현재 점수 {event['current']:.3f} · 최고 점수 {event['best']:.3f}")
+            if event['phase'] in ('annealing', 'tabu', 'exact'):
+                history.append({'경과 시간(초)': event['elapsed'], '현재 점수': event['current'],
+                                '최고 점수': event['best']})
+                objective_chart.line_chart(pd.DataFrame(history).set_index('경과 시간(초)'))
+        
+        result = solve_groups(leaders, members, min_members, max_members, max_gender_diff,
+                              engine=engine, time_limit=time_limit, seed=settings['seed'], progress=show_progress,
+                              table=table)
+        progress_bar.progress(1.0, text="✅ 조 배정 완료")
+        st.success(f"✅ 조 배정 완료 (seed {result.seed})")
+        
+        profile = result.profile
+        with st.expander(f"⏱️ 단계별 실행 시간 (총 {profile['total_seconds']:.2f}초)", expanded=False):
+            st.dataframe(profile_table(profile), use_container_width=True, hide_index=True)
+            st.caption("feasibility_checks: 하드 조건 판정 수 · scoring_calls: 점수 계산 수 · "
+                       "move/swap_attempts: 판정한 이동/교환 후보 수 · moves/swaps: 실제로 적용한 이동/교환 수 (되돌리기 제외)")
+    
+    # 3단계: 결과 처리
+    with progress_container:
+        with st.spinner("📋 결과 정리 중..."):
+            # 요약 보고서 생성 (조별 통계는 배정 결과에 이미 있음)
+            summary_df = result.summary()
+            cache_key = result_key(leaders, members, **{**settings, 'seed': result.seed})
+            cache.put(cache_key, result.dataframe, summary_df, result.groups)
+            remember_result(key, {'id': f"{cache_key}-{result.seed}", 'settings': settings,
+                                  'assignment': result.dataframe, 'summary': summary_df, 'groups': result.groups})
+            st.success("✅ 결과 정리 완료")
+    
+    # 진행 상황 완료 표시
+    with progress_container:
+        st.markdown("""
+        <div class="progress-container" style="background: rgba(40, 167, 69, 0.1); border-left: 4px solid #28a745;">
+            <h4>🎉 조 배정이 성공적으로 완료되었습니다!</h4>
+        </div>
+        """, unsafe_allow_html=True)
+
+def display_results(groups, summary_df, df_assigned, min_members, max_members, max_gender_diff, result_id):
+    """결과 표시 (result_id: 다운로드 링크 캐시 키, 결과 캐시 키 + seed)"""
     
     # 요약 정보
     st.header("📊 배정 요약")
@@ -475,55 +556,34 @@ def display_results(groups, summary_df, df_assigned, min_members, max_members, m
     
     col1, col2 = st.columns(2)
     
-    with col1:
-        for condition in conditions[:3]:
-            pass_count = sum(1 for _, row in summary_df.iterrows() if row[condition] == '✓')
-            total_count = len(summary_df)
-            percentage = pass_count/total_count*100 if total_count > 0 else 0
-            
-            # 조건별 색상 설정
-            if percentage >= 80:
-                color = "#28a745"
-                bg_color = "rgba(40, 167, 69, 0.1)"
-            elif percentage >= 60:
-                color = "#ffc107"
-                bg_color = "rgba(255, 193, 7, 0.1)"
-            else:
-                color = "#dc3545"
-                bg_color = "rgba(220, 53, 69, 0.1)"
-            
-            st.markdown(f"""
-            <div class="stats-card" style="border-left-color: {color}; background: {bg_color};">
-                <h4>{condition_names[condition]}</h4>
-                <h3 style="color: {color};">{pass_count}/{total_count}</h3>
-                <p style="color: {color}; font-weight: bold;">{percentage:.1f}%</p>
-            </div>
-            """, unsafe_allow_html=True)
+    # 조건별 통과 조 수 (조건 열마다 '✓' 개수)
+    pass_counts = (summary_df[conditions] == '✓').sum()
+    total_count = len(summary_df)
     
-    with col2:
-        for condition in conditions[3:]:
-            pass_count = sum(1 for _, row in summary_df.iterrows() if row[condition] == '✓')
-            total_count = len(summary_df)
-            percentage = pass_count/total_count*100 if total_count > 0 else 0
-            
-            # 조건별 색상 설정
-            if percentage >= 80:
-                color = "#28a745"
-                bg_color = "rgba(40, 167, 69, 0.1)"
-            elif percentage >= 60:
-                color = "#ffc107"
-                bg_color = "rgba(255, 193, 7, 0.1)"
-            else:
-                color = "#dc3545"
-                bg_color = "rgba(220, 53, 69, 0.1)"
-            
-            st.markdown(f"""
-            <div class="stats-card" style="border-left-color: {color}; background: {bg_color};">
-                <h4>{condition_names[condition]}</h4>
-                <h3 style="color: {color};">{pass_count}/{total_count}</h3>
-                <p style="color: {color}; font-weight: bold;">{percentage:.1f}%</p>
-            </div>
-            """, unsafe_allow_html=True)
+    for column, column_conditions in ((col1, conditions[:3]), (col2, conditions[3:])):
+        with column:
+            for condition in column_conditions:
+                pass_count = int(pass_counts[condition])
+                percentage = pass_count/total_count*100 if total_count > 0 else 0
+                
+                # 조건별 색상 설정
+                if percentage >= 80:
+                    color = "#28a745"
+                    bg_color = "rgba(40, 167, 69, 0.1)"
+                elif percentage >= 60:
+                    color = "#ffc107"
+                    bg_color = "rgba(255, 193, 7, 0.1)"
+                else:
+                    color = "#dc3545"
+                    bg_color = "rgba(220, 53, 69, 0.1)"
+                
+                st.markdown(f"""
+                <div class="stats-card" style="border-left-color: {color}; background: {bg_color};">
+                    <h4>{condition_names[condition]}</h4>
+                    <h3 style="color: {color};">{pass_count}/{total_count}</h3>
+                    <p style="color: {color}; font-weight: bold;">{percentage:.1f}%</p>
+                </div>
+                """, unsafe_allow_html=True)
     
     # 요약 테이블
     st.header("📋 조별 요약 통계")
@@ -555,31 +615,26 @@ def display_results(groups, summary_df, df_assigned, min_members, max_members, m
             detail_col = f"{condition}_설명"
             
             if detail_col in summary_df.columns:
-                # 각 조별로 조건 상태와 상세 정보 표시
-                for idx, row in summary_df.iterrows():
-                    group_num = row['조 번호']
-                    condition_status = row[condition]
-                    detail_info = row.get(detail_col, "상세 정보 없음")
-                    
-                    # 조건 상태에 따른 색상과 아이콘
-                    if condition_status == '✓':
-                        status_icon = "✅"
-                        status_color = "green"
-                        status_text = "통과"
-                    else:
-                        status_icon = "❌"
-                        status_color = "red"
-                        status_text = "실패"
-                    
-                    # 조별 정보를 카드 형태로 표시
-                    st.markdown(f"""
-                    <div class="condition-detail-card" style="border-left-color: {'#28a745' if condition_status == '✓' else '#dc3545'};">
-                        <h4 style="margin: 0 0 0.5rem 0; color: {'#28a745' if condition_status == '✓' else '#dc3545'};">
-                            {status_icon} 조 {group_num} - {status_text}
+                # 각 조별로 조건 상태와 상세 정보를 카드 형태로 표시 (열 단위로 만들어 한 번에 출력)
+                passed = (summary_df[condition] == '✓').to_numpy()
+                details = summary_df[detail_col].fillna("상세 정보 없음").astype(str)
+                cards = [
+                    f"""
+                    <div class="condition-detail-card" style="border-left-color: {color};">
+                        <h4 style="margin: 0 0 0.5rem 0; color: {color};">
+                            {icon} 조 {group_num} - {text}
                         </h4>
                         <p style="margin: 0; line-height: 1.4;">{detail_info}</p>
                     </div>
-                    """, unsafe_allow_html=True)
+                    """
+                    for group_num, color, icon, text, detail_info in zip(
+                        summary_df['조 번호'],
+                        np.where(passed, '#28a745', '#dc3545'),
+                        np.where(passed, "✅", "❌"),
+                        np.where(passed, "통과", "실패"),
+                        details)
+                ]
+                st.markdown(''.join(cards), unsafe_allow_html=True)
             else:
                 st.warning(f"{condition_name}에 대한 상세 정보가 없습니다.")
     
@@ -673,7 +728,7 @@ def display_results(groups, summary_df, df_assigned, min_members, max_members, m
             
             with col2:
                 st.subheader("📊 조 통계")
-                stats = calculate_group_stats(group)
+                stats = group.get('stats') or calculate_group_stats(group)
                 
                 # 통계 카드들
                 st.markdown(f"""
@@ -726,27 +781,21 @@ def display_results(groups, summary_df, df_assigned, min_members, max_members, m
     </div>
     """, unsafe_allow_html=True)
     
+    excel_href, href, href_summary = download_links(result_id, df_assigned, summary_df)
     col1, col2, col3 = st.columns(3)
     
     with col1:
         # 엑셀 파일 다운로드 (전체 결과)
-        excel_href = create_excel_download(df_assigned, summary_df)
         st.markdown(excel_href, unsafe_allow_html=True)
         st.info("📊 엑셀 파일에는 조배정결과, 조별요약, 상세정보 시트가 포함됩니다.")
     
     with col2:
         # 조 배정 결과 다운로드 (CSV)
-        csv = df_assigned.to_csv(index=False, encoding='utf-8-sig')
-        b64 = base64.b64encode(csv.encode()).decode()
-        href = f'<a href="data:file/csv;base64,{b64}" download="조배정결과.csv" class="download-button">📊 조 배정 결과 다운로드 (CSV)</a>'
         st.markdown(href, unsafe_allow_html=True)
         st.info("📋 CSV 형식으로 조 배정 결과를 다운로드합니다.")
     
     with col3:
         # 요약 보고서 다운로드 (CSV)
-        csv_summary = summary_df.to_csv(index=False, encoding='utf-8-sig')
-        b64_summary = base64.b64encode(csv_summary.encode()).decode()
-        href_summary = f'<a href="data:file/csv;base64,{b64_summary}" download="조별요약.csv" class="download-button">📋 요약 보고서 다운로드 (CSV)</a>'
         st.markdown(href_summary, unsafe_allow_html=True)
         st.info("📈 조별 요약 통계를 CSV 형식으로 다운로드합니다.")
 
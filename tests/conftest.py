@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+
+"""테스트 공용 fixture: 합성 명단을 실제 업로드와 같은 경로(파일 저장 → load_data)로 읽음"""
+
+import contextlib
+import io
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from camp_group_assignment import load_data  # noqa: E402
+from create_real_sample_data import generate_rosters, save_rosters  # noqa: E402
+
+@pytest.fixture(scope='session')
+def rosters(tmp_path_factory):
+    """rosters(조원 수, 시나리오, seed) → 전처리된 (조장/헬퍼, 조원) DataFrame (같은 인자는 한 번만 생성)"""
+    loaded = {}
+
+    def make(members: int = 70, scenario: str = 'balanced', seed: int = 0):
+        key = (members, scenario, seed)
+        if key not in loaded:
+            folder = tmp_path_factory.mktemp('rosters')
+            leaders, roster = generate_rosters(members, scenario=scenario, seed=seed)
+            with contextlib.redirect_stdout(io.StringIO()):
+                loaded[key] = load_data(*save_rosters(leaders, roster, str(folder), 'csv', 'test'))
+        leaders, roster = loaded[key]
+        return leaders.copy(), roster.copy()
+    return make
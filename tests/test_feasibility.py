@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+
+"""FeasibilityMatrix 사전 계산이 조원·조 쌍마다 하드 조건을 직접 판정한 결과와 같은지"""
+
+import pytest
+
+from camp_group_assignment import FeasibilityMatrix, MemberTable, _build_groups
+
+def build(leaders, members):
+    groups = list(_build_groups(leaders, sorted(leaders['조 숫자'].unique(), key=int)).values())
+    profiles = MemberTable(members).profiles()
+    return profiles, groups, FeasibilityMatrix(profiles, groups)
+
+def allowed(member, group) -> bool:
+    """의대 24/25학번 분리와 나이 조건을 조원·조 한 쌍씩 판정"""
+    cohort = ("24", "25")
+    if (member.major == "의대" and member.year in cohort and group.leader_major == "의대" and
+            group.leader_year in cohort and member.year != group.leader_year):
+        return False
+    if group.leader_age == 37:
+        return member.age <= 39
+    return member.age < group.helper_age
+
+@pytest.mark.parametrize('scenario', ['balanced', 'cohort_heavy', 'age_heavy'])
+def test_static_matches_pairwise_check(rosters, scenario):
+    profiles, groups, feasibility = build(*rosters(140, scenario))
+    expected = [[allowed(member, group) for group in groups] for member in profiles]
+    assert feasibility.static.tolist() == expected
+    if scenario != 'balanced':
+        # 빡빡한 시나리오에서는 실제로 막히는 쌍이 있어야 검사 의미가 있음
+        assert not feasibility.static.all()
+
+def test_candidates_follow_school_bits(rosters):
+    profiles, groups, feasibility = build(*rosters(140, 'school_heavy'))
+    member = profiles[0]
+    same_school = [other for other in profiles[1:] if other.school == member.school]
+    target = next(index for index in range(len(groups)) if feasibility.static[member.index, index])
+    assert feasibility.candidates(member)[target]
+
+    groups[target].add(same_school[0])
+    assert not feasibility.candidates(member)[target]
+    assert not feasibility.can_assign(groups[target], member)
+
+    groups[target].remove(same_school[0])
+    assert feasibility.candidates(member)[target]
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+
+"""GroupState 증분 카운터가 조원 목록으로 처음부터 다시 계산한 값과 같은지"""
+
+import random
+
+import pytest
+
+from camp_group_assignment import GroupState, MemberTable, calculate_group_stats
+
+def rebuild(group: GroupState) -> GroupState:
+    """같은 조장/헬퍼와 현재 조원으로 새로 만든 GroupState"""
+    fresh = GroupState(group.number, group.leader, group.helper)
+    for member in group.members:
+        fresh.add(member)
+    return fresh
+
+def assert_same_state(group: GroupState, fresh: GroupState):
+    assert (group.male, group.female) == (fresh.male, fresh.female)
+    assert (group.age_sum, group.age_sq_sum) == (fresh.age_sum, fresh.age_sq_sum)
+    assert group.age_buckets == fresh.age_buckets
+    assert group.major_counts == fresh.major_counts
+    assert group.region_counts == fresh.region_counts
+    assert group.school_counts == fresh.school_counts
+    assert (group.major_pairs, group.region_pairs) == (fresh.major_pairs, fresh.region_pairs)
+    assert group.score() == pytest.approx(fresh.score())
+    assert group.stats() == fresh.stats()
+
+@pytest.mark.parametrize('seed', [0, 1, 2])
+def test_incremental_updates_match_recompute(rosters, seed):
+    leaders, members = rosters(70, seed=seed)
+    profiles = MemberTable(members).profiles()
+    records = leaders.to_dict('records')
+    group = GroupState('1', records[0], records[1])
+    outside = list(profiles)
+    rng = random.Random(seed)
+    rng.shuffle(outside)
+
+    for _ in range(300):
+        action = rng.random()
+        if group.members and action < 0.3:
+            member = rng.choice(group.members)
+            expected = group.score_after(out=member)
+            group.remove(member)
+            outside.append(member)
+        elif group.members and action < 0.6:
+            old = rng.choice(group.members)
+            new = outside.pop(rng.randrange(len(outside)))
+            expected = group.score_after(old, new)
+            group.swap(old, new)
+            outside.append(old)
+        else:
+            new = outside.pop(rng.randrange(len(outside)))
+            expected = group.score_after(into=new)
+            group.add(new)
+        # score_after는 실제로 바꾼 뒤의 점수와 같아야 함
+        assert group.score() == pytest.approx(expected)
+        assert_same_state(group, rebuild(group))
+
+def test_stats_match_calculate_group_stats(rosters):
+    leaders, members = rosters(70)
+    profiles = MemberTable(members).profiles()
+    records = leaders.to_dict('records')
+    group = GroupState('1', records[0], records[1])
+    for member in profiles[::9]:
+        group.add(member)
+    rows = members.to_dict('records')
+    expected = calculate_group_stats({'leader': group.leader, 'helper': group.helper,
+                                      'members': [rows[member.row] for member in group.members]})
+    assert group.stats() == expected
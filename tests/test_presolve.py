@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+
+"""analyze_feasibility(presolve)가 하드 조건을 만족할 수 없는 명단을 탐색 전에 걸러내는지"""
+
+import pytest
+
+from camp_group_assignment import analyze_feasibility
+
+def error_codes(leaders, members) -> set:
+    report = analyze_feasibility(leaders, members, 6, 8)
+    codes = {issue['code'] for issue in report['issues'] if issue['severity'] == 'error'}
+    assert report['feasible'] == (not codes)
+    return codes
+
+def no_37_leaders(leaders):
+    """37세 조장 예외(39세까지 허용)가 끼어들지 않도록 조장 나이를 바꿈"""
+    leaders.loc[(leaders['조장or헬퍼'] == '조장') & (leaders['나이'] == 37), '나이'] = 36
+    return leaders
+
+@pytest.mark.parametrize('scenario', ['balanced', 'cohort_heavy'])
+def test_generated_rosters_pass(rosters, scenario):
+    assert error_codes(*rosters(140, scenario)) == set()
+
+def test_member_count_outside_capacity(rosters):
+    leaders, members = rosters(140)
+    assert error_codes(leaders, members.head(20)) == {'too_few_members'}
+    first_groups = leaders[leaders['조 숫자'].astype(int) <= 5]
+    assert 'too_many_members' in error_codes(first_groups, members)
+
+def test_school_larger_than_group_count(rosters):
+    leaders, members = rosters(140)
+    members.loc[members.index[:25], '캠퍼스'] = '서울대'
+    assert error_codes(leaders, members) == {'school_over_groups'}
+
+def test_member_older_than_every_helper(rosters):
+    leaders, members = rosters(140)
+    members.loc[members.index[0], '나이'] = 60
+    assert error_codes(leaders, members) == {'older_than_helpers'}
+
+def test_age_capacity(rosters):
+    leaders, members = rosters(140)
+    leaders = no_37_leaders(leaders)
+    helpers = leaders['조장or헬퍼'] == '헬퍼'
+    # 헬퍼 1명만 조원보다 나이가 많으면 모든 조원이 그 조 하나(정원 8명)에만 들어갈 수 있음
+    leaders.loc[helpers, '나이'] = 21
+    leaders.loc[leaders.index[helpers][0], '나이'] = 50
+    members['나이'] = 30
+    assert error_codes(leaders, members) == {'age_capacity'}
+
+def test_cohort_without_open_group(rosters):
+    leaders, members = rosters(140)
+    staff = leaders['조장or헬퍼'] == '조장'
+    leaders.loc[staff, '학과'] = '의'
+    leaders.loc[staff, '학번'] = '24'
+    members.loc[members.index[:3], ['학과', '학번']] = ['의', '25']
+    codes = error_codes(leaders, members)
+    assert {'cohort_no_group', 'cohort_25_capacity'} <= codes
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+
+"""result_store로 저장한 결과를 페이지 단위로 읽으면 저장한 조/요약이 그대로 나오는지"""
+
+import contextlib
+import io
+import os
+
+import pytest
+
+import result_store
+from camp_group_assignment import solve_groups
+from job_store import JobStore
+from result_store import HEADER_FILENAME, ResultReader, write_result
+
+@pytest.fixture
+def saved(rosters, tmp_path, monkeypatch):
+    """조원 210명(30개 조) 배정 결과를 세션 결과 폴더에 저장하고 (store, 세션 ID, 결과, 요약) 반환"""
+    # row group을 작게 해서 한 페이지가 여러 row group에 걸치게 함
+    monkeypatch.setattr(result_store, 'ROW_GROUP_ROWS', 16)
+    leaders, members = rosters(210)
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = solve_groups(leaders, members, seed=0)
+        summary = result.summary()
+    store = JobStore(str(tmp_path / 'uploads'), str(tmp_path / 'results'))
+    session_id = store.new_session()
+    write_result(store.result_dir(session_id), {'session_id': session_id, 'settings': {'seed': 0}},
+                 result.dataframe, summary, result.stats)
+    return store, session_id, result, summary
+
+@pytest.mark.parametrize('per_page', [1, 7, 30, 50])
+def test_pages_round_trip(saved, per_page):
+    store, session_id, result, summary = saved
+    reader = ResultReader(store)
+    groups, summary_rows = {}, []
+    first = reader.page(session_id, 1, per_page)
+    assert first['pages'] == -(-len(result.groups) // per_page)
+    assert first['settings'] == {'seed': 0}
+    for page in range(1, first['pages'] + 1):
+        loaded = reader.page(session_id, page, per_page)
+        assert loaded['page'] == page
+        assert len(loaded['groups']) <= per_page
+        groups.update(loaded['groups'])
+        summary_rows.extend(loaded['summary'])
+
+    assert list(groups) == list(result.groups)
+    for number, expected in result.groups.items():
+        group = groups[number]
+        assert group['leader']['이름'] == expected['leader']['이름']
+        assert group['helper']['이름'] == expected['helper']['이름']
+        assert [row['이름'] for row in group['members']] == [row['이름'] for row in expected['members']]
+        assert [row['나이'] for row in group['members']] == [row['나이'] for row in expected['members']]
+        assert group['stats'] == expected['stats']
+    assert [row['조 번호'] for row in summary_rows] == summary['조 번호'].tolist()
+    assert [row['총 인원'] for row in summary_rows] == summary['총 인원'].tolist()
+
+def test_page_number_is_clamped(saved):
+    store, session_id, result, _ = saved
+    reader = ResultReader(store)
+    assert reader.page(session_id, 0, 7)['page'] == 1
+    last = reader.page(session_id, 999, 7)
+    assert last['page'] == last['pages'] == 5
+    assert list(last['groups']) == list(result.groups)[28:]
+
+def test_rewritten_result_is_reread(saved):
+    store, session_id, result, summary = saved
+    reader = ResultReader(store)
+    assert reader.page(session_id, 1, 7)['settings'] == {'seed': 0}
+    write_result(store.result_dir(session_id), {'session_id': session_id, 'settings': {'seed': 1}},
+                 result.dataframe, summary, result.stats)
+    # 같은 크기로 다시 써도 수정 시각이 바뀌면 새로 읽음
+    path = store.result_path(session_id, HEADER_FILENAME)
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert reader.page(session_id, 1, 7)['settings'] == {'seed': 1}
+
+def test_unknown_session(saved):
+    store, _, _, _ = saved
+    reader = ResultReader(store)
+    assert reader.page('../etc', 1) is None
+    assert reader.page('20250101_000000_deadbeef', 1) is None
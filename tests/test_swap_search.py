@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+
+"""교환 지역 탐색이 하드 조건과 조 인원을 지키면서 목적함수만 올리는지"""
+
+import contextlib
+import io
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from camp_group_assignment import (FeasibilityMatrix, GroupArrays, MemberTable, SwapSearch, _build_groups,
+                                   score_candidates, solve_groups, total_objective)
+
+def violations(groups, feasibility) -> int:
+    """갈 수 없는 조에 있는 조원 수 + 조마다 같은 학교로 겹친 조원 수"""
+    total = 0
+    for group in groups:
+        total += sum(1 for member in group.members if not feasibility.static[member.index, group.index])
+        total += sum(count - 1 for count in Counter(member.school for member in group.members).values())
+    return total
+
+def placed_search(leaders, members, max_members: int = 8):
+    """solve_groups 1단계처럼 하드 조건을 지키는 조 중 점수가 가장 좋은 조에 배정한 SwapSearch
+
+    빈 조는 성비 조건을 통과하지 못하므로 성비를 지키는 조가 없으면 성비 조건만 빼고 고르고,
+    하드 조건을 지키는 조가 없는 조원은 배정하지 않습니다 (owner -1).
+    """
+    groups = list(_build_groups(leaders, sorted(leaders['조 숫자'].unique(), key=int)).values())
+    profiles = MemberTable(members).profiles()
+    feasibility = FeasibilityMatrix(profiles, groups)
+    arrays = GroupArrays(profiles, groups)
+    for member in profiles:
+        scores, gender_ok = score_candidates(member, arrays)
+        mask = feasibility.candidates(member) & (arrays.size < max_members)
+        if (mask & gender_ok).any():
+            mask &= gender_ok
+        if mask.any():
+            groups[int(np.argmax(np.where(mask, scores, -np.inf)))].add(member)
+    return SwapSearch(profiles, groups, feasibility, arrays, np.random.default_rng(0))
+
+@pytest.mark.parametrize('scenario', ['balanced', 'school_heavy', 'cohort_heavy'])
+def test_improve_keeps_hard_constraints(rosters, scenario):
+    search = placed_search(*rosters(210, scenario))
+    groups = search.groups
+    assert violations(groups, search.feasibility) == 0
+    sizes = [group.size for group in groups]
+    objective = total_objective(groups)
+
+    while search.improve():
+        assert violations(groups, search.feasibility) == 0
+        assert total_objective(groups) >= objective - 1e-9
+        objective = total_objective(groups)
+    assert search.swaps > 0
+    assert [group.size for group in groups] == sizes
+
+    # 소속/칸 배열이 조원 목록과 어긋나지 않아야 함
+    for group in groups:
+        indices = [member.index for member in group.members]
+        assert sorted(search.slots[group.index][search.slots[group.index] >= 0].tolist()) == sorted(indices)
+        assert all(search.owner[index] == group.index for index in indices)
+
+def test_best_swap_partner_is_feasible(rosters):
+    search = placed_search(*rosters(210, 'school_heavy'))
+    for member in search.members[::7]:
+        if search.owner[member.index] < 0:
+            continue
+        gain, partner = search.best_swap(member)
+        if partner < 0:
+            continue
+        group1 = search.groups[search.owner[member.index]]
+        group2 = search.groups[search.owner[partner]]
+        assert search.feasibility.can_swap(group1, member, group2, search.members[partner])
+
+@pytest.mark.parametrize('scenario', ['balanced', 'cohort_heavy'])
+@pytest.mark.parametrize('engine', ['greedy', 'annealing', 'tabu'])
+def test_solve_groups_has_no_hard_violations(rosters, scenario, engine):
+    leaders, members = rosters(210, scenario)
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = solve_groups(leaders, members, engine=engine, time_limit=0.5, seed=0)
+    assert result.hard_violations(members) == {'의대24_25_분리': 0, '같은학교_금지': 0, '나이_조건': 0}
+    assert len(result.member_rows) == len(members)